@@ -10,21 +10,15 @@
 - 숫자 포맷팅
 """
 
-import oracledb
 import pandas as pd
-from datetime import datetime
-from openpyxl import Workbook
-from openpyxl.styles import (
-    Font, Fill, PatternFill, Border, Side, Alignment,
-    NamedStyle, GradientFill
-)
-from openpyxl.chart import BarChart, LineChart, PieChart, DoughnutChart, Reference
-from openpyxl.chart.label import DataLabelList
-from openpyxl.chart.series import DataPoint
-from openpyxl.utils.dataframe import dataframe_to_rows
-from openpyxl.formatting.rule import ColorScaleRule, DataBarRule
-from openpyxl.utils import get_column_letter
-from openpyxl.drawing.image import Image
+import pyarrow as pa
+import pyarrow.parquet as pq
+import xlsxwriter
+from xlsxwriter.utility import xl_col_to_name
+from datetime import datetime, date
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import multiprocessing
+import hashlib
 import os
 
 # DB 접속 정보
@@ -34,6 +28,15 @@ DB_CONFIG = {
     "dsn": "211.239.120.42:3535/NTANCIS"
 }
 
+# 커넥션 풀 크기 (보고서 내 동시 실행 쿼리 수)
+DB_POOL_SIZE = 4
+
+# 배열 페치 크기 (fetch_df_all은 prefetchrows도 같은 값으로 설정)
+FETCH_ARRAYSIZE = 10000
+
+# 쿼리 결과 캐시 (당일 동일 SQL은 Parquet에서 읽고 DB 조회 생략)
+QUERY_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.query_cache')
+
 # 색상 팔레트
 COLORS = {
     'primary': '1F4E79',      # 진한 파랑
@@ -48,519 +51,606 @@ COLORS = {
     'orange': 'ED7D31',
 }
 
+# 줄무늬 배경색
+STRIPE_COLOR = 'F2F2F2'
+
+# 공용 글꼴/정렬 속성 (xlsxwriter 서식 속성 dict)
+FONT_NAME = '맑은 고딕'
+CENTER = {'align': 'center', 'valign': 'vcenter'}
+LIGHT_BORDER = {'border': 1, 'border_color': f"#{COLORS['light']}"}
+WHITE_BORDER = {'border': 1, 'border_color': f"#{COLORS['white']}"}
+
+# 열 문자 미리 계산 (COL_LETTERS[1] == 'A')
+COL_LETTERS = [None] + [xl_col_to_name(i) for i in range(255)]
+
+# 데이터 시트 배치 (0부터 시작: 1행 제목, 3행 헤더, 4행부터 데이터)
+HEADER_ROW = 2
+DATA_FIRST_ROW = HEADER_ROW + 1
+
+# 데이터 행 기록 배치 크기 (Arrow → Python 값 변환 단위)
+DATA_BATCH_ROWS = 1024
+
+# 차트 크기 단위 변환 (cm → 픽셀, 96 DPI)
+PX_PER_CM = 96 / 2.54
+
+
+def color(name):
+    """COLORS 키 또는 RRGGBB 값을 xlsxwriter 색상 문자열로 변환"""
+    return f"#{COLORS.get(name, name)}"
+
+
 # 스타일 정의
-def create_styles():
-    """스타일 생성"""
+def create_styles(wb):
+    """워크북에 셀 서식(Format) 등록 (워크북당 1회)
+
+    xlsxwriter 서식은 워크북 단위 객체이므로 한 번 만들어 두고
+    셀을 쓸 때 서식 객체만 넘겨 셀마다 스타일을 만드는 비용을 피합니다.
+    """
+    styles = getattr(wb, '_clri_styles', None)
+    if styles is not None:
+        return styles
+    
     styles = {}
     
     # 제목 스타일
-    styles['title'] = {
-        'font': Font(name='맑은 고딕', size=28, bold=True, color=COLORS['primary']),
-        'alignment': Alignment(horizontal='center', vertical='center'),
-    }
+    styles['title'] = wb.add_format({
+        'font_name': FONT_NAME, 'font_size': 28, 'bold': True,
+        'font_color': color('primary'), **CENTER,
+    })
     
     # 부제목 스타일
-    styles['subtitle'] = {
-        'font': Font(name='맑은 고딕', size=14, color=COLORS['secondary']),
-        'alignment': Alignment(horizontal='center', vertical='center'),
-    }
+    styles['subtitle'] = wb.add_format({
+        'font_name': FONT_NAME, 'font_size': 14,
+        'font_color': color('secondary'), **CENTER,
+    })
+    
+    # 생성 일시
+    styles['date'] = wb.add_format({
+        'font_name': FONT_NAME, 'font_size': 11,
+        'font_color': color('secondary'), 'align': 'center',
+    })
+    
+    # 시트 제목
+    styles['sheet_title'] = wb.add_format({
+        'font_name': FONT_NAME, 'font_size': 16, 'bold': True,
+        'font_color': color('primary'), 'align': 'left', 'valign': 'vcenter',
+    })
     
     # 헤더 스타일
-    styles['header'] = {
-        'font': Font(name='맑은 고딕', size=11, bold=True, color=COLORS['white']),
-        'fill': PatternFill(start_color=COLORS['primary'], end_color=COLORS['primary'], fill_type='solid'),
-        'alignment': Alignment(horizontal='center', vertical='center', wrap_text=True),
-        'border': Border(
-            left=Side(style='thin', color=COLORS['white']),
-            right=Side(style='thin', color=COLORS['white']),
-            top=Side(style='thin', color=COLORS['white']),
-            bottom=Side(style='thin', color=COLORS['white'])
-        )
-    }
+    styles['header'] = wb.add_format({
+        'font_name': FONT_NAME, 'font_size': 11, 'bold': True,
+        'font_color': color('white'), 'bg_color': color('primary'),
+        'text_wrap': True, **CENTER, **WHITE_BORDER,
+    })
     
-    # 데이터 스타일
-    styles['data'] = {
-        'font': Font(name='맑은 고딕', size=10),
-        'alignment': Alignment(horizontal='center', vertical='center'),
-        'border': Border(
-            left=Side(style='thin', color=COLORS['light']),
-            right=Side(style='thin', color=COLORS['light']),
-            top=Side(style='thin', color=COLORS['light']),
-            bottom=Side(style='thin', color=COLORS['light'])
-        )
-    }
+    # 배너 / KPI 카드 배경
+    styles['banner'] = wb.add_format({'bg_color': color('primary')})
+    styles['card'] = wb.add_format({'bg_color': color('light')})
     
-    # 숫자 스타일
-    styles['number'] = {
-        'font': Font(name='맑은 고딕', size=10),
-        'alignment': Alignment(horizontal='right', vertical='center'),
-        'border': Border(
-            left=Side(style='thin', color=COLORS['light']),
-            right=Side(style='thin', color=COLORS['light']),
-            top=Side(style='thin', color=COLORS['light']),
-            bottom=Side(style='thin', color=COLORS['light'])
-        )
-    }
+    # KPI 카드 스타일 (카드 배경 포함)
+    styles['kpi_label'] = wb.add_format({
+        'font_name': FONT_NAME, 'font_size': 10,
+        'font_color': color('dark'), 'bg_color': color('light'), **CENTER,
+    })
     
-    # KPI 카드 스타일
-    styles['kpi_label'] = {
-        'font': Font(name='맑은 고딕', size=10, color=COLORS['dark']),
-        'alignment': Alignment(horizontal='center', vertical='center'),
-    }
+    styles['kpi_value'] = wb.add_format({
+        'font_name': FONT_NAME, 'font_size': 24, 'bold': True,
+        'font_color': color('primary'), 'bg_color': color('light'), **CENTER,
+    })
     
-    styles['kpi_value'] = {
-        'font': Font(name='맑은 고딕', size=24, bold=True, color=COLORS['primary']),
-        'alignment': Alignment(horizontal='center', vertical='center'),
-    }
+    # 데이터/숫자 셀 서식은 (숫자 포맷, 줄무늬) 조합별로 필요할 때 생성
+    styles['cells'] = {}
+    
+    wb._clri_styles = styles
     
     return styles
 
 
-def apply_style(cell, style_dict):
-    """셀에 스타일 적용"""
-    for key, value in style_dict.items():
-        setattr(cell, key, value)
+def data_cell_format(wb, number_format, striped):
+    """데이터 셀 서식 조회 (숫자 포맷 × 줄무늬 조합별 1회 생성)
+
+    Args:
+        number_format: 숫자 포맷 (None이면 텍스트 데이터 셀)
+        striped: 줄무늬(회색) 배경 여부
+    """
+    cells = create_styles(wb)['cells']
+    key = (number_format, striped)
+    if key not in cells:
+        properties = {
+            'font_name': FONT_NAME, 'font_size': 10, 'valign': 'vcenter',
+            'bg_color': color(STRIPE_COLOR if striped else 'white'),
+            **LIGHT_BORDER,
+        }
+        if number_format is None:
+            properties['align'] = 'center'
+        else:
+            properties['align'] = 'right'
+            properties['num_format'] = number_format
+        cells[key] = wb.add_format(properties)
+    return cells[key]
+
+
+def query_cache_path(sql, params=None):
+    """SQL·바인드 값별 당일 캐시 파일 경로 ({날짜}_{해시}.parquet)"""
+    key = hashlib.md5(f"{sql}{sorted((params or {}).items())}".encode('utf-8')).hexdigest()
+    return os.path.join(QUERY_CACHE_DIR, f"{date.today().isoformat()}_{key}.parquet")
+
+
+def prune_query_cache():
+    """당일이 아닌 캐시 파일 삭제"""
+    if not os.path.isdir(QUERY_CACHE_DIR):
+        return
+    today = date.today().isoformat()
+    for name in os.listdir(QUERY_CACHE_DIR):
+        if name.endswith('.parquet') and not name.startswith(today):
+            os.remove(os.path.join(QUERY_CACHE_DIR, name))
+
+
+def read_sql(sql, pool, params=None):
+    """쿼리 결과를 DataFrame으로 조회 (pd.read_sql 대체)
+
+    oracledb의 fetch_df_all()로 대용량 배열 페치 후 Arrow 컬럼을
+    그대로 pandas로 변환하여 행 단위 Python 튜플 생성을 피합니다.
+    컬럼은 Arrow 기반 dtype(pd.ArrowDtype)으로 유지되며 NULL은 pd.NA입니다.
+    결과는 당일 Parquet 캐시에 저장되어 같은 날 재실행 시 DB를 조회하지 않습니다.
+    
+    Args:
+        sql: 조회 SQL (임계값 등은 바인드 변수로 지정)
+        pool: oracledb 커넥션 풀
+        params: 바인드 변수 {이름: 값}
+    """
+    path = query_cache_path(sql, params)
+    if os.path.exists(path):
+        table = pq.read_table(path, memory_map=True)
+    else:
+        with pool.acquire() as conn:
+            odf = conn.fetch_df_all(statement=sql, parameters=params, arraysize=FETCH_ARRAYSIZE)
+            table = pa.Table.from_arrays(odf.column_arrays(), names=odf.column_names())
+        
+        # 임시 파일에 쓴 뒤 교체 (동시 실행 중 불완전한 파일을 읽지 않도록)
+        os.makedirs(QUERY_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def run_queries(pool, queries):
+    """여러 쿼리를 커넥션 풀에서 동시에 실행
+
+    Args:
+        pool: oracledb 커넥션 풀
+        queries: {이름: (SQL, 바인드 변수)}
+
+    Returns:
+        {이름: DataFrame}
+    """
+    with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+        futures = {
+            name: executor.submit(read_sql, sql, pool, params)
+            for name, (sql, params) in queries.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
 
 
 def create_cover_sheet(wb, title, subtitle, metrics):
-    """표지 시트 생성"""
-    ws = wb.create_sheet("표지", 0)
-    styles = create_styles()
-    
-    # 배경색 설정
-    for row in range(1, 50):
-        for col in range(1, 20):
-            ws.cell(row=row, column=col).fill = PatternFill(
-                start_color=COLORS['white'], 
-                end_color=COLORS['white'], 
-                fill_type='solid'
-            )
+    """표지 시트 생성 (가장 먼저 추가하여 첫 번째 시트로 배치)"""
+    ws = wb.add_worksheet("표지")
+    styles = create_styles(wb)
+    
+    # 열 너비 조정
+    ws.set_column(0, 13, 12)
     
     # 상단 배너
-    for col in range(1, 15):
-        ws.cell(row=1, column=col).fill = PatternFill(
-            start_color=COLORS['primary'], 
-            end_color=COLORS['primary'], 
-            fill_type='solid'
-        )
-        ws.cell(row=2, column=col).fill = PatternFill(
-            start_color=COLORS['primary'], 
-            end_color=COLORS['primary'], 
-            fill_type='solid'
-        )
+    for row in (0, 1):
+        for col in range(14):
+            ws.write_blank(row, col, None, styles['banner'])
     
     # 제목
-    ws.merge_cells('B5:M5')
-    title_cell = ws['B5']
-    title_cell.value = title
-    apply_style(title_cell, styles['title'])
-    ws.row_dimensions[5].height = 50
+    ws.merge_range('B5:M5', title, styles['title'])
+    ws.set_row(4, 50)
     
     # 부제목
-    ws.merge_cells('B7:M7')
-    subtitle_cell = ws['B7']
-    subtitle_cell.value = subtitle
-    apply_style(subtitle_cell, styles['subtitle'])
+    ws.merge_range('B7:M7', subtitle, styles['subtitle'])
     
     # 생성 일시
-    ws.merge_cells('B9:M9')
-    date_cell = ws['B9']
-    date_cell.value = f"생성일시: {datetime.now().strftime('%Y년 %m월 %d일 %H:%M')}"
-    date_cell.font = Font(name='맑은 고딕', size=11, color=COLORS['secondary'])
-    date_cell.alignment = Alignment(horizontal='center')
+    ws.merge_range(
+        'B9:M9', f"생성일시: {datetime.now().strftime('%Y년 %m월 %d일 %H:%M')}",
+        styles['date']
+    )
     
-    # KPI 카드들
-    row = 12
-    col_positions = [2, 5, 8, 11]
+    # KPI 카드들 (라벨 1행 + 값 2행 + 여백 1행, 모두 카드 배경)
+    row = 11
+    col_positions = [1, 4, 7, 10]
     
     for i, (label, value) in enumerate(metrics.items()):
         if i >= 4:
             break
         col = col_positions[i]
         
-        # 카드 배경
-        for r in range(row, row + 4):
-            for c in range(col, col + 3):
-                ws.cell(row=r, column=c).fill = PatternFill(
-                    start_color=COLORS['light'], 
-                    end_color=COLORS['light'], 
-                    fill_type='solid'
-                )
-        
         # 라벨
-        ws.merge_cells(start_row=row, start_column=col, end_row=row, end_column=col+2)
-        label_cell = ws.cell(row=row, column=col)
-        label_cell.value = label
-        apply_style(label_cell, styles['kpi_label'])
+        ws.merge_range(row, col, row, col + 2, label, styles['kpi_label'])
         
         # 값
-        ws.merge_cells(start_row=row+1, start_column=col, end_row=row+2, end_column=col+2)
-        value_cell = ws.cell(row=row+1, column=col)
-        value_cell.value = value
-        apply_style(value_cell, styles['kpi_value'])
-    
-    # 열 너비 조정
-    for col in range(1, 15):
-        ws.column_dimensions[get_column_letter(col)].width = 12
+        ws.merge_range(row + 1, col, row + 2, col + 2, value, styles['kpi_value'])
+        
+        # 카드 하단 여백
+        ws.merge_range(row + 3, col, row + 3, col + 2, None, styles['card'])
     
     return ws
 
 
-def style_data_sheet(ws, df, sheet_title, has_chart=False):
-    """데이터 시트 스타일링"""
-    styles = create_styles()
+def column_number_formats(df):
+    """컬럼별 숫자 포맷 결정 (컬럼 최대값 기준, 숫자 컬럼이 아니면 None)"""
+    formats = []
+    for col_name in df.columns:
+        series = df[col_name]
+        if not pd.api.types.is_numeric_dtype(series):
+            formats.append(None)
+            continue
+        
+        # 빈 컬럼/전체 NULL 컬럼은 최대값이 pd.NA이므로 기본 포맷 사용
+        max_value = series.max()
+        if pd.isna(max_value):
+            formats.append('#,##0')
+        elif max_value > 1000000000:
+            formats.append('#,##0,,"B"')
+        elif max_value > 1000000:
+            formats.append('#,##0,,"M"')
+        else:
+            formats.append('#,##0')
+    return formats
+
+
+def style_data_sheet(wb, ws, df, sheet_title, has_chart=False):
+    """데이터 시트 스타일링 (제목 1행, 헤더 3행, 데이터 4행부터)"""
+    styles = create_styles(wb)
+    
+    # 열 너비 자동 조정
+    for col_idx, col_name in enumerate(df.columns):
+        value_lengths = df[col_name].dropna().astype(str).str.len()
+        max_length = len(str(col_name))
+        if len(value_lengths):
+            max_length = max(max_length, int(value_lengths.max()))
+        
+        ws.set_column(col_idx, col_idx, min(max_length + 4, 30))
     
     # 시트 제목 (A1:전체 컬럼 병합)
     num_cols = len(df.columns)
-    ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=num_cols)
-    title_cell = ws.cell(row=1, column=1)
-    title_cell.value = f"📊 {sheet_title}"
-    title_cell.font = Font(name='맑은 고딕', size=16, bold=True, color=COLORS['primary'])
-    title_cell.alignment = Alignment(horizontal='left', vertical='center')
-    ws.row_dimensions[1].height = 35
+    ws.merge_range(0, 0, 0, num_cols - 1, f"📊 {sheet_title}", styles['sheet_title'])
+    ws.set_row(0, 35)
     
     # 빈 행
-    ws.row_dimensions[2].height = 10
-    
-    # 데이터 시작 행
-    start_row = 3
+    ws.set_row(1, 10)
     
     # 헤더 작성
-    for col_idx, col_name in enumerate(df.columns, 1):
-        cell = ws.cell(row=start_row, column=col_idx)
-        cell.value = col_name
-        apply_style(cell, styles['header'])
-    ws.row_dimensions[start_row].height = 30
-    
-    # 데이터 작성
-    for row_idx, row_data in enumerate(df.values, start_row + 1):
-        # 줄무늬 배경
-        if row_idx % 2 == 0:
-            row_fill = PatternFill(start_color='F2F2F2', end_color='F2F2F2', fill_type='solid')
-        else:
-            row_fill = PatternFill(start_color=COLORS['white'], end_color=COLORS['white'], fill_type='solid')
-        
-        for col_idx, value in enumerate(row_data, 1):
-            cell = ws.cell(row=row_idx, column=col_idx)
-            cell.value = value
-            cell.fill = row_fill
-            
-            # 숫자 포맷팅
-            if isinstance(value, (int, float)):
-                if value > 1000000000:
-                    cell.number_format = '#,##0,,"B"'
-                elif value > 1000000:
-                    cell.number_format = '#,##0,,"M"'
-                else:
-                    cell.number_format = '#,##0'
-                apply_style(cell, styles['number'])
-            else:
-                apply_style(cell, styles['data'])
-        
-        ws.row_dimensions[row_idx].height = 22
-    
-    # 열 너비 자동 조정
-    for col_idx, col_name in enumerate(df.columns, 1):
-        max_length = len(str(col_name))
-        for row_idx in range(start_row + 1, start_row + 1 + len(df)):
-            cell_value = ws.cell(row=row_idx, column=col_idx).value
-            if cell_value:
-                max_length = max(max_length, len(str(cell_value)))
-        
-        adjusted_width = min(max_length + 4, 30)
-        ws.column_dimensions[get_column_letter(col_idx)].width = adjusted_width
+    ws.write_row(HEADER_ROW, 0, list(df.columns), styles['header'])
+    ws.set_row(HEADER_ROW, 30)
+    
+    # 데이터 작성 (줄무늬 배경, 엑셀 행 번호가 짝수인 행이 회색)
+    col_formats = column_number_formats(df)
+    row_formats = {
+        striped: [data_cell_format(wb, number_format, striped) for number_format in col_formats]
+        for striped in (False, True)
+    }
+    # Arrow 기반 컬럼을 복사 없이 Arrow 테이블로 보고, 배치 단위로만 Python 값 생성 (NULL은 None)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    row_idx = DATA_FIRST_ROW
+    
+    for batch in table.to_batches(max_chunksize=DATA_BATCH_ROWS):
+        columns = [column.to_pylist() for column in batch.columns]
+        for row_data in zip(*columns):
+            formats = row_formats[row_idx % 2 == 1]
+            for col_idx, (value, cell_format) in enumerate(zip(row_data, formats)):
+                ws.write(row_idx, col_idx, value, cell_format)
+            ws.set_row(row_idx, 22)
+            row_idx += 1
     
     return ws
 
 
-def add_bar_chart(ws, title, data_range, cat_range, position, width=15, height=10):
-    """막대 차트 추가"""
-    chart = BarChart()
-    chart.type = "col"
-    chart.style = 10
-    chart.title = title
-    chart.y_axis.title = None
-    chart.x_axis.title = None
-    chart.legend = None
-    
-    data = Reference(ws, **data_range)
-    cats = Reference(ws, **cat_range)
-    chart.add_data(data, titles_from_data=True)
-    chart.set_categories(cats)
+def chart_series(ws, value_col, num_rows, cat_col=0):
+    """데이터 시트 범위로 차트 시리즈 정의 (열 번호는 0부터 시작)
+
+    시리즈 이름은 헤더 셀, 값/항목은 데이터 첫 행부터 num_rows개 행입니다.
+    """
+    last_row = DATA_FIRST_ROW + num_rows - 1
+    return {
+        'name': [ws.name, HEADER_ROW, value_col],
+        'values': [ws.name, DATA_FIRST_ROW, value_col, last_row, value_col],
+        'categories': [ws.name, DATA_FIRST_ROW, cat_col, last_row, cat_col],
+    }
+
+
+def add_bar_chart(wb, ws, title, value_col, num_rows, position, width=15, height=10):
+    """막대 차트 추가 (width/height: cm)"""
+    chart = wb.add_chart({'type': 'column'})
+    chart.set_style(10)
+    chart.set_title({'name': title})
+    chart.set_legend({'none': True})
     
     # 색상 설정
-    chart.series[0].graphicalProperties.solidFill = COLORS['accent']
+    chart.add_series({
+        **chart_series(ws, value_col, num_rows),
+        'fill': {'color': color('accent')},
+    })
     
-    chart.width = width
-    chart.height = height
+    chart.set_size({'width': width * PX_PER_CM, 'height': height * PX_PER_CM})
     
-    ws.add_chart(chart, position)
+    ws.insert_chart(position, chart)
     return chart
 
 
-def add_line_chart(ws, title, data_range, cat_range, position, width=18, height=10):
-    """라인 차트 추가"""
-    chart = LineChart()
-    chart.style = 10
-    chart.title = title
-    chart.y_axis.title = None
-    chart.x_axis.title = None
+def add_line_chart(wb, ws, title, value_col, num_rows, position, width=18, height=10):
+    """라인 차트 추가 (width/height: cm)"""
+    chart = wb.add_chart({'type': 'line'})
+    chart.set_style(10)
+    chart.set_title({'name': title})
     
-    data = Reference(ws, **data_range)
-    cats = Reference(ws, **cat_range)
-    chart.add_data(data, titles_from_data=True)
-    chart.set_categories(cats)
+    chart.add_series({
+        **chart_series(ws, value_col, num_rows),
+        'line': {'color': color('primary'), 'width': 2},
+        'smooth': True,
+    })
     
-    chart.series[0].graphicalProperties.line.solidFill = COLORS['primary']
-    chart.series[0].graphicalProperties.line.width = 25000  # EMUs
-    chart.series[0].smooth = True
+    chart.set_size({'width': width * PX_PER_CM, 'height': height * PX_PER_CM})
     
-    chart.width = width
-    chart.height = height
-    
-    ws.add_chart(chart, position)
+    ws.insert_chart(position, chart)
     return chart
 
 
-def add_doughnut_chart(ws, title, data_range, cat_range, position, width=12, height=10):
-    """도넛 차트 추가"""
-    chart = DoughnutChart()
-    chart.title = title
-    chart.style = 10
+def add_doughnut_chart(wb, ws, title, value_col, num_rows, position, width=12, height=10):
+    """도넛 차트 추가 (width/height: cm)"""
+    chart = wb.add_chart({'type': 'doughnut'})
+    chart.set_title({'name': title})
+    chart.set_style(10)
     
-    data = Reference(ws, **data_range)
-    cats = Reference(ws, **cat_range)
-    chart.add_data(data, titles_from_data=True)
-    chart.set_categories(cats)
+    chart.add_series(chart_series(ws, value_col, num_rows))
     
-    chart.width = width
-    chart.height = height
+    chart.set_size({'width': width * PX_PER_CM, 'height': height * PX_PER_CM})
     
-    ws.add_chart(chart, position)
+    ws.insert_chart(position, chart)
     return chart
 
 
 def add_conditional_formatting(ws, start_row, end_row, col, rule_type='colorscale'):
-    """조건부 서식 추가"""
-    col_letter = get_column_letter(col)
+    """조건부 서식 추가 (행/열 번호는 1부터 시작)"""
+    col_letter = COL_LETTERS[col]
     range_str = f"{col_letter}{start_row}:{col_letter}{end_row}"
     
     if rule_type == 'colorscale':
-        rule = ColorScaleRule(
-            start_type='min', start_color='63BE7B',
-            mid_type='percentile', mid_value=50, mid_color='FFEB84',
-            end_type='max', end_color='F8696B'
-        )
-        ws.conditional_formatting.add(range_str, rule)
+        ws.conditional_format(range_str, {
+            'type': '3_color_scale',
+            'min_type': 'min', 'min_color': '#63BE7B',
+            'mid_type': 'percentile', 'mid_value': 50, 'mid_color': '#FFEB84',
+            'max_type': 'max', 'max_color': '#F8696B',
+        })
     elif rule_type == 'databar':
-        rule = DataBarRule(
-            start_type='min', start_value=0,
-            end_type='max', end_value=100,
-            color=COLORS['accent']
-        )
-        ws.conditional_formatting.add(range_str, rule)
+        ws.conditional_format(range_str, {
+            'type': 'data_bar',
+            'min_type': 'min', 'max_type': 'max',
+            'bar_color': color('accent'),
+        })
 
 
-def create_revenue_report(conn, output_path):
+def create_revenue_report(pool, output_path):
     """관세 수입 현황 보고서 생성"""
     print("📊 관세 수입 현황 보고서 생성 중...")
     
-    wb = Workbook()
-    # 기본 시트 제거
-    wb.remove(wb.active)
-    
-    # 데이터 조회
-    print("  → 연도별 데이터 조회...")
-    df_yearly = pd.read_sql("""
-        SELECT 
-            '20' || TANSAD_YY as 연도,
-            COUNT(*) as 건수,
-            SUM(ITM_TAX_AMT) as 총세액,
-            SUM(ITM_INVC_USD_AMT) as "총수입액(USD)"
-        FROM CLRI_TANSAD_ITM_D
-        WHERE DEL_YN = 'N' AND TANSAD_YY >= '20'
-        GROUP BY TANSAD_YY
-        ORDER BY TANSAD_YY DESC
-    """, conn)
-    
-    print("  → 품목별 데이터 조회...")
-    df_commodity = pd.read_sql("""
-        SELECT 
-            SUBSTR(HS_CD, 1, 2) as "HS코드",
-            COUNT(*) as 건수,
-            SUM(ITM_TAX_AMT) as 총세액,
-            ROUND(SUM(ITM_TAX_AMT) * 100.0 / SUM(SUM(ITM_TAX_AMT)) OVER(), 1) as "비중(%)"
-        FROM CLRI_TANSAD_ITM_D
-        WHERE DEL_YN = 'N' AND ITM_TAX_AMT > 0
-        GROUP BY SUBSTR(HS_CD, 1, 2)
-        ORDER BY 총세액 DESC
-        FETCH FIRST 15 ROWS ONLY
-    """, conn)
-    
-    print("  → 국가별 데이터 조회...")
-    df_country = pd.read_sql("""
-        SELECT 
-            ORIG_CNTY_CD as "국가코드",
-            COUNT(*) as 건수,
-            SUM(ITM_TAX_AMT) as 총세액,
-            SUM(ITM_INVC_USD_AMT) as "총수입액(USD)"
-        FROM CLRI_TANSAD_ITM_D
-        WHERE DEL_YN = 'N' AND ORIG_CNTY_CD IS NOT NULL
-        GROUP BY ORIG_CNTY_CD
-        ORDER BY "총수입액(USD)" DESC NULLS LAST
-        FETCH FIRST 15 ROWS ONLY
-    """, conn)
-    
-    print("  → 월별 데이터 조회...")
-    df_monthly = pd.read_sql("""
-        SELECT 
-            TO_CHAR(FRST_RGSR_DTM, 'YYYY-MM') as 월,
-            COUNT(*) as 건수,
-            SUM(ITM_TAX_AMT) as 총세액
-        FROM CLRI_TANSAD_ITM_D
-        WHERE DEL_YN = 'N' 
-          AND FRST_RGSR_DTM >= ADD_MONTHS(SYSDATE, -24)
-        GROUP BY TO_CHAR(FRST_RGSR_DTM, 'YYYY-MM')
-        ORDER BY 월
-    """, conn)
-    
-    # 표지 생성
+    wb = xlsxwriter.Workbook(output_path)
+    create_styles(wb)
+    
+    # 데이터 조회 (4개 쿼리 동시 실행)
+    print("  → 연도별/품목별/국가별/월별 데이터 조회...")
+    results = run_queries(pool, {
+        'yearly': ("""
+            SELECT /*+ RESULT_CACHE */
+                '20' || TANSAD_YY as 연도,
+                COUNT(*) as 건수,
+                SUM(ITM_TAX_AMT) as 총세액,
+                SUM(ITM_INVC_USD_AMT) as "총수입액(USD)"
+            FROM CLRI_TANSAD_ITM_D
+            WHERE DEL_YN = 'N' AND TANSAD_YY >= :min_yy
+            GROUP BY TANSAD_YY
+            ORDER BY TANSAD_YY DESC
+        """, {'min_yy': '20'}),
+        'commodity': ("""
+            SELECT /*+ RESULT_CACHE */
+                SUBSTR(HS_CD, 1, 2) as "HS코드",
+                COUNT(*) as 건수,
+                SUM(ITM_TAX_AMT) as 총세액,
+                ROUND(SUM(ITM_TAX_AMT) * 100.0 / SUM(SUM(ITM_TAX_AMT)) OVER(), 1) as "비중(%)"
+            FROM CLRI_TANSAD_ITM_D
+            WHERE DEL_YN = 'N' AND ITM_TAX_AMT > 0
+            GROUP BY SUBSTR(HS_CD, 1, 2)
+            ORDER BY 총세액 DESC
+            FETCH FIRST :top_n ROWS ONLY
+        """, {'top_n': 15}),
+        'country': ("""
+            SELECT /*+ RESULT_CACHE */
+                ORIG_CNTY_CD as "국가코드",
+                COUNT(*) as 건수,
+                SUM(ITM_TAX_AMT) as 총세액,
+                SUM(ITM_INVC_USD_AMT) as "총수입액(USD)"
+            FROM CLRI_TANSAD_ITM_D
+            WHERE DEL_YN = 'N' AND ORIG_CNTY_CD IS NOT NULL
+            GROUP BY ORIG_CNTY_CD
+            ORDER BY "총수입액(USD)" DESC NULLS LAST
+            FETCH FIRST :top_n ROWS ONLY
+        """, {'top_n': 15}),
+        'monthly': ("""
+            SELECT 
+                TO_CHAR(TRUNC(FRST_RGSR_DTM, 'MM'), 'YYYY-MM') as 월,
+                COUNT(*) as 건수,
+                SUM(ITM_TAX_AMT) as 총세액
+            FROM CLRI_TANSAD_ITM_D
+            WHERE DEL_YN = 'N' 
+              AND FRST_RGSR_DTM >= ADD_MONTHS(SYSDATE, -:months)
+            GROUP BY TRUNC(FRST_RGSR_DTM, 'MM')
+            ORDER BY TRUNC(FRST_RGSR_DTM, 'MM')
+        """, {'months': 24}),
+    })
+    df_yearly = results['yearly']
+    df_commodity = results['commodity']
+    df_country = results['country']
+    df_monthly = results['monthly']
+    
+    # 표지 생성 (연도별 집계에서 합계/기간을 한 번에 계산)
+    totals = df_yearly.agg({'건수': 'sum', '총세액': 'sum', '총수입액(USD)': 'sum', '연도': ['min', 'max']})
     metrics = {
-        '총 건수': f"{df_yearly['건수'].sum():,.0f}",
-        '총 세액': f"{df_yearly['총세액'].sum()/1e12:.1f}조",
-        '총 수입액': f"${df_yearly['총수입액(USD)'].sum()/1e9:.0f}B",
-        '분석 기간': f"{df_yearly['연도'].min()}~{df_yearly['연도'].max()}"
+        '총 건수': f"{totals.loc['sum', '건수']:,.0f}",
+        '총 세액': f"{totals.loc['sum', '총세액']/1e12:.1f}조",
+        '총 수입액': f"${totals.loc['sum', '총수입액(USD)']/1e9:.0f}B",
+        '분석 기간': f"{totals.loc['min', '연도']}~{totals.loc['max', '연도']}"
     }
     create_cover_sheet(wb, "관세 수입 현황 분석", "Customs Revenue Analysis Report", metrics)
     
     # 연도별 추이 시트
     print("  → 연도별 추이 시트 생성...")
-    ws_yearly = wb.create_sheet("연도별 추이")
-    style_data_sheet(ws_yearly, df_yearly, "연도별 관세 수입 추이")
+    ws_yearly = wb.add_worksheet("연도별 추이")
+    style_data_sheet(wb, ws_yearly, df_yearly, "연도별 관세 수입 추이")
     
     # 차트 추가
     add_bar_chart(
-        ws_yearly, "연도별 총세액",
-        {'min_col': 3, 'min_row': 3, 'max_row': 3 + len(df_yearly), 'max_col': 3},
-        {'min_col': 1, 'min_row': 4, 'max_row': 3 + len(df_yearly)},
+        wb, ws_yearly, "연도별 총세액", 2, len(df_yearly),
         "F3"
     )
     
     # 품목별 현황 시트
     print("  → 품목별 현황 시트 생성...")
-    ws_commodity = wb.create_sheet("품목별 현황")
-    style_data_sheet(ws_commodity, df_commodity, "HS코드별 관세 수입 TOP 15")
+    ws_commodity = wb.add_worksheet("품목별 현황")
+    style_data_sheet(wb, ws_commodity, df_commodity, "HS코드별 관세 수입 TOP 15")
     
     # 조건부 서식 (비중 컬럼)
     add_conditional_formatting(ws_commodity, 4, 4 + len(df_commodity) - 1, 4, 'databar')
     
     # 도넛 차트
     add_doughnut_chart(
-        ws_commodity, "품목별 세액 비중",
-        {'min_col': 3, 'min_row': 3, 'max_row': 3 + min(10, len(df_commodity)), 'max_col': 3},
-        {'min_col': 1, 'min_row': 4, 'max_row': 3 + min(10, len(df_commodity))},
+        wb, ws_commodity, "품목별 세액 비중", 2, min(10, len(df_commodity)),
         "F3"
     )
     
     # 국가별 현황 시트
     print("  → 국가별 현황 시트 생성...")
-    ws_country = wb.create_sheet("국가별 현황")
-    style_data_sheet(ws_country, df_country, "원산지 국가별 수입 현황 TOP 15")
+    ws_country = wb.add_worksheet("국가별 현황")
+    style_data_sheet(wb, ws_country, df_country, "원산지 국가별 수입 현황 TOP 15")
     
     add_bar_chart(
-        ws_country, "국가별 수입액",
-        {'min_col': 4, 'min_row': 3, 'max_row': 3 + len(df_country), 'max_col': 4},
-        {'min_col': 1, 'min_row': 4, 'max_row': 3 + len(df_country)},
+        wb, ws_country, "국가별 수입액", 3, len(df_country),
         "F3"
     )
     
     # 월별 추이 시트
     print("  → 월별 추이 시트 생성...")
-    ws_monthly = wb.create_sheet("월별 추이")
-    style_data_sheet(ws_monthly, df_monthly, "최근 24개월 관세 수입 추이")
+    ws_monthly = wb.add_worksheet("월별 추이")
+    style_data_sheet(wb, ws_monthly, df_monthly, "최근 24개월 관세 수입 추이")
     
     add_line_chart(
-        ws_monthly, "월별 세액 추이",
-        {'min_col': 3, 'min_row': 3, 'max_row': 3 + len(df_monthly), 'max_col': 3},
-        {'min_col': 1, 'min_row': 4, 'max_row': 3 + len(df_monthly)},
+        wb, ws_monthly, "월별 세액 추이", 2, len(df_monthly),
         "E3"
     )
     
     # 저장
-    wb.save(output_path)
+    wb.close()
     print(f"✅ 저장 완료: {output_path}")
 
 
-def create_anomaly_report(conn, output_path):
+def create_anomaly_report(pool, output_path):
     """이상 탐지 보고서 생성"""
     print("\n🚨 이상 탐지 보고서 생성 중...")
     
-    wb = Workbook()
-    wb.remove(wb.active)
-    
-    # 데이터 조회
-    print("  → 과소신고 데이터 조회...")
-    df_underval = pd.read_sql("""
-        SELECT 
-            SUBSTR(ASSD_HS_CD, 1, 4) as "HS코드",
-            ORIG_CNTY_CD as "국가",
-            COUNT(*) as 건수,
-            ROUND(AVG((ASSD_UT_USD_VAL - DCLD_UT_USD_VAL) / NULLIF(DCLD_UT_USD_VAL, 0) * 100), 1) as "평균차이(%)",
-            SUM(ASSD_INVC_USD_AMT - DCLD_INVC_USD_AMT) as "총차액(USD)"
-        FROM CLRI_TANSAD_UT_PRC_M
-        WHERE DEL_YN = 'N'
-          AND DCLD_UT_USD_VAL > 0
-          AND ASSD_UT_USD_VAL > DCLD_UT_USD_VAL * 1.3
-          AND TANSAD_YY >= '23'
-        GROUP BY SUBSTR(ASSD_HS_CD, 1, 4), ORIG_CNTY_CD
-        HAVING COUNT(*) >= 10
-        ORDER BY "총차액(USD)" DESC NULLS LAST
-        FETCH FIRST 30 ROWS ONLY
-    """, conn)
-    
-    print("  → 리스크 분석 데이터 조회...")
-    df_risk = pd.read_sql("""
-        WITH risk_data AS (
+    wb = xlsxwriter.Workbook(output_path)
+    create_styles(wb)
+    
+    # 데이터 조회 (CLRI_TANSAD_UT_PRC_M 단일 스캔)
+    # GROUPING SETS로 품목-국가 / 업체 집계를 한 번에 계산한 뒤
+    # 섹션별 TOP 30만 반환하여 pandas에서 분리
+    print("  → 과소신고/리스크/고위험 업체 데이터 조회...")
+    df_all = read_sql("""
+        WITH base AS (
             SELECT 
                 SUBSTR(ASSD_HS_CD, 1, 4) as HS4,
                 ORIG_CNTY_CD,
+                IMPPN_TIN,
+                IMPPN_NM,
+                ASSD_INVC_USD_AMT,
+                CASE WHEN DCLD_UT_USD_VAL > 0 AND ASSD_UT_USD_VAL > DCLD_UT_USD_VAL * 1.3 THEN 1 ELSE 0 END as UNDERVAL_13,
+                CASE WHEN DCLD_UT_USD_VAL > 0 AND ASSD_UT_USD_VAL > DCLD_UT_USD_VAL * 1.5 THEN 1 ELSE 0 END as UNDERVAL_15,
                 CASE WHEN DCLD_HS_CD != ASSD_HS_CD THEN 1 ELSE 0 END as HS_CHANGED,
-                CASE WHEN ASSD_UT_USD_VAL > DCLD_UT_USD_VAL * 1.5 AND DCLD_UT_USD_VAL > 0 THEN 1 ELSE 0 END as UNDERVALUED
+                CASE WHEN DCLD_UT_USD_VAL > 0 AND ASSD_UT_USD_VAL > DCLD_UT_USD_VAL * 1.3
+                     THEN (ASSD_UT_USD_VAL - DCLD_UT_USD_VAL) / DCLD_UT_USD_VAL * 100 END as DIFF_PCT_13,
+                CASE WHEN DCLD_UT_USD_VAL > 0 AND ASSD_UT_USD_VAL > DCLD_UT_USD_VAL * 1.3
+                     THEN ASSD_INVC_USD_AMT - DCLD_INVC_USD_AMT END as DIFF_USD_13
             FROM CLRI_TANSAD_UT_PRC_M
-            WHERE DEL_YN = 'N' AND TANSAD_YY >= '23'
+            WHERE DEL_YN = 'N' AND TANSAD_YY >= :min_yy
+        ),
+        agg AS (
+            SELECT /*+ MATERIALIZE */
+                GROUPING(IMPPN_TIN) as BY_HS_COUNTRY,
+                HS4,
+                ORIG_CNTY_CD,
+                IMPPN_TIN,
+                MAX(IMPPN_NM) as IMPPN_NM,
+                COUNT(*) as TOTAL_CNT,
+                SUM(UNDERVAL_13) as UNDERVAL_13_CNT,
+                SUM(UNDERVAL_15) as UNDERVAL_15_CNT,
+                SUM(HS_CHANGED) as HS_CHANGE_CNT,
+                ROUND(AVG(DIFF_PCT_13), 1) as AVG_DIFF_PCT,
+                SUM(DIFF_USD_13) as TOTAL_DIFF_USD,
+                ROUND(SUM(UNDERVAL_13) * 100.0 / COUNT(*), 1) as UNDERVAL_13_RATE,
+                ROUND(SUM(UNDERVAL_15) * 100.0 / COUNT(*), 1) as UNDERVAL_15_RATE,
+                ROUND(SUM(UNDERVAL_15) * 3.0 / COUNT(*) * 100 + SUM(HS_CHANGED) * 2.0 / COUNT(*) * 100, 1) as RISK_SCORE,
+                SUM(ASSD_INVC_USD_AMT) as TOTAL_VALUE_USD
+            FROM base
+            GROUP BY GROUPING SETS ((HS4, ORIG_CNTY_CD), (IMPPN_TIN))
+        )
+        SELECT * FROM (
+            SELECT 'UNDERVAL' as SECTION, agg.*,
+                   ROW_NUMBER() OVER (ORDER BY TOTAL_DIFF_USD DESC NULLS LAST) as RN
+            FROM agg
+            WHERE BY_HS_COUNTRY = 1 AND UNDERVAL_13_CNT >= 10
+            UNION ALL
+            SELECT 'RISK' as SECTION, agg.*,
+                   ROW_NUMBER() OVER (ORDER BY RISK_SCORE DESC) as RN
+            FROM agg
+            WHERE BY_HS_COUNTRY = 1 AND HS4 IS NOT NULL AND UNDERVAL_15_CNT >= 50
+            UNION ALL
+            SELECT 'IMPORTER' as SECTION, agg.*,
+                   ROW_NUMBER() OVER (ORDER BY UNDERVAL_13_CNT DESC) as RN
+            FROM agg
+            WHERE BY_HS_COUNTRY = 0 AND TOTAL_CNT >= 20 AND UNDERVAL_13_CNT >= 5
         )
-        SELECT 
-            HS4 as "HS코드",
-            ORIG_CNTY_CD as "국가",
-            COUNT(*) as "총건수",
-            SUM(UNDERVALUED) as "과소신고",
-            ROUND(SUM(UNDERVALUED) * 100.0 / COUNT(*), 1) as "과소신고율(%)",
-            ROUND(SUM(UNDERVALUED) * 3.0 / COUNT(*) * 100 + SUM(HS_CHANGED) * 2.0 / COUNT(*) * 100, 1) as "리스크점수"
-        FROM risk_data
-        WHERE HS4 IS NOT NULL
-        GROUP BY HS4, ORIG_CNTY_CD
-        HAVING SUM(UNDERVALUED) >= 50
-        ORDER BY "리스크점수" DESC
-        FETCH FIRST 30 ROWS ONLY
-    """, conn)
-    
-    print("  → 고위험 업체 데이터 조회...")
-    df_importers = pd.read_sql("""
-        SELECT 
-            IMPPN_TIN as "사업자번호",
-            MAX(IMPPN_NM) as "업체명",
-            COUNT(*) as "총건수",
-            SUM(CASE WHEN ASSD_UT_USD_VAL > DCLD_UT_USD_VAL * 1.3 AND DCLD_UT_USD_VAL > 0 THEN 1 ELSE 0 END) as "과소신고건수",
-            ROUND(SUM(CASE WHEN ASSD_UT_USD_VAL > DCLD_UT_USD_VAL * 1.3 AND DCLD_UT_USD_VAL > 0 THEN 1 ELSE 0 END) * 100.0 / COUNT(*), 1) as "과소신고율(%)",
-            SUM(ASSD_INVC_USD_AMT) as "총거래액(USD)"
-        FROM CLRI_TANSAD_UT_PRC_M
-        WHERE DEL_YN = 'N' AND TANSAD_YY >= '23'
-        GROUP BY IMPPN_TIN
-        HAVING COUNT(*) >= 20
-           AND SUM(CASE WHEN ASSD_UT_USD_VAL > DCLD_UT_USD_VAL * 1.3 AND DCLD_UT_USD_VAL > 0 THEN 1 ELSE 0 END) >= 5
-        ORDER BY "과소신고건수" DESC
-        FETCH FIRST 30 ROWS ONLY
-    """, conn)
+        WHERE RN <= 30
+        ORDER BY SECTION, RN
+    """, pool, {'min_yy': '23'})
+    
+    def split_section(section, columns):
+        part = df_all[df_all['SECTION'] == section]
+        return part[list(columns)].rename(columns=columns).reset_index(drop=True)
+    
+    df_underval = split_section('UNDERVAL', {
+        'HS4': 'HS코드',
+        'ORIG_CNTY_CD': '국가',
+        'UNDERVAL_13_CNT': '건수',
+        'AVG_DIFF_PCT': '평균차이(%)',
+        'TOTAL_DIFF_USD': '총차액(USD)',
+    })
+    df_risk = split_section('RISK', {
+        'HS4': 'HS코드',
+        'ORIG_CNTY_CD': '국가',
+        'TOTAL_CNT': '총건수',
+        'UNDERVAL_15_CNT': '과소신고',
+        'UNDERVAL_15_RATE': '과소신고율(%)',
+        'RISK_SCORE': '리스크점수',
+    })
+    df_importers = split_section('IMPORTER', {
+        'IMPPN_TIN': '사업자번호',
+        'IMPPN_NM': '업체명',
+        'TOTAL_CNT': '총건수',
+        'UNDERVAL_13_CNT': '과소신고건수',
+        'UNDERVAL_13_RATE': '과소신고율(%)',
+        'TOTAL_VALUE_USD': '총거래액(USD)',
+    })
     
     # 표지 생성
     total_underval = df_underval['건수'].sum() if len(df_underval) > 0 else 0
@@ -577,8 +667,8 @@ def create_anomaly_report(conn, output_path):
     
     # 과소신고 의심 시트
     print("  → 과소신고 시트 생성...")
-    ws_underval = wb.create_sheet("과소신고 의심")
-    style_data_sheet(ws_underval, df_underval, "과소신고 의심 건 TOP 30")
+    ws_underval = wb.add_worksheet("과소신고 의심")
+    style_data_sheet(wb, ws_underval, df_underval, "과소신고 의심 건 TOP 30")
     
     # 조건부 서식
     if len(df_underval) > 0:
@@ -586,62 +676,90 @@ def create_anomaly_report(conn, output_path):
     
     # 리스크 분석 시트
     print("  → 리스크 분석 시트 생성...")
-    ws_risk = wb.create_sheet("품목국가 리스크")
-    style_data_sheet(ws_risk, df_risk, "품목-국가 리스크 분석 TOP 30")
+    ws_risk = wb.add_worksheet("품목국가 리스크")
+    style_data_sheet(wb, ws_risk, df_risk, "품목-국가 리스크 분석 TOP 30")
     
     if len(df_risk) > 0:
         add_conditional_formatting(ws_risk, 4, 4 + len(df_risk) - 1, 6, 'colorscale')
         
         add_bar_chart(
-            ws_risk, "리스크 점수 분포",
-            {'min_col': 6, 'min_row': 3, 'max_row': 3 + min(15, len(df_risk)), 'max_col': 6},
-            {'min_col': 1, 'min_row': 4, 'max_row': 3 + min(15, len(df_risk))},
+            wb, ws_risk, "리스크 점수 분포", 5, min(15, len(df_risk)),
             "H3"
         )
     
     # 고위험 업체 시트
     print("  → 고위험 업체 시트 생성...")
-    ws_importers = wb.create_sheet("고위험 업체")
-    style_data_sheet(ws_importers, df_importers, "고위험 업체 TOP 30")
+    ws_importers = wb.add_worksheet("고위험 업체")
+    style_data_sheet(wb, ws_importers, df_importers, "고위험 업체 TOP 30")
     
     if len(df_importers) > 0:
         add_conditional_formatting(ws_importers, 4, 4 + len(df_importers) - 1, 5, 'colorscale')
     
     # 저장
-    wb.save(output_path)
+    wb.close()
     print(f"✅ 저장 완료: {output_path}")
 
 
+def build_report(name, output_path):
+    """보고서 1건 생성 (워커 프로세스에서 실행, 프로세스별 커넥션 풀 사용)
+
+    Args:
+        name: 'revenue' 또는 'anomaly'
+        output_path: 저장 경로
+    """
+    # DB 드라이버는 실제 조회하는 워커에서만 로드
+    import oracledb
+    
+    # NUMBER는 Decimal 대신 int64/float64, LOB은 str/bytes로 페치
+    oracledb.defaults.fetch_decimals = False
+    oracledb.defaults.fetch_lobs = False
+    
+    # 커넥션별 문장 캐시 (바인드 변수 쿼리의 재파싱 방지)
+    oracledb.defaults.stmtcachesize = 40
+    
+    builders = {
+        'revenue': create_revenue_report,
+        'anomaly': create_anomaly_report,
+    }
+    
+    # 보고서별 쿼리 동시 실행용 커넥션 풀 (필요한 만큼만 증가)
+    pool = oracledb.create_pool(**DB_CONFIG, min=1, max=DB_POOL_SIZE, increment=1)
+    try:
+        builders[name](pool, output_path)
+    finally:
+        pool.close()
+    
+    return output_path
+
+
 def main():
     print("🚀 관세 분석 보고서 생성 시작")
     print(f"⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 50)
     
-    # DB 연결
-    print("\n🔗 DB 연결 중...")
-    conn = oracledb.connect(**DB_CONFIG)
-    print("✅ DB 연결 성공")
-    
-    try:
-        # 출력 경로
-        base_path = os.path.dirname(os.path.abspath(__file__))
-        
-        # 관세 수입 현황 보고서
-        revenue_path = os.path.join(base_path, "관세수입현황_분석보고서.xlsx")
-        create_revenue_report(conn, revenue_path)
-        
-        # 이상 탐지 보고서
-        anomaly_path = os.path.join(base_path, "관세이상탐지_분석보고서.xlsx")
-        create_anomaly_report(conn, anomaly_path)
-        
-        print("\n" + "=" * 50)
-        print("✅ 모든 보고서 생성 완료!")
-        print(f"📁 관세 수입 현황: {revenue_path}")
-        print(f"📁 이상 탐지: {anomaly_path}")
-        
-    finally:
-        conn.close()
-        print("🔌 DB 연결 종료")
+    # 지난 날짜의 쿼리 캐시 정리
+    prune_query_cache()
+    
+    # 출력 경로
+    base_path = os.path.dirname(os.path.abspath(__file__))
+    revenue_path = os.path.join(base_path, "관세수입현황_분석보고서.xlsx")
+    anomaly_path = os.path.join(base_path, "관세이상탐지_분석보고서.xlsx")
+    
+    # 두 보고서를 별도 프로세스에서 동시 생성
+    # (Excel 직렬화는 GIL에 묶이는 CPU 작업, oracledb 연결은 fork 불가하여 spawn 사용)
+    print("\n🔗 보고서별 DB 연결 후 동시 생성 중...")
+    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context('spawn')) as executor:
+        futures = [
+            executor.submit(build_report, 'revenue', revenue_path),
+            executor.submit(build_report, 'anomaly', anomaly_path),
+        ]
+        for future in futures:
+            future.result()
+    
+    print("\n" + "=" * 50)
+    print("✅ 모든 보고서 생성 완료!")
+    print(f"📁 관세 수입 현황: {revenue_path}")
+    print(f"📁 이상 탐지: {anomaly_path}")
 
 
 if __name__ == "__main__":
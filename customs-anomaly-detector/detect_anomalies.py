@@ -13,13 +13,24 @@ Usage:
     python detect_anomalies.py
     python detect_anomalies.py --output anomaly_report.xlsx
     python detect_anomalies.py --year 2024 --threshold 1.5
+    python detect_anomalies.py --no-cache
 """
 
 import oracledb
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from datetime import datetime
+from decimal import Decimal
+import hashlib
 import argparse
+import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 
 # DB 접속 정보
 DB_CONFIG = {
@@ -28,8 +39,42 @@ DB_CONFIG = {
     "dsn": "211.239.120.42:3535/NTANCIS"
 }
 
+# 배열 페치 크기 (네트워크 왕복 횟수 감소, 기본값 100)
+FETCH_ARRAYSIZE = 10000
+oracledb.defaults.arraysize = FETCH_ARRAYSIZE
+oracledb.defaults.prefetchrows = FETCH_ARRAYSIZE + 1
+
+# 커넥션 풀 크기 (동시 실행 쿼리 수)
+DB_POOL_SIZE = 5
+
+# 조회 결과 캐시 (같은 SQL·바인드 값은 유효 시간 내 Parquet에서 읽고 DB 조회 생략, --no-cache면 None)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+CACHE_TTL_HOURS = 24
+
+# 엑셀 숫자 표시 형식 (값은 반올림 없이 저장하고 표시만 자릿수 지정)
+NUMBER_FORMATS = {
+    'AVG_DIFF_PCT': '#,##0.0',
+    'UNDERVALUE_RATE': '#,##0.0',
+    'RISK_SCORE': '#,##0.0',
+    'CV_PCT': '#,##0.0',
+    'AVG_PRICE': '#,##0.00',
+    'STD_PRICE': '#,##0.00',
+    'MIN_PRICE': '#,##0.00',
+    'MAX_PRICE': '#,##0.00',
+}
+
+# 리스크 등급 구간 (경계값 포함: 30 이하 NORMAL, 50 이하 LOW, 80 이하 MEDIUM, 초과 HIGH)
+RISK_GRADE_BINS = [30, 50, 80]
+RISK_GRADE_DTYPE = pd.CategoricalDtype(['NORMAL', 'LOW', 'MEDIUM', 'HIGH'], ordered=True)
+
+
+def _frozen_names(names):
+    """코드-명칭 매핑을 읽기 전용으로 고정 (명칭 문자열은 intern하여 공유)"""
+    return MappingProxyType({code: sys.intern(name) for code, name in names.items()})
+
+
 # HS 코드 매핑
-HS4_NAMES = {
+HS4_NAMES = _frozen_names({
     '8518': '스피커/헤드폰/마이크',
     '8528': '모니터/TV',
     '8516': '전열기기',
@@ -45,10 +90,10 @@ HS4_NAMES = {
     '8536': '전기회로 스위치',
     '3917': '플라스틱 관/호스',
     '8421': '원심분리기/필터',
-}
+})
 
 # 국가 코드 매핑
-COUNTRY_NAMES = {
+COUNTRY_NAMES = _frozen_names({
     'CN': '중국',
     'JP': '일본',
     'IN': '인도',
@@ -59,53 +104,328 @@ COUNTRY_NAMES = {
     'MY': '말레이시아',
     'ID': '인도네시아',
     'TW': '대만',
-}
+})
+
+
+# 명칭 조회용 임시 테이블 (세션별 데이터, 조회 쿼리에서 조인)
+# (테이블명, ((컬럼명, 타입), ...), 코드-명칭 매핑)
+LOOKUP_TABLES = [
+    ("HS4_LOOKUP", (("HS4", "VARCHAR2(4) PRIMARY KEY"), ("HS_NAME", "VARCHAR2(100 CHAR)")), HS4_NAMES),
+    ("COUNTRY_LOOKUP", (("COUNTRY", "VARCHAR2(3) PRIMARY KEY"), ("COUNTRY_NAME", "VARCHAR2(100 CHAR)")), COUNTRY_NAMES),
+]
+
+# 명칭 매핑 요약값 (SQL에서 조인하므로 매핑을 고치면 캐시 키도 바뀌도록 함)
+LOOKUP_DIGEST = hashlib.md5(
+    repr([sorted(mapping.items()) for _, _, mapping in LOOKUP_TABLES]).encode('utf-8')
+).hexdigest()
+
+
+def _lookup_cte(table_name, columns, mapping):
+    """코드-명칭 매핑을 조회 테이블과 같은 이름·컬럼의 DUAL UNION ALL WITH 절 항목으로 변환"""
+    (key_col, _), (name_col, _) = columns
+    rows = []
+    for code, label in mapping.items():
+        label = label.replace("'", "''")
+        rows.append(f"SELECT '{code}' as {key_col}, '{label}' as {name_col} FROM DUAL")
+    return f"{table_name} AS (\n        " + "\n        UNION ALL ".join(rows) + "\n    )"
+
+
+# 조회 테이블을 쓸 수 없을 때 대신 사용할 WITH 절 항목 (모듈 로드 시 1회 생성)
+LOOKUP_CTES = {table_name: _lookup_cte(table_name, columns, mapping) for table_name, columns, mapping in LOOKUP_TABLES}
+
+# 명칭 조회 방식 (connect_db에서 결정: False면 임시 테이블 조인, True면 WITH 절 인라인)
+_inline_lookups = False
+
+
+def _lookup_with(*table_names):
+    """조회 쿼리의 WITH 절 앞에 붙일 명칭 조회 항목 (임시 테이블을 쓰면 빈 문자열)"""
+    if not _inline_lookups:
+        return ""
+    return "".join(f"{LOOKUP_CTES[name]},\n    " for name in table_names)
+
+
+def _create_lookup_tables(conn):
+    """명칭 조회용 Global Temporary Table 준비 (없으면 생성, 있으면 구성 확인)
+
+    Returns:
+        테이블을 사용할 수 있으면 True, 생성 권한이 없거나(ORA-01031)
+        같은 이름의 테이블 구성이 다르면 False
+    """
+    with conn.cursor() as cursor:
+        for table_name, columns, _ in LOOKUP_TABLES:
+            cursor.execute("SELECT TEMPORARY FROM USER_TABLES WHERE TABLE_NAME = :name", name=table_name)
+            row = cursor.fetchone()
+            if row is None:
+                ddl = ", ".join(f"{name} {col_type}" for name, col_type in columns)
+                try:
+                    cursor.execute(f"CREATE GLOBAL TEMPORARY TABLE {table_name} ({ddl}) ON COMMIT PRESERVE ROWS")
+                except oracledb.DatabaseError as e:
+                    error, = e.args
+                    if error.full_code != 'ORA-01031':
+                        raise
+                    print(f"  ⚠️ {table_name} 생성 권한이 없어 명칭 조회를 SQL에 포함합니다 (SKILL.md 참고)")
+                    return False
+                continue
+            
+            cursor.execute(
+                "SELECT COLUMN_NAME, DATA_TYPE FROM USER_TAB_COLUMNS WHERE TABLE_NAME = :name ORDER BY COLUMN_ID",
+                name=table_name
+            )
+            expected = [(name, col_type.split('(')[0]) for name, col_type in columns]
+            if row[0] != 'Y' or [tuple(r) for r in cursor.fetchall()] != expected:
+                print(f"  ⚠️ 기존 {table_name} 테이블 구성이 달라 명칭 조회를 SQL에 포함합니다")
+                return False
+    return True
+
+
+def _init_session(conn, requested_tag):
+    """풀 세션 생성 시 1회 실행되는 세션 설정 및 명칭 조회 테이블 적재"""
+    with conn.cursor() as cursor:
+        cursor.execute("ALTER SESSION SET NLS_COMP = BINARY NLS_SORT = BINARY")
+        if not _inline_lookups:
+            for table_name, _, mapping in LOOKUP_TABLES:
+                cursor.executemany(f"INSERT INTO {table_name} VALUES (:1, :2)", list(mapping.items()))
+    conn.commit()
 
 
 def connect_db():
-    """Oracle DB 연결"""
+    """Oracle DB 커넥션 풀 생성 (쿼리별 세션 동시 사용)
+
+    Oracle Client 라이브러리가 있으면 Thick 모드(OCI)로, 없으면 Thin 모드로 접속합니다.
+    라이브러리 경로는 ORACLE_CLIENT_LIB 환경변수로 지정할 수 있습니다.
+    """
     print("🔗 DB 연결 중...")
     try:
-        conn = oracledb.connect(**DB_CONFIG)
+        oracledb.init_oracle_client(lib_dir=os.environ.get('ORACLE_CLIENT_LIB'))
+    except oracledb.Error:
+        print("  ℹ️ Oracle Client 라이브러리를 찾지 못해 Thin 모드로 접속합니다")
+    
+    global _inline_lookups
+    try:
+        with oracledb.connect(**DB_CONFIG) as conn:
+            _inline_lookups = not _create_lookup_tables(conn)
+        pool = oracledb.create_pool(**DB_CONFIG, min=DB_POOL_SIZE, max=DB_POOL_SIZE, increment=0,
+                                    session_callback=_init_session)
         print("✅ DB 연결 성공")
-        return conn
+        return pool
     except oracledb.Error as e:
         print(f"❌ DB 연결 실패: {e}")
         sys.exit(1)
 
 
-def detect_undervaluation(conn, year_filter="23", threshold=1.3):
-    """과소신고 의심 건 탐지"""
-    print(f"🔍 과소신고 탐지 중 (임계값: {threshold*100-100:.0f}% 이상)...")
+def _prune_cache():
+    """유효 시간(CACHE_TTL_HOURS)이 지난 캐시 파일 삭제"""
+    if not os.path.isdir(CACHE_DIR):
+        return
+    expire_before = time.time() - CACHE_TTL_HOURS * 3600
+    for name in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, name)
+        if os.path.getmtime(path) < expire_before:
+            os.remove(path)
+
+
+def _cache_path(sql, params):
+    """SQL·바인드 값·명칭 매핑별 캐시 파일 경로"""
+    key = hashlib.md5(f"{sql}{sorted(params.items())}{LOOKUP_DIGEST}".encode('utf-8')).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}.parquet")
+
+
+def _fetch_table(conn, sql, **params):
+    """쿼리 결과를 Arrow 테이블로 조회
+
+    oracledb의 fetch_df_all()로 컬럼 단위(Arrow) 페치하여
+    행마다 Python 튜플을 만드는 과정을 생략합니다.
+    연도/임계값은 바인드 변수(params)로 전달하여 SQL 텍스트를 고정합니다.
+    결과는 Parquet로 캐시되어 CACHE_TTL_HOURS 이내 재실행 시 DB를 조회하지 않습니다.
+    """
+    path = _cache_path(sql, params) if CACHE_DIR else None
+    if path and os.path.exists(path) and time.time() - os.path.getmtime(path) < CACHE_TTL_HOURS * 3600:
+        return pq.read_table(path, memory_map=True)
+    
+    odf = conn.fetch_df_all(statement=sql, parameters=params, arraysize=FETCH_ARRAYSIZE)
+    table = pa.Table.from_arrays(odf.column_arrays(), names=odf.column_names())
+    if not path:
+        return table
+    
+    # 임시 파일에 쓴 뒤 교체 (동시 실행 중 불완전한 파일을 읽지 않도록)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+    return table
+
+
+def _fetch_df(conn, sql, **params):
+    """쿼리 결과를 DataFrame으로 조회 (pd.read_sql 대체)"""
+    return _fetch_table(conn, sql, **params).to_pandas()
+
+
+def run_concurrently(pool, tasks):
+    """조회 함수들을 풀의 개별 세션에서 동시에 실행
+
+    Args:
+        pool: oracledb 커넥션 풀
+        tasks: [(함수, 추가 인자...)] - 함수의 첫 인자로 커넥션 전달
+
+    Returns:
+        tasks 순서대로의 결과 리스트
+    """
+    def run(task):
+        func, *args = task
+        with pool.acquire() as conn:
+            return func(conn, *args)
+    
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        return list(executor.map(run, tasks))
+
+
+def _split_section(df_all, section, columns):
+    """통합 조회 결과에서 섹션별 DataFrame 분리 (컬럼 선택 및 이름 변경)"""
+    part = df_all[df_all['SECTION'] == section]
+    return part[list(columns)].rename(columns=columns).reset_index(drop=True)
+
+
+def detect_value_anomalies(conn, year_filter="23", threshold=1.3):
+    """과소신고 의심 / 품목-국가 종합 리스크 / 고위험 업체 탐지
+
+    CLRI_TANSAD_UT_PRC_M을 한 번만 읽어 GROUPING SETS로 세 가지 집계를
+    동시에 계산하고, 섹션별 상위 건만 반환받아 분리합니다.
+
+    Returns:
+        (df_underval, df_risk, df_importers)
+    """
+    print(f"🔍 과소신고/종합 리스크/고위험 업체 탐지 중 (과소신고 임계값: {threshold*100-100:.0f}% 이상)...")
     
     query = f"""
+    WITH {_lookup_with('HS4_LOOKUP', 'COUNTRY_LOOKUP')}base AS (
+        SELECT 
+            ASSD_HS_CD,
+            SUBSTR(ASSD_HS_CD, 1, 4) as HS4,
+            ORIG_CNTY_CD,
+            IMPPN_TIN,
+            IMPPN_NM,
+            DCLD_UT_USD_VAL,
+            ASSD_UT_USD_VAL,
+            DCLD_INVC_USD_AMT,
+            ASSD_INVC_USD_AMT,
+            CASE WHEN DCLD_UT_USD_VAL > 0 AND ASSD_UT_USD_VAL > DCLD_UT_USD_VAL * :thr THEN 1 ELSE 0 END as UNDERVAL_T,
+            CASE WHEN DCLD_UT_USD_VAL > 0 AND ASSD_UT_USD_VAL > DCLD_UT_USD_VAL * 1.3 THEN 1 ELSE 0 END as UNDERVAL_13,
+            CASE WHEN DCLD_UT_USD_VAL > 0 AND ASSD_UT_USD_VAL > DCLD_UT_USD_VAL * 1.5 THEN 1 ELSE 0 END as UNDERVAL_15,
+            CASE WHEN DCLD_HS_CD != ASSD_HS_CD THEN 1 ELSE 0 END as HS_CHANGED
+        FROM CLRI_TANSAD_UT_PRC_M
+        WHERE DEL_YN = 'N' AND TANSAD_YY >= :yy
+    ),
+    agg AS (
+        SELECT /*+ MATERIALIZE */
+            CASE 
+                WHEN GROUPING(IMPPN_TIN) = 0 THEN 'IMPORTER'
+                WHEN GROUPING(ASSD_HS_CD) = 0 THEN 'HS_COUNTRY'
+                ELSE 'HS4_COUNTRY'
+            END as GRP,
+            ASSD_HS_CD,
+            NVL(HS4, SUBSTR(ASSD_HS_CD, 1, 4)) as HS4,
+            ORIG_CNTY_CD,
+            IMPPN_TIN,
+            MAX(IMPPN_NM) as IMPORTER_NAME,
+            COUNT(*) as TOTAL_CNT,
+            SUM(UNDERVAL_T) as UNDERVAL_T_CNT,
+            SUM(UNDERVAL_13) as UNDERVAL_13_CNT,
+            SUM(UNDERVAL_15) as UNDERVAL_15_CNT,
+            SUM(HS_CHANGED) as HS_CHANGE_CNT,
+            AVG(CASE WHEN UNDERVAL_T = 1 THEN (ASSD_UT_USD_VAL - DCLD_UT_USD_VAL) / DCLD_UT_USD_VAL * 100 END) as AVG_DIFF_PCT,
+            SUM(CASE WHEN UNDERVAL_T = 1 THEN ASSD_INVC_USD_AMT - DCLD_INVC_USD_AMT END) as TOTAL_DIFF_USD,
+            SUM(CASE WHEN UNDERVAL_T = 1 THEN ASSD_INVC_USD_AMT END) as UNDERVAL_VALUE_USD,
+            SUM(ASSD_INVC_USD_AMT) as TOTAL_VALUE_USD,
+            SUM(UNDERVAL_13) * 100.0 / COUNT(*) as UNDERVAL_13_RATE,
+            SUM(UNDERVAL_15) * 100.0 / COUNT(*) as UNDERVAL_15_RATE,
+            SUM(UNDERVAL_15) * 3.0 / COUNT(*) * 100 + SUM(HS_CHANGED) * 2.0 / COUNT(*) * 100 as RISK_SCORE
+        FROM base
+        GROUP BY GROUPING SETS ((ASSD_HS_CD, ORIG_CNTY_CD), (HS4, ORIG_CNTY_CD), (IMPPN_TIN))
+    ),
+    sections AS (
+        SELECT 'UNDERVAL' as SECTION, a.*,
+               ROW_NUMBER() OVER (ORDER BY TOTAL_DIFF_USD DESC NULLS LAST) as RN
+        FROM agg a
+        WHERE GRP = 'HS_COUNTRY' AND UNDERVAL_T_CNT >= 10
+        UNION ALL
+        SELECT 'RISK' as SECTION, a.*,
+               ROW_NUMBER() OVER (ORDER BY RISK_SCORE DESC) as RN
+        FROM agg a
+        WHERE GRP = 'HS4_COUNTRY' AND HS4 IS NOT NULL
+          AND (UNDERVAL_15_CNT >= 50 OR HS_CHANGE_CNT >= 50)
+        UNION ALL
+        SELECT 'IMPORTER' as SECTION, a.*,
+               ROW_NUMBER() OVER (ORDER BY UNDERVAL_13_CNT DESC) as RN
+        FROM agg a
+        WHERE GRP = 'IMPORTER' AND TOTAL_CNT >= 20
+          AND (UNDERVAL_13_CNT >= 5 OR HS_CHANGE_CNT >= 5)
+    )
     SELECT 
-        ASSD_HS_CD as HS_CODE,
-        ORIG_CNTY_CD as COUNTRY,
-        COUNT(*) as CNT,
-        ROUND(AVG((ASSD_UT_USD_VAL - DCLD_UT_USD_VAL) / NULLIF(DCLD_UT_USD_VAL, 0) * 100), 1) as AVG_DIFF_PCT,
-        SUM(ASSD_INVC_USD_AMT - DCLD_INVC_USD_AMT) as TOTAL_DIFF_USD,
-        SUM(ASSD_INVC_USD_AMT) as TOTAL_VALUE_USD
-    FROM CLRI_TANSAD_UT_PRC_M
-    WHERE DEL_YN = 'N'
-      AND DCLD_UT_USD_VAL > 0
-      AND ASSD_UT_USD_VAL > DCLD_UT_USD_VAL * {threshold}
-      AND TANSAD_YY >= '{year_filter}'
-    GROUP BY ASSD_HS_CD, ORIG_CNTY_CD
-    HAVING COUNT(*) >= 10
-    ORDER BY TOTAL_DIFF_USD DESC NULLS LAST
-    FETCH FIRST 100 ROWS ONLY
+        s.*,
+        NVL(h.HS_NAME, '기타') as HS_NAME,
+        NVL(c.COUNTRY_NAME, '기타') as COUNTRY_NAME
+    FROM sections s
+    LEFT JOIN HS4_LOOKUP h ON h.HS4 = s.HS4
+    LEFT JOIN COUNTRY_LOOKUP c ON c.COUNTRY = s.ORIG_CNTY_CD
+    WHERE s.RN <= CASE WHEN s.SECTION = 'UNDERVAL' THEN 100 ELSE 50 END
+    ORDER BY s.SECTION, s.RN
     """
     
-    df = pd.read_sql(query, conn)
+    # 임계값은 Decimal로 바인드 (float은 BINARY_DOUBLE로 바인드되어 경계값 비교가 NUMBER 리터럴과 달라짐)
+    df_all = _fetch_df(conn, query, yy=year_filter, thr=Decimal(str(threshold)))
     
-    # 품목명, 국가명 추가
-    df['HS4'] = df['HS_CODE'].str[:4]
-    df['HS_NAME'] = df['HS4'].map(HS4_NAMES).fillna('기타')
-    df['COUNTRY_NAME'] = df['COUNTRY'].map(COUNTRY_NAMES).fillna('기타')
+    # 과소신고 의심 (HS코드-국가)
+    df_underval = _split_section(df_all, 'UNDERVAL', {
+        'ASSD_HS_CD': 'HS_CODE',
+        'ORIG_CNTY_CD': 'COUNTRY',
+        'UNDERVAL_T_CNT': 'CNT',
+        'AVG_DIFF_PCT': 'AVG_DIFF_PCT',
+        'TOTAL_DIFF_USD': 'TOTAL_DIFF_USD',
+        'UNDERVAL_VALUE_USD': 'TOTAL_VALUE_USD',
+        'HS4': 'HS4',
+        'HS_NAME': 'HS_NAME',
+        'COUNTRY_NAME': 'COUNTRY_NAME',
+    })
+    print(f"  → {len(df_underval)}개 과소신고 의심 조합 탐지")
     
-    print(f"  → {len(df)}개 과소신고 의심 조합 탐지")
-    return df
+    # 품목(HS4)-국가 종합 리스크
+    df_risk = _split_section(df_all, 'RISK', {
+        'HS4': 'HS4',
+        'ORIG_CNTY_CD': 'COUNTRY',
+        'TOTAL_CNT': 'TOTAL_CNT',
+        'HS_CHANGE_CNT': 'HS_CHANGE_CNT',
+        'UNDERVAL_15_CNT': 'UNDERVALUE_CNT',
+        'UNDERVAL_15_RATE': 'UNDERVALUE_RATE',
+        'TOTAL_VALUE_USD': 'TOTAL_VALUE_USD',
+        'RISK_SCORE': 'RISK_SCORE',
+        'HS_NAME': 'HS_NAME',
+        'COUNTRY_NAME': 'COUNTRY_NAME',
+    })
+    
+    # 리스크 등급 (표시 포맷과 같은 소수점 1자리로 반올림한 점수 기준)
+    grade_codes = np.digitize(np.round(df_risk['RISK_SCORE'].to_numpy(), 1), RISK_GRADE_BINS, right=True)
+    df_risk['RISK_GRADE'] = pd.Categorical.from_codes(grade_codes, dtype=RISK_GRADE_DTYPE)
+    print(f"  → {len(df_risk)}개 고위험 품목-국가 조합")
+    
+    # 고위험 업체
+    df_importers = _split_section(df_all, 'IMPORTER', {
+        'IMPPN_TIN': 'TIN',
+        'IMPORTER_NAME': 'IMPORTER_NAME',
+        'TOTAL_CNT': 'TOTAL_CNT',
+        'UNDERVAL_13_CNT': 'UNDERVALUE_CNT',
+        'HS_CHANGE_CNT': 'HS_CHANGE_CNT',
+        'TOTAL_VALUE_USD': 'TOTAL_VALUE_USD',
+        'UNDERVAL_13_RATE': 'UNDERVALUE_RATE',
+    })
+    
+    # 리스크 점수 계산
+    under_cnt = df_importers['UNDERVALUE_CNT'].to_numpy(dtype=np.float64)
+    hs_cnt = df_importers['HS_CHANGE_CNT'].to_numpy(dtype=np.float64)
+    total_cnt = df_importers['TOTAL_CNT'].to_numpy(dtype=np.float64)
+    df_importers['RISK_SCORE'] = (under_cnt * 3.0 + hs_cnt * 2.0) * (100.0 / total_cnt)
+    print(f"  → {len(df_importers)}개 고위험 업체 식별")
+    
+    return df_underval, df_risk, df_importers
 
 
 def detect_price_variance(conn, year_filter="23"):
@@ -113,30 +433,35 @@ def detect_price_variance(conn, year_filter="23"):
     print("📊 단가 이상치 탐지 중...")
     
     query = f"""
+    WITH {_lookup_with('HS4_LOOKUP')}variance AS (
+        SELECT 
+            ASSD_HS_CD as HS_CODE,
+            COUNT(*) as CNT,
+            AVG(ASSD_UT_USD_VAL) as AVG_PRICE,
+            STDDEV(ASSD_UT_USD_VAL) as STD_PRICE,
+            MIN(ASSD_UT_USD_VAL) as MIN_PRICE,
+            MAX(ASSD_UT_USD_VAL) as MAX_PRICE,
+            STDDEV(ASSD_UT_USD_VAL) / NULLIF(AVG(ASSD_UT_USD_VAL), 0) * 100 as CV_PCT
+        FROM CLRI_TANSAD_UT_PRC_M
+        WHERE DEL_YN = 'N'
+          AND ASSD_UT_USD_VAL > 0
+          AND TANSAD_YY >= :yy
+        GROUP BY ASSD_HS_CD
+        HAVING COUNT(*) >= 50 
+           AND STDDEV(ASSD_UT_USD_VAL) > AVG(ASSD_UT_USD_VAL)
+        ORDER BY STD_PRICE DESC
+        FETCH FIRST 50 ROWS ONLY
+    )
     SELECT 
-        ASSD_HS_CD as HS_CODE,
-        COUNT(*) as CNT,
-        ROUND(AVG(ASSD_UT_USD_VAL), 2) as AVG_PRICE,
-        ROUND(STDDEV(ASSD_UT_USD_VAL), 2) as STD_PRICE,
-        ROUND(MIN(ASSD_UT_USD_VAL), 2) as MIN_PRICE,
-        ROUND(MAX(ASSD_UT_USD_VAL), 2) as MAX_PRICE,
-        ROUND(STDDEV(ASSD_UT_USD_VAL) / NULLIF(AVG(ASSD_UT_USD_VAL), 0) * 100, 1) as CV_PCT
-    FROM CLRI_TANSAD_UT_PRC_M
-    WHERE DEL_YN = 'N'
-      AND ASSD_UT_USD_VAL > 0
-      AND TANSAD_YY >= '{year_filter}'
-    GROUP BY ASSD_HS_CD
-    HAVING COUNT(*) >= 50 
-       AND STDDEV(ASSD_UT_USD_VAL) > AVG(ASSD_UT_USD_VAL)
-    ORDER BY STD_PRICE DESC
-    FETCH FIRST 50 ROWS ONLY
+        v.*,
+        SUBSTR(v.HS_CODE, 1, 4) as HS4,
+        NVL(h.HS_NAME, '기타') as HS_NAME
+    FROM variance v
+    LEFT JOIN HS4_LOOKUP h ON h.HS4 = SUBSTR(v.HS_CODE, 1, 4)
+    ORDER BY v.STD_PRICE DESC
     """
     
-    df = pd.read_sql(query, conn)
-    
-    # 품목명 추가
-    df['HS4'] = df['HS_CODE'].str[:4]
-    df['HS_NAME'] = df['HS4'].map(HS4_NAMES).fillna('기타')
+    df = _fetch_df(conn, query, yy=year_filter)
     
     print(f"  → {len(df)}개 단가 이상 품목 탐지")
     return df
@@ -146,7 +471,7 @@ def detect_hs_changes(conn, year_filter="23"):
     """HS코드 변경 탐지"""
     print("🔄 HS코드 변경 탐지 중...")
     
-    query = f"""
+    query = """
     SELECT 
         DCLD_HS_CD as DECLARED_HS,
         ASSD_HS_CD as ASSESSED_HS,
@@ -157,132 +482,35 @@ def detect_hs_changes(conn, year_filter="23"):
       AND DCLD_HS_CD IS NOT NULL
       AND ASSD_HS_CD IS NOT NULL
       AND DCLD_HS_CD != ASSD_HS_CD
-      AND TANSAD_YY >= '{year_filter}'
+      AND TANSAD_YY >= :yy
     GROUP BY DCLD_HS_CD, ASSD_HS_CD
     HAVING COUNT(*) >= 20
     ORDER BY CNT DESC
     FETCH FIRST 50 ROWS ONLY
     """
     
-    df = pd.read_sql(query, conn)
+    table = _fetch_table(conn, query, yy=year_filter)
     
-    # HS4 추출 및 명칭 추가
-    df['DECLARED_HS4'] = df['DECLARED_HS'].str[:4]
-    df['ASSESSED_HS4'] = df['ASSESSED_HS'].str[:4]
+    # HS4 추출 (pandas 변환 전 Arrow 문자열 커널로 처리)
+    table = table.append_column('DECLARED_HS4', pc.utf8_slice_codeunits(table['DECLARED_HS'], 0, 4))
+    table = table.append_column('ASSESSED_HS4', pc.utf8_slice_codeunits(table['ASSESSED_HS'], 0, 4))
+    df = table.to_pandas()
     
     print(f"  → {len(df)}개 HS코드 변경 패턴 탐지")
     return df
 
 
-def calculate_risk_score(conn, year_filter="23"):
-    """품목-국가 종합 리스크 분석"""
-    print("⚠️ 종합 리스크 분석 중...")
-    
-    query = f"""
-    WITH risk_data AS (
-        SELECT 
-            SUBSTR(ASSD_HS_CD, 1, 4) as HS4,
-            ORIG_CNTY_CD,
-            CASE WHEN DCLD_HS_CD != ASSD_HS_CD THEN 1 ELSE 0 END as HS_CHANGED,
-            CASE WHEN ASSD_UT_USD_VAL > DCLD_UT_USD_VAL * 1.5 AND DCLD_UT_USD_VAL > 0 THEN 1 ELSE 0 END as UNDERVALUED,
-            ASSD_INVC_USD_AMT
-        FROM CLRI_TANSAD_UT_PRC_M
-        WHERE DEL_YN = 'N' AND TANSAD_YY >= '{year_filter}'
-    )
-    SELECT 
-        HS4,
-        ORIG_CNTY_CD as COUNTRY,
-        COUNT(*) as TOTAL_CNT,
-        SUM(HS_CHANGED) as HS_CHANGE_CNT,
-        SUM(UNDERVALUED) as UNDERVALUE_CNT,
-        ROUND(SUM(UNDERVALUED) * 100.0 / COUNT(*), 1) as UNDERVALUE_RATE,
-        SUM(ASSD_INVC_USD_AMT) as TOTAL_VALUE_USD,
-        ROUND(SUM(UNDERVALUED) * 3.0 / COUNT(*) * 100 + SUM(HS_CHANGED) * 2.0 / COUNT(*) * 100, 1) as RISK_SCORE
-    FROM risk_data
-    WHERE HS4 IS NOT NULL
-    GROUP BY HS4, ORIG_CNTY_CD
-    HAVING SUM(UNDERVALUED) >= 50 OR SUM(HS_CHANGED) >= 50
-    ORDER BY RISK_SCORE DESC
-    FETCH FIRST 50 ROWS ONLY
-    """
-    
-    df = pd.read_sql(query, conn)
-    
-    # 명칭 추가
-    df['HS_NAME'] = df['HS4'].map(HS4_NAMES).fillna('기타')
-    df['COUNTRY_NAME'] = df['COUNTRY'].map(COUNTRY_NAMES).fillna('기타')
-    
-    # 리스크 등급
-    df['RISK_GRADE'] = pd.cut(
-        df['RISK_SCORE'], 
-        bins=[-float('inf'), 30, 50, 80, float('inf')],
-        labels=['NORMAL', 'LOW', 'MEDIUM', 'HIGH']
-    )
-    
-    print(f"  → {len(df)}개 고위험 품목-국가 조합")
-    return df
-
-
-def identify_high_risk_importers(conn, year_filter="23"):
-    """고위험 업체 식별"""
-    print("🏢 고위험 업체 식별 중...")
-    
-    query = f"""
-    SELECT 
-        IMPPN_TIN as TIN,
-        MAX(IMPPN_NM) as IMPORTER_NAME,
-        COUNT(*) as TOTAL_CNT,
-        SUM(CASE WHEN ASSD_UT_USD_VAL > DCLD_UT_USD_VAL * 1.3 AND DCLD_UT_USD_VAL > 0 THEN 1 ELSE 0 END) as UNDERVALUE_CNT,
-        SUM(CASE WHEN DCLD_HS_CD != ASSD_HS_CD THEN 1 ELSE 0 END) as HS_CHANGE_CNT,
-        SUM(ASSD_INVC_USD_AMT) as TOTAL_VALUE_USD,
-        ROUND(SUM(CASE WHEN ASSD_UT_USD_VAL > DCLD_UT_USD_VAL * 1.3 AND DCLD_UT_USD_VAL > 0 THEN 1 ELSE 0 END) * 100.0 / COUNT(*), 1) as UNDERVALUE_RATE
-    FROM CLRI_TANSAD_UT_PRC_M
-    WHERE DEL_YN = 'N' AND TANSAD_YY >= '{year_filter}'
-    GROUP BY IMPPN_TIN
-    HAVING COUNT(*) >= 20
-       AND (SUM(CASE WHEN ASSD_UT_USD_VAL > DCLD_UT_USD_VAL * 1.3 AND DCLD_UT_USD_VAL > 0 THEN 1 ELSE 0 END) >= 5
-            OR SUM(CASE WHEN DCLD_HS_CD != ASSD_HS_CD THEN 1 ELSE 0 END) >= 5)
-    ORDER BY UNDERVALUE_CNT DESC
-    FETCH FIRST 50 ROWS ONLY
-    """
-    
-    df = pd.read_sql(query, conn)
-    
-    # 리스크 점수 계산
-    df['RISK_SCORE'] = (df['UNDERVALUE_CNT'] * 3 + df['HS_CHANGE_CNT'] * 2) / df['TOTAL_CNT'] * 100
-    df['RISK_SCORE'] = df['RISK_SCORE'].round(1)
-    
-    print(f"  → {len(df)}개 고위험 업체 식별")
-    return df
-
-
 def create_summary(df_underval, df_variance, df_hs_change, df_risk, df_importers):
-    """요약 데이터 생성"""
-    summary = {
-        '지표': [
-            '분석 기간',
-            '과소신고 의심 조합 수',
-            '과소신고 추정 총 차액 (USD)',
-            '단가 이상 품목 수',
-            'HS코드 변경 패턴 수',
-            '고위험 품목-국가 조합',
-            '고위험 업체 수',
-            'HIGH 등급 조합 수',
-            'MEDIUM 등급 조합 수',
-        ],
-        '값': [
-            '2023-2024',
-            f"{len(df_underval):,} 개",
-            f"${df_underval['TOTAL_DIFF_USD'].sum():,.0f}" if 'TOTAL_DIFF_USD' in df_underval.columns else 'N/A',
-            f"{len(df_variance):,} 개",
-            f"{len(df_hs_change):,} 개",
-            f"{len(df_risk):,} 개",
-            f"{len(df_importers):,} 개",
-            f"{(df_risk['RISK_GRADE'] == 'HIGH').sum():,} 개" if 'RISK_GRADE' in df_risk.columns else 'N/A',
-            f"{(df_risk['RISK_GRADE'] == 'MEDIUM').sum():,} 개" if 'RISK_GRADE' in df_risk.columns else 'N/A',
-        ]
-    }
-    return pd.DataFrame(summary)
+    """요약 지표 생성 - (지표, 값) 순서로 반환"""
+    yield '분석 기간', '2023-2024'
+    yield '과소신고 의심 조합 수', f"{len(df_underval):,} 개"
+    yield '과소신고 추정 총 차액 (USD)', (f"${df_underval['TOTAL_DIFF_USD'].sum():,.0f}" if 'TOTAL_DIFF_USD' in df_underval.columns else 'N/A')
+    yield '단가 이상 품목 수', f"{len(df_variance):,} 개"
+    yield 'HS코드 변경 패턴 수', f"{len(df_hs_change):,} 개"
+    yield '고위험 품목-국가 조합', f"{len(df_risk):,} 개"
+    yield '고위험 업체 수', f"{len(df_importers):,} 개"
+    yield 'HIGH 등급 조합 수', (f"{(df_risk['RISK_GRADE'] == 'HIGH').sum():,} 개" if 'RISK_GRADE' in df_risk.columns else 'N/A')
+    yield 'MEDIUM 등급 조합 수', (f"{(df_risk['RISK_GRADE'] == 'MEDIUM').sum():,} 개" if 'RISK_GRADE' in df_risk.columns else 'N/A')
 
 
 def create_claude_prompts():
@@ -313,21 +541,52 @@ def create_claude_prompts():
     return pd.DataFrame(prompts)
 
 
+def _write_sheet(workbook, sheet_name, df, header_format, column_formats):
+    """DataFrame을 워크시트에 행 단위로 기록 (to_excel 대체)
+
+    pandas의 셀 서식 처리 단계를 거치지 않고 write_row로 바로 기록합니다.
+    행 순서대로 기록하므로 constant_memory 모드에서도 사용할 수 있습니다.
+    숫자 표시 형식은 컬럼 서식으로 지정합니다 (column_formats: {컬럼명: 서식}).
+    """
+    ws = workbook.add_worksheet(sheet_name)
+    for col_idx, col in enumerate(df.columns):
+        if col in column_formats:
+            ws.set_column(col_idx, col_idx, None, column_formats[col])
+    ws.write_row(0, 0, df.columns.tolist(), header_format)
+    
+    # 결측값은 빈 셀로 기록
+    values = df.astype(object).where(df.notna(), None)
+    for row_idx, row in enumerate(values.itertuples(index=False, name=None), start=1):
+        ws.write_row(row_idx, 0, row)
+    return ws
+
+
 def save_to_excel(output_path, df_underval, df_variance, df_hs_change, df_risk, df_importers):
     """Excel 파일 저장"""
     print(f"\n📁 Excel 파일 생성 중: {output_path}")
     
-    df_summary = create_summary(df_underval, df_variance, df_hs_change, df_risk, df_importers)
     df_prompts = create_claude_prompts()
     
-    with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-        df_summary.to_excel(writer, sheet_name='요약', index=False)
-        df_underval.to_excel(writer, sheet_name='과소신고_의심', index=False)
-        df_variance.to_excel(writer, sheet_name='단가_이상', index=False)
-        df_hs_change.to_excel(writer, sheet_name='HS코드_변경', index=False)
-        df_risk.to_excel(writer, sheet_name='품목국가_리스크', index=False)
-        df_importers.to_excel(writer, sheet_name='고위험_업체', index=False)
-        df_prompts.to_excel(writer, sheet_name='Claude_분석_가이드', index=False)
+    writer_options = {'options': {'constant_memory': True}}
+    with pd.ExcelWriter(output_path, engine='xlsxwriter', engine_kwargs=writer_options) as writer:
+        header_format = writer.book.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+        column_formats = {col: writer.book.add_format({'num_format': fmt}) for col, fmt in NUMBER_FORMATS.items()}
+        
+        # 요약 시트 (지표/값을 바로 기록)
+        ws = writer.book.add_worksheet('요약')
+        ws.write_row(0, 0, ['지표', '값'], header_format)
+        for row_idx, item in enumerate(create_summary(df_underval, df_variance, df_hs_change, df_risk, df_importers), start=1):
+            ws.write_row(row_idx, 0, item)
+        
+        for sheet_name, df in [
+            ('과소신고_의심', df_underval),
+            ('단가_이상', df_variance),
+            ('HS코드_변경', df_hs_change),
+            ('품목국가_리스크', df_risk),
+            ('고위험_업체', df_importers),
+            ('Claude_분석_가이드', df_prompts),
+        ]:
+            _write_sheet(writer.book, sheet_name, df, header_format, column_formats)
     
     print(f"✅ Excel 파일 저장 완료")
 
@@ -340,23 +599,23 @@ def print_alert_summary(df_underval, df_risk, df_importers):
     
     # 과소신고 TOP 5
     print("\n📌 과소신고 의심 TOP 5 (품목-국가):")
-    for i, row in df_underval.head(5).iterrows():
-        print(f"  {i+1}. {row['HS4']} ({row['HS_NAME']}) + {row['COUNTRY']} ({row['COUNTRY_NAME']})")
-        print(f"      → {row['CNT']:,}건, 평균 차이 {row['AVG_DIFF_PCT']:.1f}%, 총 차액 ${row['TOTAL_DIFF_USD']:,.0f}")
+    for i, row in enumerate(df_underval.head(5).itertuples(index=False), 1):
+        print(f"  {i}. {row.HS4} ({row.HS_NAME}) + {row.COUNTRY} ({row.COUNTRY_NAME})")
+        print(f"      → {row.CNT:,.0f}건, 평균 차이 {row.AVG_DIFF_PCT:.1f}%, 총 차액 ${row.TOTAL_DIFF_USD:,.0f}")
     
     # 고위험 조합 TOP 5
     print("\n🔴 고위험 품목-국가 TOP 5:")
     if 'RISK_SCORE' in df_risk.columns:
-        for i, row in df_risk.head(5).iterrows():
-            print(f"  {i+1}. {row['HS4']} ({row['HS_NAME']}) + {row['COUNTRY']} ({row['COUNTRY_NAME']})")
-            print(f"      → 리스크 점수: {row['RISK_SCORE']:.1f}, 과소신고율: {row['UNDERVALUE_RATE']:.1f}%")
+        for i, row in enumerate(df_risk.head(5).itertuples(index=False), 1):
+            print(f"  {i}. {row.HS4} ({row.HS_NAME}) + {row.COUNTRY} ({row.COUNTRY_NAME})")
+            print(f"      → 리스크 점수: {row.RISK_SCORE:.1f}, 과소신고율: {row.UNDERVALUE_RATE:.1f}%")
     
     # 고위험 업체 TOP 5
     print("\n🏢 고위험 업체 TOP 5:")
-    for i, row in df_importers.head(5).iterrows():
-        name = row['IMPORTER_NAME'][:20] if pd.notna(row['IMPORTER_NAME']) else 'N/A'
-        print(f"  {i+1}. {row['TIN']} ({name}...)")
-        print(f"      → 과소신고 {row['UNDERVALUE_CNT']:,}건 ({row['UNDERVALUE_RATE']:.1f}%), 총 ${row['TOTAL_VALUE_USD']:,.0f}")
+    for i, row in enumerate(df_importers.head(5).itertuples(index=False), 1):
+        name = row.IMPORTER_NAME[:20] if pd.notna(row.IMPORTER_NAME) else 'N/A'
+        print(f"  {i}. {row.TIN} ({name}...)")
+        print(f"      → 과소신고 {row.UNDERVALUE_CNT:,.0f}건 ({row.UNDERVALUE_RATE:.1f}%), 총 ${row.TOTAL_VALUE_USD:,.0f}")
     
     print("\n" + "="*60)
 
@@ -369,23 +628,32 @@ def main():
                         help='분석 시작 연도 (2자리, 예: 23)')
     parser.add_argument('--threshold', '-t', type=float, default=1.3,
                         help='과소신고 임계값 (기본: 1.3 = 30%)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='조회 결과 캐시를 쓰지 않고 항상 DB 조회')
     args = parser.parse_args()
     
+    global CACHE_DIR
+    if args.no_cache:
+        CACHE_DIR = None
+    else:
+        _prune_cache()
+    
     print("🚀 관세 이상 탐지 시작")
     print(f"⏰ 시작 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"📅 분석 기간: 20{args.year}년 이후")
     print(f"📊 과소신고 임계값: {(args.threshold-1)*100:.0f}% 이상")
     
     # DB 연결
-    conn = connect_db()
+    pool = connect_db()
     
     try:
-        # 이상 탐지 실행
-        df_underval = detect_undervaluation(conn, args.year, args.threshold)
-        df_variance = detect_price_variance(conn, args.year)
-        df_hs_change = detect_hs_changes(conn, args.year)
-        df_risk = calculate_risk_score(conn, args.year)
-        df_importers = identify_high_risk_importers(conn, args.year)
+        # 이상 탐지 실행 (세션별 동시 조회)
+        value_anomalies, df_variance, df_hs_change = run_concurrently(pool, [
+            (detect_value_anomalies, args.year, args.threshold),
+            (detect_price_variance, args.year),
+            (detect_hs_changes, args.year),
+        ])
+        df_underval, df_risk, df_importers = value_anomalies
         
         # Excel 저장
         save_to_excel(args.output, df_underval, df_variance, df_hs_change, df_risk, df_importers)
@@ -398,7 +666,7 @@ def main():
         print(f"\n💡 Claude for Excel에서 'Claude_분석_가이드' 시트의 프롬프트를 활용하세요.")
         
     finally:
-        conn.close()
+        pool.close()
         print("🔌 DB 연결 종료")
 
 
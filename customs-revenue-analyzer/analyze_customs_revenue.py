@@ -9,13 +9,22 @@ Usage:
     python analyze_customs_revenue.py
     python analyze_customs_revenue.py --output /path/to/output.xlsx
     python analyze_customs_revenue.py --year 2024
+    python analyze_customs_revenue.py --no-cache
 """
 
 import oracledb
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from datetime import datetime
+import hashlib
 import argparse
+import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 
 # DB 접속 정보
 DB_CONFIG = {
@@ -24,8 +33,26 @@ DB_CONFIG = {
     "dsn": "211.239.120.42:3535/NTANCIS"
 }
 
+# 배열 페치 크기 (네트워크 왕복 횟수 감소, 기본값 100)
+FETCH_ARRAYSIZE = 10000
+oracledb.defaults.arraysize = FETCH_ARRAYSIZE
+oracledb.defaults.prefetchrows = FETCH_ARRAYSIZE + 1
+
+# 커넥션 풀 크기 (동시 실행 쿼리 수)
+DB_POOL_SIZE = 5
+
+# 조회 결과 캐시 (같은 SQL·바인드 값은 유효 시간 내 Parquet에서 읽고 DB 조회 생략, --no-cache면 None)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+CACHE_TTL_HOURS = 24
+
+
+def _frozen_names(names):
+    """코드-명칭 매핑을 읽기 전용으로 고정 (명칭 문자열은 intern하여 공유)"""
+    return MappingProxyType({code: sys.intern(name) for code, name in names.items()})
+
+
 # HS 코드 매핑
-HS2_NAMES = {
+HS2_NAMES = _frozen_names({
     '74': '구리와 그 제품',
     '27': '광물성 연료, 광물유',
     '87': '차량(철도/전차 제외)',
@@ -46,10 +73,10 @@ HS2_NAMES = {
     '52': '면',
     '22': '음료, 알코올',
     '08': '과실과 견과류',
-}
+})
 
 # 국가 코드 매핑
-COUNTRY_NAMES = {
+COUNTRY_NAMES = _frozen_names({
     'CD': '콩고민주공화국',
     'TZ': '탄자니아',
     'ZM': '잠비아',
@@ -65,21 +92,121 @@ COUNTRY_NAMES = {
     'DE': '독일',
     'CH': '스위스',
     'UG': '우간다',
+})
+
+# 엑셀 숫자 표시 형식 (값은 반올림 없이 저장하고 표시만 자릿수 지정)
+NUMBER_FORMATS = {
+    'AVG_TAX': '#,##0',
+    'TAX_SHARE': '#,##0.0',
+    'VALUE_SHARE': '#,##0.0',
+    'GROWTH_RATE': '#,##0.0',
 }
 
+# 명칭 조회용 매핑 (모듈 로드 시 1회 생성, 결과는 범주형으로 저장)
+_HS2_MAP = pd.Series(HS2_NAMES)
+_COUNTRY_MAP = pd.Series(COUNTRY_NAMES)
+HS2_CAT = pd.CategoricalDtype(list(dict.fromkeys([*HS2_NAMES.values(), '기타'])))
+COUNTRY_CAT = pd.CategoricalDtype(list(dict.fromkeys([*COUNTRY_NAMES.values(), '기타'])))
+
+
+def hs2_name(codes):
+    """HS2 코드 → 품목명 (미등록 코드는 '기타')"""
+    return codes.map(_HS2_MAP).fillna('기타').astype(HS2_CAT)
+
+
+def country_name(codes):
+    """국가 코드 → 국가명 (미등록 코드는 '기타')"""
+    return codes.map(_COUNTRY_MAP).fillna('기타').astype(COUNTRY_CAT)
+
 
 def connect_db():
-    """Oracle DB 연결"""
+    """Oracle DB 커넥션 풀 생성 (쿼리별 세션 동시 사용)"""
     print("🔗 DB 연결 중...")
     try:
-        conn = oracledb.connect(**DB_CONFIG)
+        pool = oracledb.create_pool(**DB_CONFIG, min=DB_POOL_SIZE, max=DB_POOL_SIZE, increment=0)
         print("✅ DB 연결 성공")
-        return conn
+        return pool
     except oracledb.Error as e:
         print(f"❌ DB 연결 실패: {e}")
         sys.exit(1)
 
 
+def _prune_cache():
+    """유효 시간(CACHE_TTL_HOURS)이 지난 캐시 파일 삭제"""
+    if not os.path.isdir(CACHE_DIR):
+        return
+    expire_before = time.time() - CACHE_TTL_HOURS * 3600
+    for name in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, name)
+        if os.path.getmtime(path) < expire_before:
+            os.remove(path)
+
+
+def _cache_path(sql):
+    """SQL별 캐시 파일 경로"""
+    key = hashlib.md5(sql.encode('utf-8')).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}.parquet")
+
+
+def _fetch_table(conn, sql):
+    """쿼리 결과를 Arrow 테이블로 조회
+
+    oracledb의 fetch_df_all()로 컬럼 단위(Arrow) 페치하여
+    행마다 Python 튜플을 만드는 과정을 생략합니다.
+    결과는 Parquet로 캐시되어 CACHE_TTL_HOURS 이내 재실행 시 DB를 조회하지 않습니다.
+    """
+    path = _cache_path(sql) if CACHE_DIR else None
+    if path and os.path.exists(path) and time.time() - os.path.getmtime(path) < CACHE_TTL_HOURS * 3600:
+        return pq.read_table(path, memory_map=True)
+    
+    odf = conn.fetch_df_all(statement=sql, arraysize=FETCH_ARRAYSIZE)
+    table = pa.Table.from_arrays(odf.column_arrays(), names=odf.column_names())
+    if not path:
+        return table
+    
+    # 임시 파일에 쓴 뒤 교체 (동시 실행 중 불완전한 파일을 읽지 않도록)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+    return table
+
+
+def _fetch_df(conn, sql):
+    """쿼리 결과를 DataFrame으로 조회 (pd.read_sql 대체)"""
+    return _fetch_table(conn, sql).to_pandas()
+
+
+def _share_pct(values):
+    """합계 대비 비중(%) - Arrow 컬럼 연산"""
+    return pc.multiply(pc.divide(values, pc.sum(values)), 100)
+
+
+def _growth_pct(values):
+    """다음 행(직전 연도) 대비 증감률(%) - 연도 내림차순 정렬 기준"""
+    prev = pa.chunked_array(values.slice(1).chunks + [pa.nulls(min(len(values), 1), values.type)])
+    return pc.multiply(pc.subtract(pc.divide(values, prev), 1), 100)
+
+
+def run_concurrently(pool, tasks):
+    """조회 함수들을 풀의 개별 세션에서 동시에 실행
+
+    Args:
+        pool: oracledb 커넥션 풀
+        tasks: [(함수, 추가 인자...)] - 함수의 첫 인자로 커넥션 전달
+
+    Returns:
+        tasks 순서대로의 결과 리스트
+    """
+    def run(task):
+        func, *args = task
+        with pool.acquire() as conn:
+            return func(conn, *args)
+    
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        return list(executor.map(run, tasks))
+
+
 def fetch_yearly_data(conn):
     """연도별 관세 수입 추출"""
     print("📊 연도별 데이터 추출 중...")
@@ -89,17 +216,17 @@ def fetch_yearly_data(conn):
         COUNT(*) as ITEM_COUNT,
         SUM(ITM_TAX_AMT) as TOTAL_TAX,
         SUM(ITM_INVC_USD_AMT) as TOTAL_VALUE_USD,
-        ROUND(AVG(ITM_TAX_AMT), 0) as AVG_TAX
+        AVG(ITM_TAX_AMT) as AVG_TAX
     FROM CLRI_TANSAD_ITM_D
     WHERE DEL_YN = 'N' AND TANSAD_YY >= '20'
     GROUP BY TANSAD_YY
     ORDER BY TANSAD_YY DESC
     """
-    df = pd.read_sql(query, conn)
+    table = _fetch_table(conn, query)
     
     # 성장률 계산
-    df['GROWTH_RATE'] = df['TOTAL_TAX'].pct_change(-1) * 100
-    df['GROWTH_RATE'] = df['GROWTH_RATE'].round(1)
+    table = table.append_column('GROWTH_RATE', _growth_pct(table['TOTAL_TAX']))
+    df = table.to_pandas()
     
     print(f"  → {len(df)}개 연도 데이터")
     return df
@@ -114,21 +241,21 @@ def fetch_commodity_data(conn):
         COUNT(*) as ITEM_COUNT,
         SUM(ITM_TAX_AMT) as TOTAL_TAX,
         SUM(ITM_INVC_USD_AMT) as TOTAL_VALUE_USD,
-        ROUND(AVG(ITM_TAX_AMT), 0) as AVG_TAX
+        AVG(ITM_TAX_AMT) as AVG_TAX
     FROM CLRI_TANSAD_ITM_D
     WHERE DEL_YN = 'N' AND ITM_TAX_AMT > 0
     GROUP BY SUBSTR(HS_CD, 1, 2)
     ORDER BY TOTAL_TAX DESC
     FETCH FIRST 30 ROWS ONLY
     """
-    df = pd.read_sql(query, conn)
-    
-    # 품목명 추가
-    df['HS2_NAME'] = df['HS2_CODE'].map(HS2_NAMES).fillna('기타')
+    table = _fetch_table(conn, query)
     
     # 비중 계산
-    total = df['TOTAL_TAX'].sum()
-    df['TAX_SHARE'] = (df['TOTAL_TAX'] / total * 100).round(1)
+    table = table.append_column('TAX_SHARE', _share_pct(table['TOTAL_TAX']))
+    df = table.to_pandas()
+    
+    # 품목명 추가 (비중 컬럼 앞)
+    df.insert(df.columns.get_loc('TAX_SHARE'), 'HS2_NAME', hs2_name(df['HS2_CODE']))
     
     print(f"  → {len(df)}개 품목 데이터")
     return df
@@ -149,14 +276,14 @@ def fetch_country_data(conn):
     ORDER BY TOTAL_VALUE_USD DESC NULLS LAST
     FETCH FIRST 30 ROWS ONLY
     """
-    df = pd.read_sql(query, conn)
-    
-    # 국가명 추가
-    df['COUNTRY_NAME'] = df['COUNTRY_CODE'].map(COUNTRY_NAMES).fillna('기타')
+    table = _fetch_table(conn, query)
     
     # 비중 계산
-    total = df['TOTAL_VALUE_USD'].sum()
-    df['VALUE_SHARE'] = (df['TOTAL_VALUE_USD'] / total * 100).round(1)
+    table = table.append_column('VALUE_SHARE', _share_pct(table['TOTAL_VALUE_USD']))
+    df = table.to_pandas()
+    
+    # 국가명 추가 (비중 컬럼 앞)
+    df.insert(df.columns.get_loc('VALUE_SHARE'), 'COUNTRY_NAME', country_name(df['COUNTRY_CODE']))
     
     print(f"  → {len(df)}개 국가 데이터")
     return df
@@ -176,7 +303,7 @@ def fetch_customs_office_data(conn):
     GROUP BY CSTM_OFCE_CD
     ORDER BY TOTAL_TAX DESC NULLS LAST
     """
-    df = pd.read_sql(query, conn)
+    df = _fetch_df(conn, query)
     print(f"  → {len(df)}개 세관 데이터")
     return df
 
@@ -196,36 +323,21 @@ def fetch_monthly_data(conn):
     GROUP BY TO_CHAR(FRST_RGSR_DTM, 'YYYY-MM')
     ORDER BY MONTH
     """
-    df = pd.read_sql(query, conn)
+    df = _fetch_df(conn, query)
     print(f"  → {len(df)}개 월 데이터")
     return df
 
 
 def create_summary(df_yearly, df_commodity, df_country):
-    """요약 데이터 생성"""
-    summary = {
-        '지표': [
-            '분석 기간',
-            '총 건수',
-            '총 세액 (현지화)',
-            '총 수입액 (USD)',
-            'TOP 품목',
-            'TOP 교역국',
-            '평균 연간 세액',
-            '최근 성장률'
-        ],
-        '값': [
-            f"{df_yearly['YEAR'].min()} ~ {df_yearly['YEAR'].max()}",
-            f"{df_yearly['ITEM_COUNT'].sum():,.0f} 건",
-            f"{df_yearly['TOTAL_TAX'].sum():,.0f}",
-            f"${df_yearly['TOTAL_VALUE_USD'].sum():,.0f}",
-            f"{df_commodity.iloc[0]['HS2_CODE']} ({df_commodity.iloc[0]['HS2_NAME']})",
-            f"{df_country.iloc[0]['COUNTRY_CODE']} ({df_country.iloc[0]['COUNTRY_NAME']})",
-            f"{df_yearly['TOTAL_TAX'].mean():,.0f}",
-            f"{df_yearly['GROWTH_RATE'].iloc[0]:+.1f}%" if pd.notna(df_yearly['GROWTH_RATE'].iloc[0]) else "N/A"
-        ]
-    }
-    return pd.DataFrame(summary)
+    """요약 지표 생성 - (지표, 값) 순서로 반환"""
+    yield '분석 기간', f"{df_yearly['YEAR'].min()} ~ {df_yearly['YEAR'].max()}"
+    yield '총 건수', f"{df_yearly['ITEM_COUNT'].sum():,.0f} 건"
+    yield '총 세액 (현지화)', f"{df_yearly['TOTAL_TAX'].sum():,.0f}"
+    yield '총 수입액 (USD)', f"${df_yearly['TOTAL_VALUE_USD'].sum():,.0f}"
+    yield 'TOP 품목', f"{df_commodity.iloc[0]['HS2_CODE']} ({df_commodity.iloc[0]['HS2_NAME']})"
+    yield 'TOP 교역국', f"{df_country.iloc[0]['COUNTRY_CODE']} ({df_country.iloc[0]['COUNTRY_NAME']})"
+    yield '평균 연간 세액', f"{df_yearly['TOTAL_TAX'].mean():,.0f}"
+    yield '최근 성장률', (f"{df_yearly['GROWTH_RATE'].iloc[0]:+.1f}%" if pd.notna(df_yearly['GROWTH_RATE'].iloc[0]) else "N/A")
 
 
 def create_claude_prompts():
@@ -256,71 +368,79 @@ def create_claude_prompts():
     return pd.DataFrame(prompts)
 
 
+def _write_sheet(workbook, sheet_name, df, header_format, column_formats):
+    """DataFrame을 워크시트에 행 단위로 기록 (to_excel 대체)
+
+    pandas의 셀 서식 처리 단계를 거치지 않고 write_row로 바로 기록합니다.
+    행 순서대로 기록하므로 constant_memory 모드에서도 사용할 수 있습니다.
+    숫자 표시 형식은 컬럼 서식으로 지정합니다 (column_formats: {컬럼명: 서식}).
+    """
+    ws = workbook.add_worksheet(sheet_name)
+    for col_idx, col in enumerate(df.columns):
+        if col in column_formats:
+            ws.set_column(col_idx, col_idx, None, column_formats[col])
+    ws.write_row(0, 0, df.columns.tolist(), header_format)
+    
+    # 결측값은 빈 셀로 기록
+    values = df.astype(object).where(df.notna(), None)
+    for row_idx, row in enumerate(values.itertuples(index=False, name=None), start=1):
+        ws.write_row(row_idx, 0, row)
+    return ws
+
+
+def _insert_trend_chart(workbook, ws, chart_type, title, x_title, num_rows, position, width, height=454):
+    """세액(3번째 컬럼) 추이 차트 삽입 - 1번째 컬럼을 항목 축으로 사용"""
+    chart = workbook.add_chart({'type': chart_type})
+    chart.add_series({
+        'name': [ws.name, 0, 2],
+        'categories': [ws.name, 1, 0, num_rows, 0],
+        'values': [ws.name, 1, 2, num_rows, 2],
+    })
+    chart.set_title({'name': title})
+    chart.set_x_axis({'name': x_title})
+    chart.set_y_axis({'name': '세액'})
+    chart.set_size({'width': width, 'height': height})
+    ws.insert_chart(position, chart)
+
+
 def save_to_excel(output_path, df_yearly, df_commodity, df_country, df_customs, df_monthly):
     """Excel 파일 저장"""
     print(f"\n📁 Excel 파일 생성 중: {output_path}")
     
-    # 요약 데이터 생성
-    df_summary = create_summary(df_yearly, df_commodity, df_country)
     df_prompts = create_claude_prompts()
     
-    with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-        df_summary.to_excel(writer, sheet_name='요약', index=False)
-        df_yearly.to_excel(writer, sheet_name='연도별_추이', index=False)
-        df_commodity.to_excel(writer, sheet_name='품목별_현황', index=False)
-        df_country.to_excel(writer, sheet_name='국가별_현황', index=False)
-        df_customs.to_excel(writer, sheet_name='세관별_현황', index=False)
-        df_monthly.to_excel(writer, sheet_name='월별_추이', index=False)
-        df_prompts.to_excel(writer, sheet_name='Claude_분석_가이드', index=False)
-    
-    print(f"✅ Excel 파일 저장 완료")
-
-
-def add_charts(output_path):
-    """Excel에 차트 추가"""
-    try:
-        from openpyxl import load_workbook
-        from openpyxl.chart import BarChart, LineChart, PieChart, Reference
-        
-        print("📈 차트 추가 중...")
-        wb = load_workbook(output_path)
+    writer_options = {'options': {'constant_memory': True}}
+    with pd.ExcelWriter(output_path, engine='xlsxwriter', engine_kwargs=writer_options) as writer:
+        header_format = writer.book.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+        column_formats = {col: writer.book.add_format({'num_format': fmt}) for col, fmt in NUMBER_FORMATS.items()}
         
-        # 연도별 추이 - 막대 차트
-        ws = wb['연도별_추이']
-        chart = BarChart()
-        chart.title = "연도별 관세 수입 추이"
-        chart.x_axis.title = "연도"
-        chart.y_axis.title = "세액"
-        chart.height = 12
-        chart.width = 18
+        # 요약 시트 (지표/값을 바로 기록)
+        ws = writer.book.add_worksheet('요약')
+        ws.write_row(0, 0, ['지표', '값'], header_format)
+        for row_idx, item in enumerate(create_summary(df_yearly, df_commodity, df_country), start=1):
+            ws.write_row(row_idx, 0, item)
         
-        data = Reference(ws, min_col=3, min_row=1, max_row=ws.max_row, max_col=3)
-        cats = Reference(ws, min_col=1, min_row=2, max_row=ws.max_row)
-        chart.add_data(data, titles_from_data=True)
-        chart.set_categories(cats)
-        ws.add_chart(chart, "I2")
+        sheets = {}
+        for sheet_name, df in [
+            ('연도별_추이', df_yearly),
+            ('품목별_현황', df_commodity),
+            ('국가별_현황', df_country),
+            ('세관별_현황', df_customs),
+            ('월별_추이', df_monthly),
+            ('Claude_분석_가이드', df_prompts),
+        ]:
+            sheets[sheet_name] = _write_sheet(writer.book, sheet_name, df, header_format, column_formats)
         
-        # 월별 추이 - 라인 차트
-        ws = wb['월별_추이']
-        if ws.max_row > 1:
-            chart = LineChart()
-            chart.title = "월별 관세 수입 추이"
-            chart.x_axis.title = "월"
-            chart.y_axis.title = "세액"
-            chart.height = 12
-            chart.width = 20
-            
-            data = Reference(ws, min_col=3, min_row=1, max_row=ws.max_row, max_col=3)
-            cats = Reference(ws, min_col=1, min_row=2, max_row=ws.max_row)
-            chart.add_data(data, titles_from_data=True)
-            chart.set_categories(cats)
-            ws.add_chart(chart, "F2")
-        
-        wb.save(output_path)
-        print("✅ 차트 추가 완료")
-        
-    except ImportError:
-        print("⚠️ openpyxl 미설치로 차트 생성 생략")
+        # 차트 추가 (같은 세션에서 바로 삽입, 파일 재로드 없음)
+        print("📈 차트 추가 중...")
+        if len(df_yearly) > 0:
+            _insert_trend_chart(writer.book, sheets['연도별_추이'], 'column', "연도별 관세 수입 추이", "연도",
+                                len(df_yearly), 'I2', width=680)
+        if len(df_monthly) > 0:
+            _insert_trend_chart(writer.book, sheets['월별_추이'], 'line', "월별 관세 수입 추이", "월",
+                                len(df_monthly), 'F2', width=756)
+    
+    print(f"✅ Excel 파일 저장 완료")
 
 
 def print_summary(df_yearly, df_commodity, df_country):
@@ -335,12 +455,12 @@ def print_summary(df_yearly, df_commodity, df_country):
     print(f"💵 총 수입액: ${df_yearly['TOTAL_VALUE_USD'].sum():,.0f}")
     
     print("\n🏆 TOP 5 품목 (세액 기준):")
-    for i, row in df_commodity.head(5).iterrows():
-        print(f"  {i+1}. HS {row['HS2_CODE']} ({row['HS2_NAME']}): {row['TOTAL_TAX']:,.0f} ({row['TAX_SHARE']}%)")
+    for i, row in enumerate(df_commodity.head(5).itertuples(index=False), 1):
+        print(f"  {i}. HS {row.HS2_CODE} ({row.HS2_NAME}): {row.TOTAL_TAX:,.0f} ({row.TAX_SHARE:.1f}%)")
     
     print("\n🌍 TOP 5 교역국 (수입액 기준):")
-    for i, row in df_country.head(5).iterrows():
-        print(f"  {i+1}. {row['COUNTRY_CODE']} ({row['COUNTRY_NAME']}): ${row['TOTAL_VALUE_USD']:,.0f}")
+    for i, row in enumerate(df_country.head(5).itertuples(index=False), 1):
+        print(f"  {i}. {row.COUNTRY_CODE} ({row.COUNTRY_NAME}): ${row.TOTAL_VALUE_USD:,.0f}")
     
     print("\n" + "="*60)
 
@@ -351,28 +471,35 @@ def main():
                         help='출력 Excel 파일 경로')
     parser.add_argument('--year', '-y', type=str, default=None,
                         help='특정 연도만 분석 (예: 2024)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='조회 결과 캐시를 쓰지 않고 항상 DB 조회')
     args = parser.parse_args()
     
+    global CACHE_DIR
+    if args.no_cache:
+        CACHE_DIR = None
+    else:
+        _prune_cache()
+    
     print("🚀 관세 수입 현황 분석 시작")
     print(f"⏰ 시작 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
     # DB 연결
-    conn = connect_db()
+    pool = connect_db()
     
     try:
-        # 데이터 추출
-        df_yearly = fetch_yearly_data(conn)
-        df_commodity = fetch_commodity_data(conn)
-        df_country = fetch_country_data(conn)
-        df_customs = fetch_customs_office_data(conn)
-        df_monthly = fetch_monthly_data(conn)
+        # 데이터 추출 (세션별 동시 조회)
+        df_yearly, df_commodity, df_country, df_customs, df_monthly = run_concurrently(pool, [
+            (fetch_yearly_data,),
+            (fetch_commodity_data,),
+            (fetch_country_data,),
+            (fetch_customs_office_data,),
+            (fetch_monthly_data,),
+        ])
         
         # Excel 저장
         save_to_excel(args.output, df_yearly, df_commodity, df_country, df_customs, df_monthly)
         
-        # 차트 추가
-        add_charts(args.output)
-        
         # 요약 출력
         print_summary(df_yearly, df_commodity, df_country)
         
@@ -381,7 +508,7 @@ def main():
         print(f"\n💡 Claude for Excel에서 'Claude_분석_가이드' 시트의 프롬프트를 활용하세요.")
         
     finally:
-        conn.close()
+        pool.close()
         print("🔌 DB 연결 종료")
 
 
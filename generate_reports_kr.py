@@ -13,24 +13,33 @@ Features:
 
 Usage:
     python premium_reports_kr.py
+    python premium_reports_kr.py --no-cache   # 당일 캐시를 무시하고 다시 생성
 """
 
 import oracledb
 import pandas as pd
-from datetime import datetime
+from datetime import date, datetime
 from openpyxl import Workbook
 from openpyxl.worksheet.worksheet import Worksheet
-from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
+from openpyxl.styles import Font, PatternFill, Border, Side, Alignment, NamedStyle
 from openpyxl.chart import BarChart, LineChart, PieChart, DoughnutChart, Reference
 from openpyxl.chart.label import DataLabelList
+from openpyxl.chart.shapes import GraphicalProperties
 from openpyxl.formatting.rule import ColorScaleRule, DataBarRule
 from openpyxl.utils import get_column_letter
 from openpyxl.utils.dataframe import dataframe_to_rows
+from openpyxl.drawing.line import LineProperties
+import gc
+import hashlib
 import os
+import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 # 로컬 모듈 임포트
-from kpi_calculator import KPICalculator, KPI_DEFINITIONS, KPICategory, format_currency, format_percent
+import kpi_calculator
+import visualizations
+from kpi_calculator import KPICalculator, KPI_DEFINITIONS, KPICategory, format_currency, format_percent, CURRENCY_NUMBER_FORMATS, fetch_df
 from visualizations import (
     ColorPalette, StyleManager, 
     add_kpi_card, add_risk_matrix, add_scorecard_table,
@@ -48,72 +57,170 @@ DB_CONFIG = {
 
 BASE_PATH = os.path.dirname(os.path.abspath(__file__))
 
+# 보고서 캐시 키에 수정 시각을 반영할 소스 (레이아웃·KPI 정의 변경 시 같은 날이라도 다시 생성)
+REPORT_SOURCE_FILES = (__file__, visualizations.__file__, kpi_calculator.__file__)
+
+# 커넥션 풀 크기 (두 보고서가 각각 4개 조회를 동시에 실행)
+DB_POOL_SIZE = 8
+
+# 배열 페치 크기 (집계 결과는 수십~수백 행이므로 한 번의 왕복으로 수신, 기본값 100)
+# (KPICalculator의 fetch_df는 kpi_calculator.FETCH_ARRAYSIZE를 직접 지정)
+FETCH_ARRAYSIZE = 1000
+oracledb.defaults.arraysize = FETCH_ARRAYSIZE
+oracledb.defaults.prefetchrows = FETCH_ARRAYSIZE + 1
+
+# 커넥션별 문장 캐시 (요약·스코어카드가 같은 연도별 SQL을 반복 실행)
+STMT_CACHE_SIZE = 50
+
+# 세션 데이터 단위 (기본 8KB -> 64KB, 한 번의 배열 페치 응답을 더 적은 패킷으로 수신)
+DB_SDU = 65535
+
+# === 스타일 상수 (셀마다 새로 만들지 않고 공유) ===
+FONT_BODY = Font(name='맑은 고딕', size=10)
+FONT_BODY_BOLD = Font(name='맑은 고딕', size=10, bold=True)
+FONT_CAPTION = Font(name='맑은 고딕', size=10, color=ColorPalette.DARK_GRAY)
+FONT_FOOTER = Font(name='맑은 고딕', size=9, color=ColorPalette.DARK_GRAY)
+FONT_MONO = Font(name='Consolas', size=10)
+FONT_MONO_SMALL = Font(name='Consolas', size=9)
+FONT_SECTION = Font(name='맑은 고딕', size=14, bold=True)
+FONT_SECTION_PRIMARY = Font(name='맑은 고딕', size=14, bold=True, color=ColorPalette.PRIMARY)
+FONT_NOTE = Font(name='맑은 고딕', size=11, bold=True, color=ColorPalette.PRIMARY)
+FONT_H1 = Font(name='맑은 고딕', size=20, bold=True, color=ColorPalette.PRIMARY)
+FONT_H2 = Font(name='맑은 고딕', size=16, bold=True, color=ColorPalette.PRIMARY)
+FONT_COVER_LOGO = Font(name='맑은 고딕', size=12, bold=True, color='FFFFFF')
+FONT_COVER_TITLE = Font(name='맑은 고딕', size=32, bold=True, color=ColorPalette.PRIMARY)
+FONT_COVER_SUBTITLE = Font(name='맑은 고딕', size=14, color=ColorPalette.SECONDARY)
+FONT_COVER_DATE = Font(name='맑은 고딕', size=11, color=ColorPalette.DARK_GRAY)
+FONT_CARD_VALUE = Font(name='맑은 고딕', size=22, bold=True, color=ColorPalette.PRIMARY)
+ALIGN_CENTER = Alignment(horizontal='center', vertical='center')
+ALIGN_LEFT = Alignment(horizontal='left', vertical='center')
+ALIGN_H_CENTER = Alignment(horizontal='center')
+FILL_BANNER = PatternFill(start_color=ColorPalette.PRIMARY, end_color=ColorPalette.PRIMARY, fill_type='solid')
+FILL_CARD = PatternFill(start_color='F8F9FA', end_color='F8F9FA', fill_type='solid')
+_CARD_SIDE = Side(style='thin', color='E0E0E0')
+BORDER_CARD = Border(left=_CARD_SIDE, right=_CARD_SIDE, top=_CARD_SIDE, bottom=_CARD_SIDE)
+
+# KPI 값 표시 형식 (셀에는 숫자를 그대로 저장)
+NUMBER_FORMAT_COUNT = '#,##0"건"'
+NUMBER_FORMAT_ITEMS = '#,##0"개"'
+NUMBER_FORMAT_GROWTH = '+0.0%;-0.0%;0.0%'
+
+# 차트 계열 서식 (단일 계열 차트에 그대로 지정)
+SERIES_TREND_LINE = GraphicalProperties(ln=LineProperties(solidFill=ColorPalette.PRIMARY, w=25000))
+SERIES_DANGER_BAR = GraphicalProperties(solidFill=ColorPalette.DANGER)
+
+
+def _set_title(ws: Worksheet, merge_range: str, text: str, font: Font, alignment: Alignment = None, row_height: float = None):
+    """병합 범위의 첫 셀에 제목 기록 (셀 조회 1회, 기본 정렬이면 alignment 생략)"""
+    ws.merge_cells(merge_range)
+    cell = ws[merge_range.split(':')[0]]
+    cell.value = text
+    cell.font = font
+    if alignment is not None:
+        cell.alignment = alignment
+    if row_height:
+        ws.row_dimensions[cell.row].height = row_height
+
 
 class PremiumReportGeneratorKR:
     """프리미엄 관세 보고서 생성기 (한국어)"""
     
-    def __init__(self, conn):
-        self.conn = conn
-        self.kpi_calc = KPICalculator(conn)
+    def __init__(self, pool, use_disk_cache: bool = True):
+        """
+        Args:
+            pool: oracledb 커넥션 풀 (독립 조회마다 연결을 따로 받아 동시에 실행)
+            use_disk_cache: False면 당일 보고서/조회 캐시를 쓰지 않고 항상 새로 생성
+        """
+        self.pool = pool
+        self.use_disk_cache = use_disk_cache
         self.sm = StyleManager()
         self.report_date = datetime.now().strftime('%Y년 %m월 %d일')
     
     # === 공통 헬퍼 함수 ===
     
+    def _run_queries(self, tasks: dict) -> dict:
+        """독립 조회 작업을 풀에서 각자 연결을 받아 동시에 실행
+        
+        Args:
+            tasks: {이름: fn(conn)}
+        
+        Returns:
+            {이름: 결과}
+        """
+        def run(task):
+            with self.pool.acquire() as conn:
+                return task(conn)
+        
+        with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+            futures = {name: executor.submit(run, task) for name, task in tasks.items()}
+            return {name: future.result() for name, future in futures.items()}
+    
+    def _new_calculator(self, conn) -> KPICalculator:
+        """보고서 캐시 설정을 따르는 KPI 계산기"""
+        return KPICalculator(conn, use_disk_cache=self.use_disk_cache)
+    
+    def _report_cache_path(self, output_path: str, *data) -> str:
+        """보고서 입력 데이터 해시 기반 캐시 파일 경로 ({날짜}_{해시}.xlsx)
+        
+        같은 날 같은 데이터로 다시 생성하면 저장해 둔 파일을 복사해 재사용.
+        캐시를 쓰지 않으면 None.
+        """
+        if not self.use_disk_cache:
+            return None
+        h = hashlib.sha256(os.path.basename(output_path).encode('utf-8'))
+        for path in REPORT_SOURCE_FILES:  # 코드 변경 시 무효화
+            h.update(str(os.path.getmtime(path)).encode('utf-8'))
+        for part in data:
+            if isinstance(part, pd.DataFrame):
+                h.update(repr(list(part.columns)).encode('utf-8'))
+                h.update(pd.util.hash_pandas_object(part).to_numpy().tobytes())
+            else:
+                h.update(repr(part).encode('utf-8'))
+        return os.path.join(BASE_PATH, '.cache', f"{date.today().isoformat()}_{h.hexdigest()}.xlsx")
+    
+    def _save_report(self, wb: Workbook, output_path: str, cache_path: str):
+        """보고서 저장 후 캐시에 복사"""
+        wb.save(output_path)
+        if cache_path:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            shutil.copyfile(output_path, cache_path)
+        print(f"✅ 저장 완료: {output_path}")
+    
     def _create_cover_sheet(self, wb: Workbook, title: str, subtitle: str, metrics: dict) -> Worksheet:
-        """표지 시트 생성"""
-        ws = wb.create_sheet("표지", 0)
+        """표지 시트 생성 (워크북 기본 시트를 재사용)"""
+        ws = wb.active
+        ws.title = "표지"
         
-        # 배경색
-        for row in range(1, 35):
-            for col in range(1, 16):
-                ws.cell(row=row, column=col).fill = PatternFill(
-                    start_color='FFFFFF', end_color='FFFFFF', fill_type='solid'
-                )
+        # 배경은 기본 흰색 그대로 두고 눈금선만 숨김
+        ws.sheet_view.showGridLines = False
         
         # 상단 배너
         for col in range(1, 16):
             for row in range(1, 4):
-                ws.cell(row=row, column=col).fill = PatternFill(
-                    start_color=ColorPalette.PRIMARY, 
-                    end_color=ColorPalette.PRIMARY, 
-                    fill_type='solid'
-                )
+                ws.cell(row=row, column=col).fill = FILL_BANNER
         
         # 로고 텍스트
-        ws.merge_cells('B2:N2')
-        logo_cell = ws['B2']
-        logo_cell.value = "관세청 KOREA CUSTOMS SERVICE"
-        logo_cell.font = Font(name='맑은 고딕', size=12, bold=True, color='FFFFFF')
-        logo_cell.alignment = Alignment(horizontal='left', vertical='center')
+        _set_title(ws, 'B2:N2', "관세청 KOREA CUSTOMS SERVICE", FONT_COVER_LOGO, ALIGN_LEFT)
         
         # 메인 타이틀
-        ws.merge_cells('B6:N6')
-        title_cell = ws['B6']
-        title_cell.value = title
-        title_cell.font = Font(name='맑은 고딕', size=32, bold=True, color=ColorPalette.PRIMARY)
-        title_cell.alignment = Alignment(horizontal='center', vertical='center')
-        ws.row_dimensions[6].height = 60
+        _set_title(ws, 'B6:N6', title, FONT_COVER_TITLE, ALIGN_CENTER, row_height=60)
         
         # 서브타이틀
-        ws.merge_cells('B8:N8')
-        sub_cell = ws['B8']
-        sub_cell.value = subtitle
-        sub_cell.font = Font(name='맑은 고딕', size=14, color=ColorPalette.SECONDARY)
-        sub_cell.alignment = Alignment(horizontal='center', vertical='center')
+        _set_title(ws, 'B8:N8', subtitle, FONT_COVER_SUBTITLE, ALIGN_CENTER)
         
         # 날짜
-        ws.merge_cells('B10:N10')
-        date_cell = ws['B10']
-        date_cell.value = f"보고서 작성일: {self.report_date}"
-        date_cell.font = Font(name='맑은 고딕', size=11, color=ColorPalette.DARK_GRAY)
-        date_cell.alignment = Alignment(horizontal='center')
+        _set_title(ws, 'B10:N10', f"보고서 작성일: {self.report_date}", FONT_COVER_DATE, ALIGN_H_CENTER)
         
         # KPI 카드들 (4열)
         row = 14
         col_positions = [2, 5, 8, 11]
         
-        for i, (label, value) in enumerate(metrics.items()):
+        # 카드 배경 스타일은 워크북에 NamedStyle로 한 번만 등록
+        if 'kpi_card' not in wb.named_styles:
+            wb.add_named_style(NamedStyle(name='kpi_card', fill=FILL_CARD, border=BORDER_CARD))
+        
+        # metrics: {라벨: (값, 엑셀 표시 형식 또는 None)}
+        for i, (label, (value, number_format)) in enumerate(metrics.items()):
             if i >= 4:
                 break
             col = col_positions[i]
@@ -121,91 +228,71 @@ class PremiumReportGeneratorKR:
             # 카드 배경
             for r in range(row, row + 4):
                 for c in range(col, col + 3):
-                    ws.cell(row=r, column=c).fill = PatternFill(
-                        start_color='F8F9FA', end_color='F8F9FA', fill_type='solid'
-                    )
-                    ws.cell(row=r, column=c).border = Border(
-                        left=Side(style='thin', color='E0E0E0'),
-                        right=Side(style='thin', color='E0E0E0'),
-                        top=Side(style='thin', color='E0E0E0'),
-                        bottom=Side(style='thin', color='E0E0E0')
-                    )
+                    ws.cell(row=r, column=c).style = 'kpi_card'
             
             # 라벨
             ws.merge_cells(start_row=row, start_column=col, end_row=row, end_column=col+2)
             label_cell = ws.cell(row=row, column=col)
             label_cell.value = label
-            label_cell.font = Font(name='맑은 고딕', size=10, color=ColorPalette.DARK_GRAY)
-            label_cell.alignment = Alignment(horizontal='center', vertical='center')
+            label_cell.font = FONT_CAPTION
+            label_cell.alignment = ALIGN_CENTER
             
             # 값
             ws.merge_cells(start_row=row+1, start_column=col, end_row=row+2, end_column=col+2)
             value_cell = ws.cell(row=row+1, column=col)
             value_cell.value = value
-            value_cell.font = Font(name='맑은 고딕', size=22, bold=True, color=ColorPalette.PRIMARY)
-            value_cell.alignment = Alignment(horizontal='center', vertical='center')
+            if number_format:
+                value_cell.number_format = number_format
+            value_cell.font = FONT_CARD_VALUE
+            value_cell.alignment = ALIGN_CENTER
         
         # 하단 정보
-        ws.merge_cells('B30:N30')
-        footer = ws['B30']
-        footer.value = "데이터 출처: CLRI_TANSAD_ITM_D, CLRI_TANSAD_UT_PRC_M | 분석 방법론: WCO PMM Framework"
-        footer.font = Font(name='맑은 고딕', size=9, color=ColorPalette.DARK_GRAY)
-        footer.alignment = Alignment(horizontal='center')
+        _set_title(ws, 'B30:N30', "데이터 출처: CLRI_TANSAD_ITM_D, CLRI_TANSAD_UT_PRC_M | 분석 방법론: WCO PMM Framework", FONT_FOOTER, ALIGN_H_CENTER)
         
-        # 열 너비
-        for col in range(1, 16):
-            ws.column_dimensions[get_column_letter(col)].width = 10
+        # 열 너비 (모든 열이 같은 너비이므로 시트 기본값으로 지정)
+        ws.sheet_format.defaultColWidth = 10
         
         return ws
     
-    def _create_executive_summary(self, wb: Workbook) -> Worksheet:
+    def _create_executive_summary(self, wb: Workbook, summary: dict, scorecard: pd.DataFrame) -> Worksheet:
         """경영진 대시보드 시트"""
         ws = wb.create_sheet("경영진 대시보드")
         
-        # 요약 데이터
-        summary = self.kpi_calc.calc_executive_summary()
-        scorecard = self.kpi_calc.calc_kpi_scorecard()
-        
         # 제목
-        ws.merge_cells('A1:L1')
-        title_cell = ws['A1']
-        title_cell.value = "📊 경영진 대시보드"
-        title_cell.font = Font(name='맑은 고딕', size=20, bold=True, color=ColorPalette.PRIMARY)
-        ws.row_dimensions[1].height = 40
+        _set_title(ws, 'A1:L1', "📊 경영진 대시보드", FONT_H1, row_height=40)
         
         # 부제목
-        ws.merge_cells('A2:L2')
-        ws['A2'].value = f"분석 기간: {summary.get('period', 'N/A')} | 작성일: {self.report_date}"
-        ws['A2'].font = Font(name='맑은 고딕', size=10, color=ColorPalette.DARK_GRAY)
+        _set_title(ws, 'A2:L2', f"분석 기간: {summary.get('period', 'N/A')} | 작성일: {self.report_date}", FONT_CAPTION)
         
         # KPI 카드들 (1행에 4개)
         row = 4
         cards = [
-            ("총 신고건수", f"{summary['total_declarations']:,.0f}건", "수입신고"),
-            ("총 관세수입", format_currency(summary['total_tax_krw'], 'KRW'), "세수실적"),
-            ("총 수입금액", format_currency(summary['total_value_usd'], 'USD'), "수입액"),
-            ("전년대비 성장률", f"{summary['yoy_growth_pct']:+.1f}%", "YoY"),
+            ("총 신고건수", summary['total_declarations'], NUMBER_FORMAT_COUNT, "수입신고"),
+            ("총 관세수입", summary['total_tax_krw'], CURRENCY_NUMBER_FORMATS['KRW'], "세수실적"),
+            ("총 수입금액", summary['total_value_usd'], CURRENCY_NUMBER_FORMATS['USD'], "수입액"),
+            ("전년대비 성장률", summary['yoy_growth_pct'] / 100, NUMBER_FORMAT_GROWTH, "YoY"),
         ]
         
-        for i, (label, value, sub) in enumerate(cards):
+        for i, (label, value, number_format, sub) in enumerate(cards):
             col = 1 + i * 3
-            end_row = add_kpi_card(ws, row, col, label, value, sub)
+            end_row = add_kpi_card(ws, row, col, label, value, sub, number_format=number_format)
         
         # KPI 스코어카드 테이블
-        scorecard_data = []
-        for _, row_data in scorecard.iterrows():
-            status_kr = {
-                'Excellent': '우수',
-                'Good': '양호', 
-                'Needs Improvement': '개선필요'
-            }.get(row_data['status'], row_data['status'])
-            
-            scorecard_data.append({
-                'name': row_data['name_kr'],
-                'actual': row_data['actual'],
-                'target': row_data['target'] if pd.notna(row_data['target']) else 0,
-                'status': status_kr
-            })
+        status_kr = {
+            'Excellent': '우수',
+            'Good': '양호', 
+            'Needs Improvement': '개선필요'
+        }
+        # 목표 미정(NaN)은 0으로 표시 (memoize된 scorecard는 변경하지 않도록 assign 사용)
+        scorecard_data = (
+            scorecard[['name_kr', 'actual', 'target', 'status']]
+            .assign(
+                target=scorecard['target'].fillna(0),
+                status=scorecard['status'].map(status_kr).fillna(scorecard['status'])
+            )
+            .rename(columns={'name_kr': 'name'})
+            .to_dict('records')
+        )
         
         add_scorecard_table(ws, 10, 1, scorecard_data, "WCO PMM KPI 스코어카드")
         
@@ -214,9 +301,7 @@ class PremiumReportGeneratorKR:
         
         # 주요 발견사항 섹션
         findings_row = 22
-        ws.merge_cells(f'A{findings_row}:L{findings_row}')
-        ws[f'A{findings_row}'].value = "📌 주요 발견사항 및 권고사항"
-        ws[f'A{findings_row}'].font = Font(name='맑은 고딕', size=14, bold=True, color=ColorPalette.PRIMARY)
+        _set_title(ws, f'A{findings_row}:L{findings_row}', "📌 주요 발견사항 및 권고사항", FONT_SECTION_PRIMARY)
         
         findings = [
             f"• 총 {summary['total_declarations']:,.0f}건의 수입신고에서 {format_currency(summary['total_tax_krw'], 'KRW')}의 관세 수입 달성",
@@ -227,8 +312,9 @@ class PremiumReportGeneratorKR:
         ]
         
         for i, finding in enumerate(findings):
-            ws[f'A{findings_row + 1 + i}'].value = finding
-            ws[f'A{findings_row + 1 + i}'].font = Font(name='맑은 고딕', size=10)
+            cell = ws.cell(row=findings_row + 1 + i, column=1)
+            cell.value = finding
+            cell.font = FONT_BODY
         
         return ws
     
@@ -237,14 +323,11 @@ class PremiumReportGeneratorKR:
         ws = wb.create_sheet("분석방법론")
         
         # 제목
-        ws.merge_cells('A1:H1')
-        ws['A1'].value = "📋 데이터 출처 및 분석 방법론"
-        ws['A1'].font = Font(name='맑은 고딕', size=20, bold=True, color=ColorPalette.PRIMARY)
-        ws.row_dimensions[1].height = 40
+        _set_title(ws, 'A1:H1', "📋 데이터 출처 및 분석 방법론", FONT_H1, row_height=40)
         
         # 데이터 소스
         ws['A3'].value = "1. 데이터 출처"
-        ws['A3'].font = Font(name='맑은 고딕', size=14, bold=True)
+        ws['A3'].font = FONT_SECTION
         
         sources = [
             ("CLRI_TANSAD_ITM_D", "수입신고 품목 데이터", "약 2,140만 건"),
@@ -252,14 +335,15 @@ class PremiumReportGeneratorKR:
         ]
         
         for i, (table, desc, size) in enumerate(sources):
-            ws[f'A{5+i}'].value = f"  • {table}"
-            ws[f'A{5+i}'].font = Font(name='Consolas', size=10)
-            ws[f'D{5+i}'].value = desc
-            ws[f'G{5+i}'].value = size
+            cell = ws.cell(row=5 + i, column=1)
+            cell.value = f"  • {table}"
+            cell.font = FONT_MONO
+            ws.cell(row=5 + i, column=4).value = desc
+            ws.cell(row=5 + i, column=7).value = size
         
         # KPI 계산 방법론
         ws['A9'].value = "2. KPI 계산 방법론"
-        ws['A9'].font = Font(name='맑은 고딕', size=14, bold=True)
+        ws['A9'].font = FONT_SECTION
         
         kpi_methods = [
             ("전년대비 성장률 (YoY)", "(당기 세수 - 전기 세수) / 전기 세수 × 100"),
@@ -269,14 +353,16 @@ class PremiumReportGeneratorKR:
         ]
         
         for i, (kpi, formula) in enumerate(kpi_methods):
-            ws[f'A{11+i}'].value = f"  • {kpi}:"
-            ws[f'A{11+i}'].font = Font(name='맑은 고딕', size=10, bold=True)
-            ws[f'D{11+i}'].value = formula
-            ws[f'D{11+i}'].font = Font(name='Consolas', size=9)
+            cell = ws.cell(row=11 + i, column=1)
+            cell.value = f"  • {kpi}:"
+            cell.font = FONT_BODY_BOLD
+            cell = ws.cell(row=11 + i, column=4)
+            cell.value = formula
+            cell.font = FONT_MONO_SMALL
         
         # 참조 프레임워크
         ws['A17'].value = "3. 참조 프레임워크"
-        ws['A17'].font = Font(name='맑은 고딕', size=14, bold=True)
+        ws['A17'].font = FONT_SECTION
         
         refs = [
             "• WCO 성과측정모델 (PMM) - 4대 차원 (무역원활화, 세수확보, 위험관리, 조직발전)",
@@ -286,8 +372,9 @@ class PremiumReportGeneratorKR:
         ]
         
         for i, ref in enumerate(refs):
-            ws[f'A{19+i}'].value = ref
-            ws[f'A{19+i}'].font = Font(name='맑은 고딕', size=10)
+            cell = ws.cell(row=19 + i, column=1)
+            cell.value = ref
+            cell.font = FONT_BODY
         
         # 열 너비
         ws.column_dimensions['A'].width = 25
@@ -301,19 +388,18 @@ class PremiumReportGeneratorKR:
         ws = wb.create_sheet("용어정의")
         
         # 제목
-        ws.merge_cells('A1:D1')
-        ws['A1'].value = "📖 용어 정의"
-        ws['A1'].font = Font(name='맑은 고딕', size=20, bold=True, color=ColorPalette.PRIMARY)
-        ws.row_dimensions[1].height = 40
+        _set_title(ws, 'A1:D1', "📖 용어 정의", FONT_H1, row_height=40)
         
         # 헤더
         headers = ['용어 (한글)', '용어 (영문)', '약어', '정의']
-        for i, h in enumerate(headers):
-            cell = ws.cell(row=3, column=i+1)
-            cell.value = h
-            cell.font = self.sm.get_header_font()
-            cell.fill = self.sm.get_header_fill()
-            cell.alignment = Alignment(horizontal='center', vertical='center')
+        header_font = self.sm.get_header_font()
+        header_fill = self.sm.get_header_fill()
+        ws.append([])
+        ws.append(headers)
+        for cell in next(ws.iter_rows(min_row=3, max_row=3, max_col=len(headers))):
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.alignment = ALIGN_CENTER
         
         # 용어 목록
         glossary = [
@@ -333,20 +419,18 @@ class PremiumReportGeneratorKR:
             ("변동계수", "Coefficient of Variation", "CV", "표준편차/평균 × 100"),
         ]
         
-        for i, (kr, en, abbr, defn) in enumerate(glossary):
-            row = 4 + i
-            ws.cell(row=row, column=1).value = kr
-            ws.cell(row=row, column=2).value = en
-            ws.cell(row=row, column=3).value = abbr
-            ws.cell(row=row, column=4).value = defn
-            
-            # 스타일
-            for col in range(1, 5):
-                cell = ws.cell(row=row, column=col)
-                cell.font = Font(name='맑은 고딕', size=10)
-                cell.border = self.sm.get_thin_border()
-                if col == 3:
-                    cell.alignment = Alignment(horizontal='center')
+        for entry in glossary:
+            ws.append(entry)
+        
+        # 본문 스타일 (NamedStyle 한 번 등록 후 이름으로 지정)
+        if 'glossary_body' not in wb.named_styles:
+            wb.add_named_style(NamedStyle(
+                name='glossary_body', font=FONT_BODY, border=self.sm.get_thin_border()
+            ))
+        for row in ws.iter_rows(min_row=4, max_row=3 + len(glossary), max_col=4):
+            for cell in row:
+                cell.style = 'glossary_body'
+            row[2].alignment = ALIGN_H_CENTER
         
         # 열 너비
         ws.column_dimensions['A'].width = 20
@@ -362,64 +446,88 @@ class PremiumReportGeneratorKR:
         """프리미엄 관세 수입 현황 보고서 생성"""
         print("📊 프리미엄 관세 수입 현황 보고서 생성 중...")
         
-        wb = Workbook()
-        if wb.active:
-            wb.remove(wb.active)
+        wb = Workbook()  # 기본 시트는 표지로 재사용
         
-        # 데이터 조회
+        # 데이터 조회 (독립 조회는 각자 연결을 받아 동시에 실행)
         print("  → 데이터 조회...")
-        df_yearly = self.kpi_calc.calc_revenue_by_period('yearly')
-        df_monthly = self.kpi_calc.calc_revenue_by_period('monthly')
-        df_yoy = self.kpi_calc.calc_yoy_growth()
-        df_pareto = self.kpi_calc.calc_pareto_analysis('hs2', 'tax')
-        hhi_hs = self.kpi_calc.calc_hhi_by_dimension('hs2')
-        hhi_country = self.kpi_calc.calc_hhi_by_dimension('country')
-        summary = self.kpi_calc.calc_executive_summary()
-        
-        # 국가별 데이터
-        df_country = pd.read_sql("""
-            SELECT 
+        country_sql = """
+            SELECT /*+ RESULT_CACHE */
                 ORIG_CNTY_CD as country,
                 COUNT(*) as declarations,
                 SUM(ITM_TAX_AMT) as tax_amount,
-                SUM(ITM_INVC_USD_AMT) as value_usd,
-                ROUND(SUM(ITM_TAX_AMT) * 100.0 / SUM(SUM(ITM_TAX_AMT)) OVER(), 2) as share_pct
+                SUM(ITM_INVC_USD_AMT) as value_usd
             FROM CLRI_TANSAD_ITM_D
             WHERE DEL_YN = 'N' AND TANSAD_YY >= '23' AND ORIG_CNTY_CD IS NOT NULL
             GROUP BY ORIG_CNTY_CD
             ORDER BY tax_amount DESC
             FETCH FIRST 20 ROWS ONLY
-        """, self.conn)
-        df_country.columns = ['국가코드', '신고건수', '관세액', '수입금액(USD)', '비중(%)']
+        """
+        
+        def fetch_overview(conn):
+            # 요약과 스코어카드가 YoY/HHI 등 중간 결과를 공유하도록 한 계산기에서 조회
+            calc = self._new_calculator(conn)
+            return (
+                calc.calc_yoy_growth(),
+                calc.calc_hhi_by_dimension('hs2'),
+                calc.calc_hhi_by_dimension('country'),
+                calc.calc_executive_summary(),
+                calc.calc_kpi_scorecard(),
+            )
+        
+        results = self._run_queries({
+            'overview': fetch_overview,
+            'monthly': lambda conn: self._new_calculator(conn).calc_revenue_by_period('monthly', limit=36),
+            'pareto': lambda conn: self._new_calculator(conn).calc_pareto_analysis('hs2', 'tax'),
+            'country': lambda conn: fetch_df(conn, country_sql),
+        })
+        df_yoy, hhi_hs, hhi_country, summary, scorecard = results['overview']
+        df_monthly = results['monthly']
+        df_pareto = results['pareto']
+        
+        # 국가별 데이터
+        df_country = results['country']
+        df_country.columns = ['국가코드', '신고건수', '관세액', '수입금액(USD)']
+        # 비중은 전체 세수(요약 KPI) 대비로 계산 - DB에서 윈도우 집계 후 정렬하지 않도록 함
+        df_country['비중(%)'] = (df_country['관세액'] / summary['total_tax_krw'] * 100).round(2)
+        
+        # 같은 데이터로 이미 만든 보고서가 있으면 복사 (요약의 생성 시각은 제외)
+        summary_data = {k: v for k, v in summary.items() if k != 'generated_at'}
+        cache_path = self._report_cache_path(
+            output_path, summary_data, scorecard, hhi_hs, hhi_country,
+            df_yoy, df_monthly, df_pareto, df_country
+        )
+        if cache_path and os.path.exists(cache_path):
+            shutil.copyfile(cache_path, output_path)
+            print(f"✅ 동일 데이터 보고서 재사용: {output_path}")
+            return
         
         # 표지 생성
         print("  → 표지 생성...")
         metrics = {
-            '총 신고건수': f"{summary['total_declarations']:,.0f}건",
-            '총 관세수입': format_currency(summary['total_tax_krw'], 'KRW'),
-            '총 수입금액': format_currency(summary['total_value_usd'], 'USD'),
-            '분석 기간': summary['period']
+            '총 신고건수': (summary['total_declarations'], NUMBER_FORMAT_COUNT),
+            '총 관세수입': (summary['total_tax_krw'], CURRENCY_NUMBER_FORMATS['KRW']),
+            '총 수입금액': (summary['total_value_usd'], CURRENCY_NUMBER_FORMATS['USD']),
+            '분석 기간': (summary['period'], None)
         }
         self._create_cover_sheet(wb, "관세 수입 현황 분석", "Customs Revenue Analysis Report", metrics)
         
         # 경영진 대시보드
         print("  → 경영진 대시보드 생성...")
-        self._create_executive_summary(wb)
+        self._create_executive_summary(wb, summary, scorecard)
         
         # 연도별 추이 시트
         print("  → 연도별 추이 시트 생성...")
         ws_yearly = wb.create_sheet("연도별 추이")
         
         # 제목
-        ws_yearly.merge_cells('A1:H1')
-        ws_yearly['A1'].value = "📈 연도별 관세 수입 추이 분석"
-        ws_yearly['A1'].font = Font(name='맑은 고딕', size=16, bold=True, color=ColorPalette.PRIMARY)
-        ws_yearly.row_dimensions[1].height = 35
+        _set_title(ws_yearly, 'A1:H1', "📈 연도별 관세 수입 추이 분석", FONT_H2, row_height=35)
         
         # 데이터 테이블
-        df_yoy_display = df_yoy[['period', 'declaration_count', 'total_tax', 'yoy_growth_pct']].copy()
-        df_yoy_display.columns = ['연도', '신고건수', '총세액', '성장률(%)']
-        end_row = write_styled_dataframe(ws_yearly, df_yoy_display, start_row=3, title="연도별 관세 수입 및 성장률")
+        df_yoy_display = df_yoy[['period', 'declaration_count', 'total_tax', 'yoy_growth_pct']]
+        end_row = write_styled_dataframe(
+            ws_yearly, df_yoy_display, start_row=3, title="연도별 관세 수입 및 성장률",
+            column_labels=['연도', '신고건수', '총세액', '성장률(%)']
+        )
         
         # 콤보 차트 (세액 + 성장률)
         if len(df_yoy) > 1:
@@ -440,34 +548,33 @@ class PremiumReportGeneratorKR:
         print("  → 파레토 분석 시트 생성...")
         ws_pareto = wb.create_sheet("파레토 분석")
         
-        ws_pareto.merge_cells('A1:H1')
-        ws_pareto['A1'].value = "📊 파레토 분석 (80/20 법칙)"
-        ws_pareto['A1'].font = Font(name='맑은 고딕', size=16, bold=True, color=ColorPalette.PRIMARY)
+        _set_title(ws_pareto, 'A1:H1', "📊 파레토 분석 (80/20 법칙)", FONT_H2)
         
         # 파레토 테이블
         pareto_display = df_pareto[['category', 'value', 'share_pct', 'cumulative_pct', 'pareto_zone']].head(20)
-        pareto_display.columns = ['HS류', '관세액', '비중(%)', '누적비중(%)', '구간']
-        end_row = write_styled_dataframe(ws_pareto, pareto_display, start_row=3, title="HS류별 관세 수입 TOP 20")
+        end_row = write_styled_dataframe(
+            ws_pareto, pareto_display, start_row=3, title="HS류별 관세 수입 TOP 20",
+            column_labels=['HS류', '관세액', '비중(%)', '누적비중(%)', '구간']
+        )
         
         # 히트맵 서식 (비중 % 컬럼)
         add_heatmap_formatting(ws_pareto, 6, 5 + len(pareto_display), 3, 3)
         
         # Zone A 카운트 요약
-        zone_a = len(df_pareto[df_pareto['pareto_zone'] == 'A (Top 80%)'])
-        ws_pareto[f'A{end_row + 2}'].value = f"※ A 구간 (상위 80%): {zone_a}개 HS류가 전체 세수의 80%를 차지"
-        ws_pareto[f'A{end_row + 2}'].font = Font(name='맑은 고딕', size=11, bold=True, color=ColorPalette.PRIMARY)
+        zone_a = int((df_pareto['pareto_zone'].to_numpy() == 'A (Top 80%)').sum())
+        cell = ws_pareto.cell(row=end_row + 2, column=1)
+        cell.value = f"※ A 구간 (상위 80%): {zone_a}개 HS류가 전체 세수의 80%를 차지"
+        cell.font = FONT_NOTE
         
         # HHI 요약
-        ws_pareto[f'A{end_row + 4}'].value = f"HHI 집중도 지수: {hhi_hs['hhi']:.0f} ({hhi_hs['concentration_level']})"
-        ws_pareto[f'A{end_row + 5}'].value = f"상위 5개 품목 비중: {hhi_hs['top_5_share']:.1f}%"
+        ws_pareto.cell(row=end_row + 4, column=1).value = f"HHI 집중도 지수: {hhi_hs['hhi']:.0f} ({hhi_hs['concentration_level']})"
+        ws_pareto.cell(row=end_row + 5, column=1).value = f"상위 5개 품목 비중: {hhi_hs['top_5_share']:.1f}%"
         
         # 국가별 현황 시트
         print("  → 국가별 현황 시트 생성...")
         ws_country = wb.create_sheet("국가별 현황")
         
-        ws_country.merge_cells('A1:H1')
-        ws_country['A1'].value = "🌍 원산지 국가별 수입 현황"
-        ws_country['A1'].font = Font(name='맑은 고딕', size=16, bold=True, color=ColorPalette.PRIMARY)
+        _set_title(ws_country, 'A1:H1', "🌍 원산지 국가별 수입 현황", FONT_H2)
         
         end_row = write_styled_dataframe(ws_country, df_country, start_row=3, title="원산지 국가별 관세 수입 TOP 20")
         
@@ -475,19 +582,19 @@ class PremiumReportGeneratorKR:
         add_databar_formatting(ws_country, 6, 5 + len(df_country), 5)
         
         # HHI 국가
-        ws_country[f'A{end_row + 2}'].value = f"HHI 집중도 지수: {hhi_country['hhi']:.0f} ({hhi_country['concentration_level']})"
+        ws_country.cell(row=end_row + 2, column=1).value = f"HHI 집중도 지수: {hhi_country['hhi']:.0f} ({hhi_country['concentration_level']})"
         
         # 월별 추이 시트
         print("  → 월별 추이 시트 생성...")
         ws_monthly = wb.create_sheet("월별 추이")
         
-        ws_monthly.merge_cells('A1:H1')
-        ws_monthly['A1'].value = "📅 월별 관세 수입 추이 (최근 36개월)"
-        ws_monthly['A1'].font = Font(name='맑은 고딕', size=16, bold=True, color=ColorPalette.PRIMARY)
+        _set_title(ws_monthly, 'A1:H1', "📅 월별 관세 수입 추이 (최근 36개월)", FONT_H2)
         
-        df_monthly_display = df_monthly[['period', 'declaration_count', 'total_tax']].head(36).copy()
-        df_monthly_display.columns = ['월', '신고건수', '총세액']
-        end_row = write_styled_dataframe(ws_monthly, df_monthly_display, start_row=3, title="월별 관세 수입 데이터")
+        df_monthly_display = df_monthly[['period', 'declaration_count', 'total_tax']]
+        end_row = write_styled_dataframe(
+            ws_monthly, df_monthly_display, start_row=3, title="월별 관세 수입 데이터",
+            column_labels=['월', '신고건수', '총세액']
+        )
         
         # 라인 차트
         chart = LineChart()
@@ -495,15 +602,13 @@ class PremiumReportGeneratorKR:
         chart.title = "월별 관세 수입 추이"
         chart.y_axis.title = "관세액"
         
-        data = Reference(ws_monthly, min_col=3, min_row=5, max_row=5 + min(36, len(df_monthly_display)))
-        cats = Reference(ws_monthly, min_col=1, min_row=6, max_row=5 + min(36, len(df_monthly_display)))
+        data = Reference(ws_monthly, min_col=3, min_row=5, max_row=5 + len(df_monthly_display))
+        cats = Reference(ws_monthly, min_col=1, min_row=6, max_row=5 + len(df_monthly_display))
         chart.add_data(data, titles_from_data=True)
         chart.set_categories(cats)
         
-        if chart.series:
-            chart.series[0].graphicalProperties.line.solidFill = ColorPalette.PRIMARY
-            chart.series[0].graphicalProperties.line.width = 25000
-            chart.series[0].smooth = True
+        chart.series[0].graphicalProperties = SERIES_TREND_LINE
+        chart.series[0].smooth = True
         
         chart.width = 18
         chart.height = 10
@@ -515,8 +620,12 @@ class PremiumReportGeneratorKR:
         self._create_glossary_sheet(wb)
         
         # 저장
-        wb.save(output_path)
-        print(f"✅ 저장 완료: {output_path}")
+        self._save_report(wb, output_path, cache_path)
+        
+        # Workbook과 Worksheet은 서로 참조하므로 참조 카운트만으로는 해제되지 않음
+        # (동시에 생성 중인 다른 보고서가 있으므로 저장 직후 바로 수거)
+        del wb
+        gc.collect()
     
     # === 이상 탐지 보고서 ===
     
@@ -524,50 +633,68 @@ class PremiumReportGeneratorKR:
         """프리미엄 이상 탐지 보고서 생성"""
         print("\n🚨 프리미엄 이상 탐지 보고서 생성 중...")
         
-        wb = Workbook()
-        if wb.active:
-            wb.remove(wb.active)
+        wb = Workbook()  # 기본 시트는 표지로 재사용
         
-        # 데이터 조회
+        # 데이터 조회 (독립 조회는 각자 연결을 받아 동시에 실행)
         print("  → 데이터 조회...")
-        df_underval = self.kpi_calc.calc_undervaluation_stats()
-        df_risk = self.kpi_calc.calc_risk_score_by_hs_country()
-        df_misclass = self.kpi_calc.calc_hs_misclassification_rate()
-        
-        # 고위험 업체
-        df_importers = pd.read_sql("""
-            SELECT 
+        importer_sql = """
+            WITH flagged AS (
+                SELECT 
+                    IMPPN_TIN,
+                    IMPPN_NM,
+                    ASSD_INVC_USD_AMT,
+                    CASE WHEN ASSD_UT_USD_VAL > DCLD_UT_USD_VAL * 1.3 
+                          AND DCLD_UT_USD_VAL > 0 THEN 1 ELSE 0 END as uv
+                FROM CLRI_TANSAD_UT_PRC_M
+                WHERE DEL_YN = 'N' AND TANSAD_YY >= '23'
+            )
+            SELECT /*+ RESULT_CACHE */
                 IMPPN_TIN as tin,
                 MAX(IMPPN_NM) as importer_name,
                 COUNT(*) as total,
-                SUM(CASE WHEN ASSD_UT_USD_VAL > DCLD_UT_USD_VAL * 1.3 
-                         AND DCLD_UT_USD_VAL > 0 THEN 1 ELSE 0 END) as underval,
-                ROUND(SUM(CASE WHEN ASSD_UT_USD_VAL > DCLD_UT_USD_VAL * 1.3 
-                               AND DCLD_UT_USD_VAL > 0 THEN 1 ELSE 0 END) * 100.0 / COUNT(*), 1) as rate_pct,
+                SUM(uv) as underval,
+                ROUND(SUM(uv) * 100.0 / COUNT(*), 1) as rate_pct,
                 SUM(ASSD_INVC_USD_AMT) as total_value
-            FROM CLRI_TANSAD_UT_PRC_M
-            WHERE DEL_YN = 'N' AND TANSAD_YY >= '23'
+            FROM flagged
             GROUP BY IMPPN_TIN
-            HAVING COUNT(*) >= 50
-               AND SUM(CASE WHEN ASSD_UT_USD_VAL > DCLD_UT_USD_VAL * 1.3 
-                            AND DCLD_UT_USD_VAL > 0 THEN 1 ELSE 0 END) >= 10
+            HAVING COUNT(*) >= 50 AND SUM(uv) >= 10
             ORDER BY underval DESC
             FETCH FIRST 30 ROWS ONLY
-        """, self.conn)
+        """
+        
+        results = self._run_queries({
+            'underval': lambda conn: self._new_calculator(conn).calc_undervaluation_stats(),
+            'risk': lambda conn: self._new_calculator(conn).calc_risk_score_by_hs_country(),
+            'misclass': lambda conn: self._new_calculator(conn).calc_hs_misclassification_rate(),
+            'importers': lambda conn: fetch_df(conn, importer_sql),
+        })
+        df_underval = results['underval']
+        df_risk = results['risk']
+        df_misclass = results['misclass']
+        
+        # 고위험 업체
+        df_importers = results['importers']
         df_importers.columns = ['사업자번호', '업체명', '총건수', '과소신고건수', '과소신고율(%)', '총거래액']
         
         # 요약 통계
         total_underval = df_underval['underval_count'].sum() if len(df_underval) > 0 else 0
         total_loss = df_underval['estimated_loss_usd'].sum() if len(df_underval) > 0 else 0
-        high_risk_combos = len(df_risk[df_risk['risk_score'] >= 50]) if len(df_risk) > 0 else 0
+        high_risk_combos = int((df_risk['risk_score'].to_numpy() >= 50).sum())
+        
+        # 같은 데이터로 이미 만든 보고서가 있으면 복사
+        cache_path = self._report_cache_path(output_path, df_underval, df_risk, df_misclass, df_importers)
+        if cache_path and os.path.exists(cache_path):
+            shutil.copyfile(cache_path, output_path)
+            print(f"✅ 동일 데이터 보고서 재사용: {output_path}")
+            return
         
         # 표지
         print("  → 표지 생성...")
         metrics = {
-            '과소신고 의심': f"{total_underval:,.0f}건",
-            '추정 탈루액': format_currency(total_loss, 'USD'),
-            '고위험 조합': f"{high_risk_combos}개",
-            '고위험 업체': f"{len(df_importers)}개"
+            '과소신고 의심': (total_underval, NUMBER_FORMAT_COUNT),
+            '추정 탈루액': (total_loss, CURRENCY_NUMBER_FORMATS['USD']),
+            '고위험 조합': (high_risk_combos, NUMBER_FORMAT_ITEMS),
+            '고위험 업체': (len(df_importers), NUMBER_FORMAT_ITEMS)
         }
         self._create_cover_sheet(wb, "이상 탐지 분석 리포트", "Anomaly Detection Analysis Report", metrics)
         
@@ -575,45 +702,43 @@ class PremiumReportGeneratorKR:
         print("  → 리스크 대시보드 생성...")
         ws_exec = wb.create_sheet("리스크 대시보드")
         
-        ws_exec.merge_cells('A1:L1')
-        ws_exec['A1'].value = "🎯 리스크 평가 대시보드"
-        ws_exec['A1'].font = Font(name='맑은 고딕', size=20, bold=True, color=ColorPalette.PRIMARY)
-        ws_exec.row_dimensions[1].height = 40
+        _set_title(ws_exec, 'A1:L1', "🎯 리스크 평가 대시보드", FONT_H1, row_height=40)
         
         # KPI 카드들
         cards = [
-            ("과소신고 의심건수", f"{total_underval:,.0f}건", "30% 초과 기준"),
-            ("추정 탈루액", format_currency(total_loss, 'USD'), "잠재적 세수손실"),
-            ("고위험 조합수", f"{high_risk_combos}개", "리스크점수 50+"),
-            ("고위험 업체수", f"{len(df_importers)}개", "반복 위반 업체"),
+            ("과소신고 의심건수", total_underval, NUMBER_FORMAT_COUNT, "30% 초과 기준"),
+            ("추정 탈루액", total_loss, CURRENCY_NUMBER_FORMATS['USD'], "잠재적 세수손실"),
+            ("고위험 조합수", high_risk_combos, NUMBER_FORMAT_ITEMS, "리스크점수 50+"),
+            ("고위험 업체수", len(df_importers), NUMBER_FORMAT_ITEMS, "반복 위반 업체"),
         ]
         
-        for i, (label, value, sub) in enumerate(cards):
+        for i, (label, value, number_format, sub) in enumerate(cards):
             col = 1 + i * 3
-            add_kpi_card(ws_exec, 3, col, label, value, sub)
+            add_kpi_card(ws_exec, 3, col, label, value, sub, number_format=number_format)
         
         # 리스크 매트릭스
         add_risk_matrix(ws_exec, 9, 1, "리스크 평가 매트릭스")
         
         # 요약 통계 테이블
         underval_summary = df_underval[['period', 'total_count', 'underval_count', 'underval_rate']].head(5)
-        underval_summary.columns = ['연도', '총건수', '과소신고건수', '과소신고율(%)']
-        write_styled_dataframe(ws_exec, underval_summary, start_row=9, start_col=8, title="연도별 과소신고 추이")
+        write_styled_dataframe(
+            ws_exec, underval_summary, start_row=9, start_col=8, title="연도별 과소신고 추이",
+            column_labels=['연도', '총건수', '과소신고건수', '과소신고율(%)']
+        )
         
         # 과소신고 분석 시트
         print("  → 과소신고 분석 시트 생성...")
         ws_underval = wb.create_sheet("과소신고 분석")
         
-        ws_underval.merge_cells('A1:H1')
-        ws_underval['A1'].value = "💰 과소신고 탐지 분석"
-        ws_underval['A1'].font = Font(name='맑은 고딕', size=16, bold=True, color=ColorPalette.PRIMARY)
+        _set_title(ws_underval, 'A1:H1', "💰 과소신고 탐지 분석", FONT_H2)
         
-        underval_display = df_underval.copy()
-        underval_display.columns = ['연도', '총건수', '과소신고건수', '과소신고율(%)', '추정탈루액(USD)']
-        end_row = write_styled_dataframe(ws_underval, underval_display, start_row=3, title="연도별 과소신고 통계")
+        end_row = write_styled_dataframe(
+            ws_underval, df_underval, start_row=3, title="연도별 과소신고 통계",
+            column_labels=['연도', '총건수', '과소신고건수', '과소신고율(%)', '추정탈루액(USD)']
+        )
         
         # 히트맵 (Rate 컬럼)
-        add_heatmap_formatting(ws_underval, 6, 5 + len(underval_display), 4, 4, reverse=True)
+        add_heatmap_formatting(ws_underval, 6, 5 + len(df_underval), 4, 4, reverse=True)
         
         # 바 차트
         chart = BarChart()
@@ -621,13 +746,12 @@ class PremiumReportGeneratorKR:
         chart.style = 10
         chart.title = "연도별 과소신고율"
         
-        data = Reference(ws_underval, min_col=4, min_row=5, max_row=5 + len(underval_display))
-        cats = Reference(ws_underval, min_col=1, min_row=6, max_row=5 + len(underval_display))
+        data = Reference(ws_underval, min_col=4, min_row=5, max_row=5 + len(df_underval))
+        cats = Reference(ws_underval, min_col=1, min_row=6, max_row=5 + len(df_underval))
         chart.add_data(data, titles_from_data=True)
         chart.set_categories(cats)
         
-        if chart.series:
-            chart.series[0].graphicalProperties.solidFill = ColorPalette.DANGER
+        chart.series[0].graphicalProperties = SERIES_DANGER_BAR
         
         chart.width = 12
         chart.height = 8
@@ -637,13 +761,13 @@ class PremiumReportGeneratorKR:
         print("  → HS-국가 리스크 시트 생성...")
         ws_risk = wb.create_sheet("품목국가 리스크")
         
-        ws_risk.merge_cells('A1:I1')
-        ws_risk['A1'].value = "⚠️ HS코드 × 국가 리스크 분석"
-        ws_risk['A1'].font = Font(name='맑은 고딕', size=16, bold=True, color=ColorPalette.PRIMARY)
+        _set_title(ws_risk, 'A1:I1', "⚠️ HS코드 × 국가 리스크 분석", FONT_H2)
         
         risk_display = df_risk[['hs4', 'country', 'total_count', 'underval_count', 'underval_rate', 'risk_score']].head(30)
-        risk_display.columns = ['HS코드', '국가', '총건수', '과소신고건수', '과소신고율(%)', '리스크점수']
-        end_row = write_styled_dataframe(ws_risk, risk_display, start_row=3, title="고위험 HS-국가 조합 TOP 30")
+        end_row = write_styled_dataframe(
+            ws_risk, risk_display, start_row=3, title="고위험 HS-국가 조합 TOP 30",
+            column_labels=['HS코드', '국가', '총건수', '과소신고건수', '과소신고율(%)', '리스크점수']
+        )
         
         # 리스크 점수 히트맵
         add_heatmap_formatting(ws_risk, 6, 5 + len(risk_display), 6, 6, reverse=True)
@@ -652,9 +776,7 @@ class PremiumReportGeneratorKR:
         print("  → 고위험 업체 시트 생성...")
         ws_importers = wb.create_sheet("고위험 업체")
         
-        ws_importers.merge_cells('A1:G1')
-        ws_importers['A1'].value = "🏢 고위험 수입업체 분석"
-        ws_importers['A1'].font = Font(name='맑은 고딕', size=16, bold=True, color=ColorPalette.PRIMARY)
+        _set_title(ws_importers, 'A1:G1', "🏢 고위험 수입업체 분석", FONT_H2)
         
         end_row = write_styled_dataframe(ws_importers, df_importers, start_row=3, title="과소신고 다발 업체 TOP 30")
         
@@ -665,13 +787,12 @@ class PremiumReportGeneratorKR:
         print("  → HS 분류 오류 시트 생성...")
         ws_misclass = wb.create_sheet("품목분류 오류")
         
-        ws_misclass.merge_cells('A1:E1')
-        ws_misclass['A1'].value = "🔄 HS코드 분류 오류 분석"
-        ws_misclass['A1'].font = Font(name='맑은 고딕', size=16, bold=True, color=ColorPalette.PRIMARY)
+        _set_title(ws_misclass, 'A1:E1', "🔄 HS코드 분류 오류 분석", FONT_H2)
         
-        misclass_display = df_misclass.copy()
-        misclass_display.columns = ['연도', '총건수', '분류오류건수', '분류오류율(%)']
-        end_row = write_styled_dataframe(ws_misclass, misclass_display, start_row=3, title="연도별 품목분류 오류 통계")
+        end_row = write_styled_dataframe(
+            ws_misclass, df_misclass, start_row=3, title="연도별 품목분류 오류 통계",
+            column_labels=['연도', '총건수', '분류오류건수', '분류오류율(%)']
+        )
         
         # 부록
         print("  → 부록 시트 생성...")
@@ -679,8 +800,23 @@ class PremiumReportGeneratorKR:
         self._create_glossary_sheet(wb)
         
         # 저장
-        wb.save(output_path)
-        print(f"✅ 저장 완료: {output_path}")
+        self._save_report(wb, output_path, cache_path)
+        
+        # Workbook과 Worksheet은 서로 참조하므로 참조 카운트만으로는 해제되지 않음
+        # (동시에 생성 중인 다른 보고서가 있으므로 저장 직후 바로 수거)
+        del wb
+        gc.collect()
+
+
+def prune_report_cache():
+    """당일이 아닌 보고서 캐시 파일 삭제"""
+    cache_dir = os.path.join(BASE_PATH, '.cache')
+    if not os.path.isdir(cache_dir):
+        return
+    today = date.today().isoformat()
+    for name in os.listdir(cache_dir):
+        if name.endswith('.xlsx') and not name.startswith(today):
+            os.remove(os.path.join(cache_dir, name))
 
 
 def main():
@@ -690,25 +826,39 @@ def main():
     print(f"⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 60)
     
-    # DB 연결
+    # DB 연결 (Oracle Client 라이브러리가 있으면 Thick 모드, 없으면 Thin 모드)
     print("\n🔗 DB 연결 중...")
     try:
-        conn = oracledb.connect(**DB_CONFIG)
+        oracledb.init_oracle_client(lib_dir=os.environ.get('ORACLE_CLIENT_LIB'))
+    except oracledb.Error:
+        print("  ℹ️ Oracle Client 라이브러리를 찾지 못해 Thin 모드로 접속합니다")
+    
+    try:
+        # 보고서 내 독립 조회까지 동시에 실행하므로 풀에서 조회마다 연결을 받아 사용
+        pool = oracledb.create_pool(**DB_CONFIG, min=2, max=DB_POOL_SIZE, increment=2,
+                                    stmtcachesize=STMT_CACHE_SIZE, sdu=DB_SDU)
         print("✅ DB 연결 성공")
     except Exception as e:
         print(f"❌ DB 연결 실패: {e}")
         sys.exit(1)
     
+    # --no-cache: 당일 캐시를 무시하고 DB 조회·보고서 생성을 다시 수행
+    use_disk_cache = '--no-cache' not in sys.argv[1:]
+    if use_disk_cache:
+        prune_report_cache()
+    
     try:
-        generator = PremiumReportGeneratorKR(conn)
-        
-        # 관세 수입 현황 보고서
         revenue_path = os.path.join(BASE_PATH, "프리미엄_관세수입현황_보고서_KR.xlsx")
-        generator.create_revenue_report(revenue_path)
-        
-        # 이상 탐지 보고서
         anomaly_path = os.path.join(BASE_PATH, "프리미엄_이상탐지_보고서_KR.xlsx")
-        generator.create_anomaly_report(anomaly_path)
+        
+        # 두 보고서는 공유 상태가 없으므로 동시에 생성 (DB 대기 시간 중첩)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(PremiumReportGeneratorKR(pool, use_disk_cache).create_revenue_report, revenue_path),
+                executor.submit(PremiumReportGeneratorKR(pool, use_disk_cache).create_anomaly_report, anomaly_path),
+            ]
+            for future in futures:
+                future.result()
         
         print("\n" + "=" * 60)
         print("✅ 모든 프리미엄 보고서 생성 완료!")
@@ -722,7 +872,7 @@ def main():
         traceback.print_exc()
         sys.exit(1)
     finally:
-        conn.close()
+        pool.close()
         print("🔌 DB 연결 종료")
 
 
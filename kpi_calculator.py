@@ -14,11 +14,19 @@ References:
 - UN Comtrade 분석 프레임워크
 """
 
+import functools
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+import pyarrow as pa
+from datetime import date, timedelta
+from decimal import Decimal
 from typing import Dict, List, Tuple, Optional, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
 
@@ -43,6 +51,10 @@ class KPIDefinition:
     benchmark: Optional[float] = None
     target: Optional[float] = None
     direction: str = "higher"  # higher=높을수록 좋음, lower=낮을수록 좋음
+    category_value: str = field(init=False, repr=False)  # category.value (스코어카드 행 생성 시 사용)
+    
+    def __post_init__(self):
+        self.category_value = self.category.value
 
 
 # WCO PMM 기반 KPI 정의 (16개)
@@ -248,17 +260,138 @@ KPI_DEFINITIONS: Dict[str, KPIDefinition] = {
     ),
 }
 
+# 요약 KPI 집계 기간 표기 및 생성 시각 형식
+SUMMARY_PERIOD = '2023-2026'
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# 카테고리별 KPI 정의 (조회 시마다 필터링하지 않도록 미리 구성)
+_DEFINITIONS_BY_CATEGORY: Dict[KPICategory, Dict[str, KPIDefinition]] = {
+    category: {k: v for k, v in KPI_DEFINITIONS.items() if v.category == category}
+    for category in KPICategory
+}
+
+
+# 집계 쿼리는 /*+ RESULT_CACHE */ 힌트로 서버 결과 캐시 사용 (result_cache_mode=MANUAL 전제)
+# SYSDATE를 참조하는 월별 조회는 결과 캐시 대상이 아니므로 힌트 생략
+
+# 배열 페치 크기 (집계 결과는 수십~수백 행이므로 한 번의 왕복으로 수신, 기본값 100)
+FETCH_ARRAYSIZE = 1000
+
+# 세션 데이터 단위 (기본 8KB -> 64KB, 단독 실행 시 접속에 사용)
+DB_SDU = 65535
+
+# 집계 결과 일 단위 캐시 (당일 첫 실행이 채우고 이후 실행은 DB 조회 생략)
+KPI_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.kpi_cache')
+
+# 프로세스 내 조회 결과 공유 ({날짜}_{해시} -> Future)
+# 두 보고서가 동시에 같은 집계(연도별 세수, 저평가 통계 등)를 요청해도 DB는 한 번만 조회
+_SHARED_RESULTS: Dict[str, Future] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def _cached(method):
+    """KPICalculator 메서드 결과를 (메서드명, 인자) 키로 self.cache에 보관
+    
+    한 보고서 실행 중 같은 KPI를 다시 요청하면 DB를 재조회하지 않음.
+    반환 객체(DataFrame/dict)는 공유되므로 호출 측에서 변경하지 않아야 함.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        if key not in self.cache:
+            self.cache[key] = method(self, *args, **kwargs)
+        return self.cache[key]
+    return wrapper
+
 
 class KPICalculator:
     """WCO PMM 기반 KPI 계산기"""
     
-    def __init__(self, conn):
+    def __init__(self, conn=None, use_disk_cache: bool = True, pool=None):
         """
         Args:
             conn: Oracle DB 연결 객체
+            use_disk_cache: False면 당일 캐시를 쓰지 않고 항상 DB 조회
+            pool: oracledb 커넥션 풀 (지정 시 조회마다 연결을 받아 사용하므로
+                  여러 스레드/요청이 한 계산기를 동시에 사용할 수 있음)
         """
+        if conn is None and pool is None:
+            raise ValueError("conn 또는 pool 중 하나는 지정해야 합니다")
         self.conn = conn
-        self.cache: Dict[str, Any] = {}
+        self.pool = pool
+        self.cache: Dict[tuple, Any] = {}
+        self.cache_dir = KPI_CACHE_DIR if use_disk_cache else None
+        if self.cache_dir:
+            self._prune_disk_cache()
+    
+    def _prune_disk_cache(self):
+        """당일이 아닌 캐시 파일 및 공유 결과 삭제"""
+        today = date.today().isoformat()
+        with _SHARED_LOCK:
+            for key in [k for k in _SHARED_RESULTS if not k.startswith(today)]:
+                del _SHARED_RESULTS[key]
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.parquet') and not name.startswith(today):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except FileNotFoundError:
+                    pass  # 동시에 생성된 다른 계산기가 먼저 삭제
+    
+    def _read_sql(self, sql: str, params: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """집계 쿼리 실행 (컬럼명 소문자, 당일 캐시 우선)
+        
+        같은 프로세스의 다른 계산기(다른 보고서)가 이미 조회했거나 조회 중인
+        SQL은 그 결과를 기다려 복사본을 받습니다.
+        """
+        if not self.cache_dir:
+            return self._query(sql, params, None)
+        
+        digest = hashlib.md5(f"{sql}|{sorted((params or {}).items())}".encode('utf-8')).hexdigest()
+        key = f"{date.today().isoformat()}_{digest}"
+        with _SHARED_LOCK:
+            future = _SHARED_RESULTS.get(key)
+            owner = future is None
+            if owner:
+                future = _SHARED_RESULTS[key] = Future()
+        
+        if owner:
+            try:
+                future.set_result(self._query(sql, params, key))
+            except BaseException as e:
+                with _SHARED_LOCK:
+                    del _SHARED_RESULTS[key]
+                future.set_exception(e)
+                raise
+        # 호출 측이 컬럼을 추가하므로(calc_yoy_growth 등) 공유 원본은 복사해서 반환
+        return future.result().copy()
+    
+    def _query(self, sql: str, params: Optional[Dict[str, Any]], key: Optional[str]) -> pd.DataFrame:
+        """DB 조회 (key가 있으면 {날짜}_{해시}.parquet 디스크 캐시 사용)
+        
+        대상 테이블은 일 배치로 적재되므로 같은 날 같은 SQL의 결과는 파일에서 읽습니다.
+        """
+        if key:
+            path = os.path.join(self.cache_dir, f"{key}.parquet")
+            if os.path.exists(path):
+                return pd.read_parquet(path)
+        
+        if self.pool is not None:
+            with self.pool.acquire() as conn:
+                df = fetch_df(conn, sql, params)
+        else:
+            df = fetch_df(self.conn, sql, params)
+        # Oracle은 대문자 컬럼명 반환 -> 소문자로 변환
+        df.columns = df.columns.str.lower()
+        
+        if key:
+            # 임시 파일에 쓴 뒤 교체 (동시 조회 중 불완전한 파일을 읽지 않도록)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        return df
     
     def get_definition(self, kpi_code: str) -> Optional[KPIDefinition]:
         """KPI 정의 조회"""
@@ -270,31 +403,62 @@ class KPICalculator:
     
     def get_definitions_by_category(self, category: KPICategory) -> Dict[str, KPIDefinition]:
         """카테고리별 KPI 정의 조회"""
-        return {k: v for k, v in KPI_DEFINITIONS.items() if v.category == category}
+        return _DEFINITIONS_BY_CATEGORY[category]
+    
+    @_cached
+    def _itm_rollup(self) -> pd.DataFrame:
+        """신고 품목 테이블 통합 집계 (GROUPING SETS로 1회 스캔)
+        
+        연도별 세수, 품목·국가 HHI, 요약 기본 통계가 모두 이 결과에서 계산됨.
+        grp: 0=연도, 1=연도×HS2, 2=연도×국가 (hs2/country의 NULL은 grp로 구분)
+        연도별 HS 류·국가 수는 grp 1/2의 행 수로 계산하므로 COUNT(DISTINCT)를 쓰지 않음.
+        """
+        sql = """
+            SELECT /*+ RESULT_CACHE */
+                CASE WHEN GROUPING(SUBSTR(HS_CD, 1, 2)) = 0 THEN 1
+                     WHEN GROUPING(ORIG_CNTY_CD) = 0 THEN 2
+                     ELSE 0 END as grp,
+                TANSAD_YY as yy,
+                SUBSTR(HS_CD, 1, 2) as hs2,
+                ORIG_CNTY_CD as country,
+                COUNT(*) as declaration_count,
+                SUM(ITM_TAX_AMT) as total_tax,
+                SUM(ITM_INVC_USD_AMT) as total_value_usd,
+                AVG(ITM_TAX_AMT) as avg_tax_per_item
+            FROM CLRI_TANSAD_ITM_D
+            WHERE DEL_YN = 'N' AND TANSAD_YY >= '20'
+            GROUP BY GROUPING SETS (
+                (TANSAD_YY),
+                (TANSAD_YY, SUBSTR(HS_CD, 1, 2)),
+                (TANSAD_YY, ORIG_CNTY_CD)
+            )
+        """
+        # 품목·국가 코드는 종류가 적으므로 범주형으로 변환 (HHI groupby·메모리 절감)
+        return self._read_sql(sql).astype({'hs2': 'category', 'country': 'category'})
     
     # === Revenue Collection KPIs ===
     
-    def calc_revenue_by_period(self, period: str = 'yearly') -> pd.DataFrame:
+    @_cached
+    def calc_revenue_by_period(self, period: str = 'yearly', limit: int = None) -> pd.DataFrame:
         """기간별 세수 현황
         
         Args:
             period: 'yearly', 'monthly', 'quarterly'
+            limit: 최근 N개 기간만 조회 (DB에서 잘라서 전송)
         """
         if period == 'yearly':
-            sql = """
-                SELECT 
-                    '20' || TANSAD_YY as period,
-                    COUNT(*) as declaration_count,
-                    SUM(ITM_TAX_AMT) as total_tax,
-                    SUM(ITM_INVC_USD_AMT) as total_value_usd,
-                    AVG(ITM_TAX_AMT) as avg_tax_per_item,
-                    COUNT(DISTINCT SUBSTR(HS_CD, 1, 2)) as hs_chapter_count,
-                    COUNT(DISTINCT ORIG_CNTY_CD) as country_count
-                FROM CLRI_TANSAD_ITM_D
-                WHERE DEL_YN = 'N' AND TANSAD_YY >= '20'
-                GROUP BY TANSAD_YY
-                ORDER BY TANSAD_YY DESC
-            """
+            # 연도별 집계는 통합 집계 결과에서 추출 (HHI·요약 통계와 같은 1회 스캔)
+            rollup = self._itm_rollup()
+            hs_counts = rollup.loc[(rollup['grp'] == 1) & rollup['hs2'].notna(), 'yy'].value_counts()
+            country_counts = rollup.loc[(rollup['grp'] == 2) & rollup['country'].notna(), 'yy'].value_counts()
+            df = rollup.loc[rollup['grp'] == 0, [
+                'yy', 'declaration_count', 'total_tax', 'total_value_usd', 'avg_tax_per_item'
+            ]].rename(columns={'yy': 'period'})
+            df['hs_chapter_count'] = df['period'].map(hs_counts).fillna(0).astype(int)
+            df['country_count'] = df['period'].map(country_counts).fillna(0).astype(int)
+            df['period'] = '20' + df['period']
+            df = df.sort_values('period', ascending=False).reset_index(drop=True)
+            return df.head(limit) if limit else df
         elif period == 'monthly':
             sql = """
                 SELECT 
@@ -311,7 +475,7 @@ class KPICalculator:
             """
         elif period == 'quarterly':
             sql = """
-                SELECT 
+                SELECT /*+ RESULT_CACHE */
                     '20' || TANSAD_YY || '-Q' || TO_CHAR(FRST_RGSR_DTM, 'Q') as period,
                     COUNT(*) as declaration_count,
                     SUM(ITM_TAX_AMT) as total_tax,
@@ -324,34 +488,37 @@ class KPICalculator:
         else:
             raise ValueError(f"Unknown period: {period}")
         
-        df = pd.read_sql(sql, self.conn)
-        # Oracle은 대문자 컬럼명 반환 -> 소문자로 변환
-        df.columns = df.columns.str.lower()
+        params = None
+        if limit:
+            sql += "FETCH FIRST :limit ROWS ONLY"
+            params = {'limit': int(limit)}
+        
+        df = self._read_sql(sql, params)
         return df
     
+    @_cached
     def calc_yoy_growth(self) -> pd.DataFrame:
         """연간 성장률 (YoY Growth Rate - RC004)"""
         df = self.calc_revenue_by_period('yearly')
         df = df.sort_values('period')
-        df['prev_tax'] = df['total_tax'].shift(1)
-        df['yoy_growth_pct'] = ((df['total_tax'] - df['prev_tax']) / df['prev_tax'] * 100).round(1)
-        df['prev_count'] = df['declaration_count'].shift(1)
-        df['yoy_count_growth_pct'] = ((df['declaration_count'] - df['prev_count']) / df['prev_count'] * 100).round(1)
+        df['prev_tax'], df['yoy_growth_pct'] = _pct_change(df['total_tax'].to_numpy(dtype=np.float64))
+        df['prev_count'], df['yoy_count_growth_pct'] = _pct_change(df['declaration_count'].to_numpy(dtype=np.float64))
         return df.dropna()
     
     def calc_mom_growth(self) -> pd.DataFrame:
         """월간 성장률 (MoM Growth)"""
         df = self.calc_revenue_by_period('monthly')
         df = df.sort_values('period')
-        df['prev_tax'] = df['total_tax'].shift(1)
-        df['mom_growth_pct'] = ((df['total_tax'] - df['prev_tax']) / df['prev_tax'] * 100).round(1)
+        df['prev_tax'], df['mom_growth_pct'] = _pct_change(df['total_tax'].to_numpy(dtype=np.float64))
         return df.dropna()
     
+    @_cached
     def calc_volatility(self) -> Dict[str, float]:
         """월간 변동성 (OD002)"""
         df = self.calc_revenue_by_period('monthly')
-        mean_tax = df['total_tax'].mean()
-        std_tax = df['total_tax'].std()
+        values = df['total_tax'].to_numpy(dtype=np.float64, na_value=np.nan)
+        mean_tax = np.nanmean(values)
+        std_tax = np.nanstd(values, ddof=1)  # pandas Series.std와 같은 표본 표준편차
         cv = (std_tax / mean_tax * 100) if mean_tax > 0 else 0
         return {
             'mean_monthly_tax': mean_tax,
@@ -362,52 +529,64 @@ class KPICalculator:
     
     # === Risk Management KPIs ===
     
+    @_cached
     def calc_undervaluation_stats(self, threshold: float = 1.3) -> pd.DataFrame:
         """과소신고 통계 (RM004)
         
         Args:
             threshold: 심사가격/신고가격 비율 임계값 (1.3 = 30% 이상 차이)
         """
-        sql = f"""
-            SELECT 
+        # 과소신고 판정은 행마다 한 번만 평가 (건수·비율·손실액이 같은 플래그 사용)
+        sql = """
+            WITH flagged AS (
+                SELECT 
+                    TANSAD_YY,
+                    ASSD_INVC_USD_AMT - DCLD_INVC_USD_AMT as diff_usd,
+                    CASE WHEN ASSD_UT_USD_VAL > DCLD_UT_USD_VAL * :threshold 
+                          AND DCLD_UT_USD_VAL > 0 THEN 1 ELSE 0 END as uv
+                FROM CLRI_TANSAD_UT_PRC_M
+                WHERE DEL_YN = 'N' AND TANSAD_YY >= '20'
+            )
+            SELECT /*+ RESULT_CACHE */
                 '20' || TANSAD_YY as period,
                 COUNT(*) as total_count,
-                SUM(CASE WHEN ASSD_UT_USD_VAL > DCLD_UT_USD_VAL * {threshold} 
-                         AND DCLD_UT_USD_VAL > 0 THEN 1 ELSE 0 END) as underval_count,
-                ROUND(SUM(CASE WHEN ASSD_UT_USD_VAL > DCLD_UT_USD_VAL * {threshold} 
-                               AND DCLD_UT_USD_VAL > 0 THEN 1 ELSE 0 END) * 100.0 / COUNT(*), 2) as underval_rate,
-                SUM(CASE WHEN ASSD_UT_USD_VAL > DCLD_UT_USD_VAL * {threshold} 
-                         AND DCLD_UT_USD_VAL > 0 
-                         THEN ASSD_INVC_USD_AMT - DCLD_INVC_USD_AMT ELSE 0 END) as estimated_loss_usd
-            FROM CLRI_TANSAD_UT_PRC_M
-            WHERE DEL_YN = 'N' AND TANSAD_YY >= '20'
+                SUM(uv) as underval_count,
+                ROUND(SUM(uv) * 100.0 / COUNT(*), 2) as underval_rate,
+                SUM(CASE WHEN uv = 1 THEN diff_usd ELSE 0 END) as estimated_loss_usd
+            FROM flagged
             GROUP BY TANSAD_YY
             ORDER BY period DESC
         """
-        df = pd.read_sql(sql, self.conn)
-        df.columns = df.columns.str.lower()
+        # float은 BINARY_DOUBLE로 바인드되므로 Decimal로 넘겨 리터럴(* 1.3)과 같은 NUMBER 비교 유지
+        df = self._read_sql(sql, {'threshold': Decimal(str(threshold))})
         return df
     
+    @_cached
     def calc_hs_misclassification_rate(self) -> pd.DataFrame:
         """품목분류 오류율 (RM005)"""
         sql = """
-            SELECT 
+            WITH flagged AS (
+                SELECT 
+                    TANSAD_YY,
+                    CASE WHEN DCLD_HS_CD != ASSD_HS_CD THEN 1 ELSE 0 END as mc
+                FROM CLRI_TANSAD_UT_PRC_M
+                WHERE DEL_YN = 'N' AND TANSAD_YY >= '20'
+            )
+            SELECT /*+ RESULT_CACHE */
                 '20' || TANSAD_YY as period,
                 COUNT(*) as total_count,
-                SUM(CASE WHEN DCLD_HS_CD != ASSD_HS_CD THEN 1 ELSE 0 END) as misclass_count,
-                ROUND(SUM(CASE WHEN DCLD_HS_CD != ASSD_HS_CD THEN 1 ELSE 0 END) * 100.0 / COUNT(*), 2) as misclass_rate
-            FROM CLRI_TANSAD_UT_PRC_M
-            WHERE DEL_YN = 'N' AND TANSAD_YY >= '20'
+                SUM(mc) as misclass_count,
+                ROUND(SUM(mc) * 100.0 / COUNT(*), 2) as misclass_rate
+            FROM flagged
             GROUP BY TANSAD_YY
             ORDER BY period DESC
         """
-        df = pd.read_sql(sql, self.conn)
-        df.columns = df.columns.str.lower()
+        df = self._read_sql(sql)
         return df
     
     def calc_risk_score_by_hs_country(self, min_count: int = 50) -> pd.DataFrame:
         """품목-국가별 리스크 점수"""
-        sql = f"""
+        sql = """
             WITH base AS (
                 SELECT 
                     SUBSTR(ASSD_HS_CD, 1, 4) as hs4,
@@ -420,9 +599,9 @@ class KPICalculator:
                 FROM CLRI_TANSAD_UT_PRC_M
                 WHERE DEL_YN = 'N' AND TANSAD_YY >= '23'
                 GROUP BY SUBSTR(ASSD_HS_CD, 1, 4), ORIG_CNTY_CD
-                HAVING COUNT(*) >= {min_count}
+                HAVING COUNT(*) >= :min_count
             )
-            SELECT 
+            SELECT /*+ RESULT_CACHE */
                 hs4,
                 country,
                 total_count,
@@ -444,49 +623,31 @@ class KPICalculator:
             ORDER BY risk_score DESC
             FETCH FIRST 100 ROWS ONLY
         """
-        df = pd.read_sql(sql, self.conn)
-        df.columns = df.columns.str.lower()
+        df = self._read_sql(sql, {'min_count': min_count})
         return df
     
     # === Organizational KPIs ===
     
+    @_cached
     def calc_hhi_by_dimension(self, dimension: str = 'hs2') -> Dict[str, Any]:
         """HHI 집중도 (OD001)
         
         Args:
             dimension: 'hs2' (품목), 'country' (국가)
         """
+        # 2023년 이후 품목별 세수 / 국가별 수입액 (통합 집계에서 연도 합산)
+        rollup = self._itm_rollup()
+        recent = rollup[rollup['yy'] >= '23']
         if dimension == 'hs2':
-            sql = """
-                SELECT 
-                    SUBSTR(HS_CD, 1, 2) as category,
-                    SUM(ITM_TAX_AMT) as value
-                FROM CLRI_TANSAD_ITM_D
-                WHERE DEL_YN = 'N' AND TANSAD_YY >= '23'
-                GROUP BY SUBSTR(HS_CD, 1, 2)
-            """
+            rows = recent[recent['grp'] == 1]
+            values = rows.groupby('hs2', observed=True, dropna=False)['total_tax'].sum()
         elif dimension == 'country':
-            sql = """
-                SELECT 
-                    ORIG_CNTY_CD as category,
-                    SUM(ITM_INVC_USD_AMT) as value
-                FROM CLRI_TANSAD_ITM_D
-                WHERE DEL_YN = 'N' AND TANSAD_YY >= '23' AND ORIG_CNTY_CD IS NOT NULL
-                GROUP BY ORIG_CNTY_CD
-            """
+            rows = recent[(recent['grp'] == 2) & recent['country'].notna()]
+            values = rows.groupby('country', observed=True)['total_value_usd'].sum()
         else:
             raise ValueError(f"Unknown dimension: {dimension}")
         
-        df = pd.read_sql(sql, self.conn)
-        df.columns = df.columns.str.lower()
-        total = df['value'].sum()
-        
-        if total > 0:
-            df['share'] = df['value'] / total
-            df['share_squared'] = df['share'] ** 2
-            hhi = df['share_squared'].sum() * 10000  # HHI는 10,000 스케일
-        else:
-            hhi = 0
+        hhi, top_5_share = _hhi_and_top5(values.to_numpy(dtype=np.float64, na_value=0.0))
         
         # HHI 해석
         if hhi < 1000:
@@ -500,16 +661,17 @@ class KPICalculator:
             'dimension': dimension,
             'hhi': round(hhi, 0),
             'concentration_level': concentration,
-            'top_5_share': round(df.nlargest(5, 'value')['share'].sum() * 100, 1),
-            'total_categories': len(df)
+            'top_5_share': round(top_5_share, 1),
+            'total_categories': len(values)
         }
     
+    @_cached
     def calc_pareto_analysis(self, dimension: str = 'hs2', value_col: str = 'tax') -> pd.DataFrame:
         """파레토 분석 (80/20 규칙)"""
         if dimension == 'hs2':
             if value_col == 'tax':
                 sql = """
-                    SELECT 
+                    SELECT /*+ RESULT_CACHE */
                         SUBSTR(HS_CD, 1, 2) as category,
                         SUM(ITM_TAX_AMT) as value
                     FROM CLRI_TANSAD_ITM_D
@@ -519,7 +681,7 @@ class KPICalculator:
                 """
             else:
                 sql = """
-                    SELECT 
+                    SELECT /*+ RESULT_CACHE */
                         SUBSTR(HS_CD, 1, 2) as category,
                         SUM(ITM_INVC_USD_AMT) as value
                     FROM CLRI_TANSAD_ITM_D
@@ -529,7 +691,7 @@ class KPICalculator:
                 """
         elif dimension == 'country':
             sql = """
-                SELECT 
+                SELECT /*+ RESULT_CACHE */
                     ORIG_CNTY_CD as category,
                     SUM(ITM_INVC_USD_AMT) as value
                 FROM CLRI_TANSAD_ITM_D
@@ -540,36 +702,48 @@ class KPICalculator:
         else:
             raise ValueError(f"Unknown dimension: {dimension}")
         
-        df = pd.read_sql(sql, self.conn)
-        df.columns = df.columns.str.lower()
-        total = df['value'].sum()
-        df['share_pct'] = (df['value'] / total * 100).round(2)
-        df['cumulative_pct'] = df['share_pct'].cumsum().round(2)
-        df['rank'] = range(1, len(df) + 1)
-        df['pareto_zone'] = df['cumulative_pct'].apply(
-            lambda x: 'A (Top 80%)' if x <= 80 else 'B (80-95%)' if x <= 95 else 'C (Bottom 5%)'
+        df = self._read_sql(sql)
+        values = df['value'].to_numpy(dtype=np.float64, na_value=0.0)
+        share_pct = np.round(values / values.sum() * 100, 2)
+        df['share_pct'] = share_pct
+        df['cumulative_pct'] = np.round(np.cumsum(share_pct), 2)
+        df['rank'] = np.arange(1, len(df) + 1)
+        cumulative = df['cumulative_pct'].to_numpy()
+        df['pareto_zone'] = np.select(
+            [cumulative <= 80, cumulative <= 95],
+            ['A (Top 80%)', 'B (80-95%)'],
+            default='C (Bottom 5%)'
         )
         
         return df
     
     # === 통합 대시보드 KPIs ===
     
+    @_cached
     def calc_executive_summary(self) -> Dict[str, Any]:
         """경영진 대시보드 요약 KPIs"""
-        # 기본 통계
-        basic_sql = """
-            SELECT 
-                COUNT(*) as total_declarations,
-                SUM(ITM_TAX_AMT) as total_tax,
-                SUM(ITM_INVC_USD_AMT) as total_value_usd,
-                COUNT(DISTINCT SUBSTR(HS_CD, 1, 2)) as hs_chapters,
-                COUNT(DISTINCT ORIG_CNTY_CD) as countries
-            FROM CLRI_TANSAD_ITM_D
-            WHERE DEL_YN = 'N' AND TANSAD_YY >= '23'
-        """
-        basic_df = pd.read_sql(basic_sql, self.conn)
-        basic_df.columns = basic_df.columns.str.lower()
-        basic = basic_df.iloc[0]
+        if self.pool is not None:
+            # 풀 사용 시 서로 독립인 입력 조회(품목 통합 집계·월별·과소신고)를 동시에 실행
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                futures = [
+                    executor.submit(self._itm_rollup),
+                    executor.submit(self.calc_revenue_by_period, 'monthly'),
+                    executor.submit(self.calc_undervaluation_stats),
+                ]
+                for future in futures:
+                    future.result()
+        
+        # 기본 통계 (2023년 이후, 통합 집계에서 계산)
+        rollup = self._itm_rollup()
+        recent = rollup[rollup['yy'] >= '23']
+        yearly = recent[recent['grp'] == 0]
+        basic = {
+            'total_declarations': yearly['declaration_count'].sum(),
+            'total_tax': yearly['total_tax'].sum(),
+            'total_value_usd': yearly['total_value_usd'].sum(),
+            'hs_chapters': recent.loc[recent['grp'] == 1, 'hs2'].nunique(),
+            'countries': recent.loc[recent['grp'] == 2, 'country'].nunique(),
+        }
         
         # YoY 성장률
         yoy = self.calc_yoy_growth()
@@ -587,7 +761,7 @@ class KPICalculator:
         latest_underval = underval.iloc[0]['underval_rate'] if len(underval) > 0 else 0
         
         return {
-            'period': '2023-2026',
+            'period': SUMMARY_PERIOD,
             'total_declarations': int(basic['total_declarations']),
             'total_tax_krw': float(basic['total_tax']),
             'total_value_usd': float(basic['total_value_usd']),
@@ -598,9 +772,10 @@ class KPICalculator:
             'hhi_commodity': hhi_hs['hhi'],
             'hhi_country': hhi_country['hhi'],
             'underval_rate': float(latest_underval),
-            'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'generated_at': time.strftime(TIMESTAMP_FORMAT)
         }
     
+    @_cached
     def calc_kpi_scorecard(self) -> pd.DataFrame:
         """KPI 스코어카드 - 벤치마크 대비 현황"""
         results = []
@@ -613,12 +788,12 @@ class KPICalculator:
             results.append({
                 'code': 'RC004',
                 'name_kr': defn.name_kr,
-                'category': defn.category.value,
+                'category': defn.category_value,
                 'actual': latest_yoy,
                 'benchmark': defn.benchmark,
                 'target': defn.target,
                 'unit': defn.unit,
-                'status': self._get_status(latest_yoy, defn.benchmark, defn.target, defn.direction)
+                'direction': defn.direction
             })
         
         # OD002: Volatility
@@ -627,12 +802,12 @@ class KPICalculator:
         results.append({
             'code': 'OD002',
             'name_kr': defn.name_kr,
-            'category': defn.category.value,
+            'category': defn.category_value,
             'actual': vol['coefficient_of_variation'],
             'benchmark': defn.benchmark,
             'target': defn.target,
             'unit': defn.unit,
-            'status': self._get_status(vol['coefficient_of_variation'], defn.benchmark, defn.target, defn.direction)
+            'direction': defn.direction
         })
         
         # OD001: HHI (Commodity)
@@ -641,12 +816,12 @@ class KPICalculator:
         results.append({
             'code': 'OD001',
             'name_kr': defn.name_kr + ' (품목)',
-            'category': defn.category.value,
+            'category': defn.category_value,
             'actual': hhi['hhi'],
             'benchmark': defn.benchmark,
             'target': defn.target,
             'unit': defn.unit,
-            'status': self._get_status(hhi['hhi'], defn.benchmark, defn.target, defn.direction)
+            'direction': defn.direction
         })
         
         # RM004: Undervaluation Rate
@@ -657,12 +832,12 @@ class KPICalculator:
             results.append({
                 'code': 'RM004',
                 'name_kr': defn.name_kr,
-                'category': defn.category.value,
+                'category': defn.category_value,
                 'actual': latest_underval,
                 'benchmark': defn.benchmark,
                 'target': defn.target,
                 'unit': defn.unit,
-                'status': self._get_status(latest_underval, defn.benchmark, defn.target, 'higher')  # 탐지율이므로 higher
+                'direction': 'higher'  # 탐지율이므로 higher
             })
         
         # RM005: HS Misclassification
@@ -673,36 +848,86 @@ class KPICalculator:
             results.append({
                 'code': 'RM005',
                 'name_kr': defn.name_kr,
-                'category': defn.category.value,
+                'category': defn.category_value,
                 'actual': latest_misclass,
                 'benchmark': defn.benchmark,
                 'target': defn.target,
                 'unit': defn.unit,
-                'status': self._get_status(latest_misclass, defn.benchmark, defn.target, defn.direction)
+                'direction': defn.direction
             })
         
-        return pd.DataFrame(results)
-    
-    def _get_status(self, actual: float, benchmark: float, target: float, direction: str) -> str:
-        """KPI 상태 판정"""
-        if direction == 'higher':
-            if actual >= target:
-                return 'Excellent'
-            elif actual >= benchmark:
-                return 'Good'
-            else:
-                return 'Needs Improvement'
-        else:  # lower is better
-            if actual <= target:
-                return 'Excellent'
-            elif actual <= benchmark:
-                return 'Good'
-            else:
-                return 'Needs Improvement'
+        # 상태 판정은 전체 KPI에 대해 한 번에 수행
+        df = pd.DataFrame(results)
+        df['status'] = _kpi_status(
+            df['actual'].to_numpy(dtype=np.float64),
+            df['benchmark'].to_numpy(dtype=np.float64),
+            df['target'].to_numpy(dtype=np.float64),
+            df.pop('direction').to_numpy() == 'higher'
+        )
+        return df
 
 
 # === 유틸리티 함수 ===
 
+def _hhi_and_top5(values: np.ndarray) -> Tuple[float, float]:
+    """HHI(10,000 스케일)와 상위 5개 비중(%)을 배열 연산 한 번으로 계산"""
+    total = values.sum()
+    if total <= 0:
+        return 0.0, 0.0
+    shares = values / total
+    hhi = float(shares @ shares) * 10000
+    top5 = float(np.sort(shares)[-5:].sum()) * 100
+    return hhi, top5
+
+
+def _pct_change(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """직전 값 배열과 직전 대비 증감률(%, 소수 1자리) 배열 (첫 원소는 NaN)"""
+    prev = np.full_like(values, np.nan)
+    prev[1:] = values[:-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return prev, np.round((values - prev) / prev * 100, 1)
+
+
+def _kpi_status(actual: np.ndarray, benchmark: np.ndarray, target: np.ndarray,
+                higher: np.ndarray) -> np.ndarray:
+    """KPI 상태 판정 (higher=True면 높을수록, False면 낮을수록 양호)"""
+    meets_target = np.where(higher, actual >= target, actual <= target)
+    meets_benchmark = np.where(higher, actual >= benchmark, actual <= benchmark)
+    return np.select(
+        [meets_target, meets_benchmark],
+        ['Excellent', 'Good'],
+        default='Needs Improvement'
+    )
+
+
+# 엑셀 셀 표시 형식 (셀에는 원값을 저장하고 format_currency와 같은 단위로 표시)
+# 엑셀은 천 단위(,) 배율만 지원하므로 KRW는 조 미만이면 원 단위로 표시
+CURRENCY_NUMBER_FORMATS = {
+    'KRW': '[>=1000000000000]"₩"0.0,,,,"조";"₩"#,##0',
+    'USD': '[>=1000000000]"$"0.0,,,"B";[>=1000000]"$"0,,"M";"$"#,##0',
+}
+
+
+def fetch_df(conn, sql: str, params: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+    """조회 결과를 DataFrame으로 변환 (pd.read_sql 대체)
+    
+    python-oracledb 3.0 이상은 fetch_df_all()로 Arrow 컬럼을 그대로 받아
+    행 단위 Python 튜플 생성을 피함. 이전 드라이버는 커서 fetchall 결과를
+    from_records로 한 번에 생성. 컬럼명은 Oracle 반환 그대로(대문자).
+    임계값 등은 params 바인드 변수로 넘겨 SQL 문이 값마다 달라지지 않도록 함.
+    """
+    if hasattr(conn, 'fetch_df_all'):
+        odf = conn.fetch_df_all(statement=sql, parameters=params, arraysize=FETCH_ARRAYSIZE)
+        return pa.Table.from_arrays(odf.column_arrays(), names=odf.column_names()).to_pandas()
+    
+    with conn.cursor() as cursor:
+        cursor.arraysize = FETCH_ARRAYSIZE
+        cursor.prefetchrows = FETCH_ARRAYSIZE + 1
+        cursor.execute(sql, params or {})
+        columns = [d[0] for d in cursor.description]
+        return pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+
+
 def format_currency(value: float, currency: str = 'KRW') -> str:
     """통화 포맷팅"""
     if currency == 'KRW':
@@ -744,10 +969,14 @@ if __name__ == "__main__":
     # 테스트
     import oracledb
     
+    oracledb.defaults.arraysize = FETCH_ARRAYSIZE
+    oracledb.defaults.prefetchrows = FETCH_ARRAYSIZE + 1
+    
     conn = oracledb.connect(
         user="CLRIUSR",
         password="ntancisclri1!",
-        dsn="211.239.120.42:3535/NTANCIS"
+        dsn="211.239.120.42:3535/NTANCIS",
+        sdu=DB_SDU
     )
     
     calc = KPICalculator(conn)
@@ -29,12 +29,14 @@ from openpyxl.chart.series import DataPoint
 from openpyxl.chart.label import DataLabelList
 from openpyxl.chart.marker import Marker
 from openpyxl.formatting.rule import (
-    ColorScaleRule, DataBarRule, IconSetRule, FormulaRule
+    ColorScaleRule, DataBarRule, IconSetRule, FormulaRule, Rule
 )
 from openpyxl.utils import get_column_letter
 from openpyxl.utils.dataframe import dataframe_to_rows
 from typing import Dict, List, Tuple, Optional, Any
 import colorsys
+import functools
+import numpy as np
 
 
 # === 색상 팔레트 (WCO/UN Comtrade 스타일) ===
@@ -79,22 +81,62 @@ class ColorPalette:
             end_color = cls.ACCENT
         
         # HEX to RGB
-        def hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
-            return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+        start_rgb = np.frombuffer(bytes.fromhex(start_color[:6]), dtype=np.uint8).astype(np.float64)
+        end_rgb = np.frombuffer(bytes.fromhex(end_color[:6]), dtype=np.uint8).astype(np.float64)
         
-        def rgb_to_hex(rgb: Tuple[int, int, int]) -> str:
-            return '{:02X}{:02X}{:02X}'.format(*rgb)
+        # n x 3 보간을 한 번에 계산 (int() 변환과 같이 소수점 이하 버림)
+        ratios = (np.arange(n) / max(n - 1, 1))[:, None]
+        rgb = (start_rgb + (end_rgb - start_rgb) * ratios).astype(np.uint8)
         
-        start_rgb = hex_to_rgb(start_color)
-        end_rgb = hex_to_rgb(end_color)
-        
-        colors = []
-        for i in range(n):
-            ratio = i / max(n - 1, 1)
-            rgb = tuple(int(start_rgb[j] + (end_rgb[j] - start_rgb[j]) * ratio) for j in range(3))
-            colors.append(rgb_to_hex(rgb))
-        
-        return colors
+        # RGB to HEX (전체를 한 번에 16진 문자열로 바꾼 뒤 6자리씩 분할)
+        hex_str = rgb.tobytes().hex().upper()
+        return [hex_str[i:i + 6] for i in range(0, len(hex_str), 6)]
+
+
+# === 공용 스타일 상수 (루프 안에서 셀마다 새로 만들지 않도록 공유) ===
+
+_FONT_DATA = Font(name='맑은 고딕', size=10)
+_FONT_BADGE = Font(name='맑은 고딕', size=9, bold=True, color=ColorPalette.WHITE)
+_FONT_STATUS = Font(name='맑은 고딕', size=10, bold=True, color=ColorPalette.WHITE)
+_FONT_AXIS_LABEL = Font(name='맑은 고딕', size=10, bold=True)
+_FONT_GAUGE = Font(name='Consolas', size=10)
+_FONT_CARD_TITLE = Font(name='맑은 고딕', size=10, color=ColorPalette.DARK_GRAY)
+_FONT_CARD_VALUE = Font(name='맑은 고딕', size=24, bold=True, color=ColorPalette.PRIMARY)
+_ALIGN_CENTER = Alignment(horizontal='center', vertical='center')
+_ALIGN_H_CENTER = Alignment(horizontal='center')
+_CARD_FILL = PatternFill(start_color='F8F9FA', end_color='F8F9FA', fill_type='solid')
+_CARD_SIDE = Side(style='thin', color=ColorPalette.MEDIUM_GRAY)
+_CARD_BORDER = Border(left=_CARD_SIDE, right=_CARD_SIDE, top=_CARD_SIDE, bottom=_CARD_SIDE)
+
+# 리스크 매트릭스 등급 색상 (Low / Medium / High)
+_RISK_FILLS = {
+    color: PatternFill(start_color=color, end_color=color, fill_type='solid')
+    for color in ('70AD47', 'FFC000', 'C00000')
+}
+
+# 10칸 텍스트 게이지 (채운 칸 수 0~10 -> 문자열)
+_GAUGE_BARS = tuple('█' * i + '░' * (10 - i) for i in range(11))
+
+# 게이지 상태 색상 (미달 / 주의 / 달성) 및 색상별 폰트
+_STATUS_COLORS = (ColorPalette.DANGER, ColorPalette.WARNING, ColorPalette.SUCCESS)
+_GAUGE_FONTS = tuple(Font(name='Consolas', size=10, color=c) for c in _STATUS_COLORS)
+_GAUGE_VALUE_FONTS = tuple(Font(name='맑은 고딕', size=10, bold=True, color=c) for c in _STATUS_COLORS)
+
+
+def _shared_style(method):
+    """StyleManager getter 결과를 인자별로 한 번만 생성해 모든 인스턴스가 공유
+    
+    반환 객체는 공유되므로 호출 측에서 수정하지 않아야 함.
+    """
+    cache = {}
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        if key not in cache:
+            cache[key] = method(self, *args, **kwargs)
+        return cache[key]
+    return wrapper
 
 
 class StyleManager:
@@ -104,16 +146,20 @@ class StyleManager:
         self.palette = ColorPalette()
         self._styles_created = False
     
+    @_shared_style
     def get_header_fill(self) -> PatternFill:
         return PatternFill(start_color=self.palette.PRIMARY, end_color=self.palette.PRIMARY, fill_type='solid')
     
+    @_shared_style
     def get_subheader_fill(self) -> PatternFill:
         return PatternFill(start_color=self.palette.SECONDARY, end_color=self.palette.SECONDARY, fill_type='solid')
     
+    @_shared_style
     def get_data_fill(self, alt: bool = False) -> PatternFill:
         color = self.palette.LIGHT_GRAY if alt else self.palette.WHITE
         return PatternFill(start_color=color, end_color=color, fill_type='solid')
     
+    @_shared_style
     def get_status_fill(self, status: str) -> PatternFill:
         colors = {
             'excellent': self.palette.SUCCESS,
@@ -125,19 +171,24 @@ class StyleManager:
         color = colors.get(status.lower(), self.palette.MEDIUM_GRAY)
         return PatternFill(start_color=color, end_color=color, fill_type='solid')
     
+    @_shared_style
     def get_header_font(self) -> Font:
         return Font(name='맑은 고딕', size=11, bold=True, color=self.palette.WHITE)
     
+    @_shared_style
     def get_title_font(self) -> Font:
         return Font(name='맑은 고딕', size=16, bold=True, color=self.palette.PRIMARY)
     
+    @_shared_style
     def get_data_font(self) -> Font:
         return Font(name='맑은 고딕', size=10)
     
+    @_shared_style
     def get_thin_border(self) -> Border:
         side = Side(style='thin', color=self.palette.MEDIUM_GRAY)
         return Border(left=side, right=side, top=side, bottom=side)
     
+    @_shared_style
     def get_center_alignment(self, wrap: bool = False) -> Alignment:
         return Alignment(horizontal='center', vertical='center', wrap_text=wrap)
 
@@ -293,7 +344,7 @@ def add_risk_matrix(
     for i, label in enumerate(severity_labels):
         cell = ws.cell(row=start_row + 2, column=start_col + 1 + i)
         cell.value = label
-        cell.font = Font(name='맑은 고딕', size=9, bold=True, color='FFFFFF')
+        cell.font = _FONT_BADGE
         cell.fill = sm.get_header_fill()
         cell.alignment = sm.get_center_alignment()
     
@@ -319,7 +370,7 @@ def add_risk_matrix(
         # Frequency 헤더
         freq_cell = ws.cell(row=start_row + 3 + row_idx, column=start_col)
         freq_cell.value = freq_label
-        freq_cell.font = Font(name='맑은 고딕', size=9, bold=True, color='FFFFFF')
+        freq_cell.font = _FONT_BADGE
         freq_cell.fill = sm.get_header_fill()
         freq_cell.alignment = sm.get_center_alignment()
         
@@ -327,18 +378,15 @@ def add_risk_matrix(
         for col_idx in range(5):
             cell = ws.cell(row=start_row + 3 + row_idx, column=start_col + 1 + col_idx)
             cell.value = risk_labels[row_idx][col_idx]
-            cell.fill = PatternFill(
-                start_color=risk_colors[row_idx][col_idx],
-                end_color=risk_colors[row_idx][col_idx],
-                fill_type='solid'
-            )
-            cell.font = Font(name='맑은 고딕', size=9, bold=True, color='FFFFFF')
+            cell.fill = _RISK_FILLS[risk_colors[row_idx][col_idx]]
+            cell.font = _FONT_BADGE
             cell.alignment = sm.get_center_alignment()
     
     # 축 라벨
-    ws.cell(row=start_row + 1, column=start_col + 3).value = "Severity →"
-    ws.cell(row=start_row + 1, column=start_col + 3).font = Font(name='맑은 고딕', size=10, bold=True)
-    ws.cell(row=start_row + 1, column=start_col + 3).alignment = Alignment(horizontal='center')
+    axis_cell = ws.cell(row=start_row + 1, column=start_col + 3)
+    axis_cell.value = "Severity →"
+    axis_cell.font = _FONT_AXIS_LABEL
+    axis_cell.alignment = _ALIGN_H_CENTER
     
     # 열 너비
     for col in range(start_col, start_col + 6):
@@ -347,6 +395,25 @@ def add_risk_matrix(
     return start_row + 8
 
 
+@functools.lru_cache(maxsize=None)
+def _heatmap_color_scale(reverse: bool):
+    """히트맵 3색 스케일 (min / 50% / max) - 방향별로 한 번만 생성"""
+    if reverse:
+        start_color = ColorPalette.HEAT_HIGH
+        mid_color = ColorPalette.HEAT_MID
+        end_color = ColorPalette.HEAT_LOW
+    else:
+        start_color = ColorPalette.HEAT_LOW
+        mid_color = ColorPalette.HEAT_MID
+        end_color = ColorPalette.HEAT_HIGH
+    
+    return ColorScaleRule(
+        start_type='min', start_color=start_color,
+        mid_type='percentile', mid_value=50, mid_color=mid_color,
+        end_type='max', end_color=end_color
+    ).colorScale
+
+
 def add_heatmap_formatting(
     ws: Worksheet,
     start_row: int,
@@ -360,22 +427,10 @@ def add_heatmap_formatting(
     Args:
         reverse: True면 낮은값=빨강, 높은값=녹색 (비용/리스크)
     """
-    if reverse:
-        start_color = ColorPalette.HEAT_HIGH
-        mid_color = ColorPalette.HEAT_MID
-        end_color = ColorPalette.HEAT_LOW
-    else:
-        start_color = ColorPalette.HEAT_LOW
-        mid_color = ColorPalette.HEAT_MID
-        end_color = ColorPalette.HEAT_HIGH
-    
     range_str = f"{get_column_letter(start_col)}{start_row}:{get_column_letter(end_col)}{end_row}"
     
-    rule = ColorScaleRule(
-        start_type='min', start_color=start_color,
-        mid_type='percentile', mid_value=50, mid_color=mid_color,
-        end_type='max', end_color=end_color
-    )
+    # 우선순위는 범위마다 따로 매겨지므로 Rule은 새로 만들고 색상 스케일만 공유
+    rule = Rule(type='colorScale', colorScale=_heatmap_color_scale(reverse))
     
     ws.conditional_formatting.add(range_str, rule)
 
@@ -426,32 +481,27 @@ def add_gauge_indicator(
     
     # 10칸 게이지
     filled = int(progress * 10)
-    gauge_bar = '█' * filled + '░' * (10 - filled)
+    gauge_bar = _GAUGE_BARS[filled]
     
-    # 상태 색상
-    if actual >= target:
-        status_color = ColorPalette.SUCCESS
-    elif actual >= target * 0.8:
-        status_color = ColorPalette.WARNING
-    else:
-        status_color = ColorPalette.DANGER
+    # 상태 색상 인덱스 (0: 미달, 1: 주의, 2: 달성)
+    status_idx = 2 if actual >= target else int(actual >= target * 0.8)
     
     # 라벨
     if label:
         label_cell = ws.cell(row=row, column=col)
         label_cell.value = label
-        label_cell.font = Font(name='맑은 고딕', size=10)
+        label_cell.font = _FONT_DATA
         col += 1
     
     # 게이지 바
     gauge_cell = ws.cell(row=row, column=col)
     gauge_cell.value = f"[{gauge_bar}]"
-    gauge_cell.font = Font(name='Consolas', size=10, color=status_color)
+    gauge_cell.font = _GAUGE_FONTS[status_idx]
     
     # 값
     value_cell = ws.cell(row=row, column=col + 1)
     value_cell.value = f"{actual:.1f} / {target:.1f}"
-    value_cell.font = Font(name='맑은 고딕', size=10, bold=True, color=status_color)
+    value_cell.font = _GAUGE_VALUE_FONTS[status_idx]
 
 
 def get_trend_arrow(current: float, previous: float, threshold: float = 0.05) -> Tuple[str, str]:
@@ -478,10 +528,11 @@ def add_kpi_card(
     start_row: int,
     start_col: int,
     title: str,
-    value: str,
+    value: Any,
     subtitle: str = "",
     trend: str = None,
-    trend_value: str = None
+    trend_value: str = None,
+    number_format: str = None
 ) -> int:
     """KPI 카드 (대시보드용)
     
@@ -491,24 +542,19 @@ def add_kpi_card(
     │   subtitle ↑+5% │
     └─────────────────┘
     
+    Args:
+        number_format: 숫자 값을 그대로 쓰고 엑셀 표시 형식으로 꾸밀 때 지정
+    
     Returns: 종료 행 번호
     """
     sm = StyleManager()
     
-    # 카드 배경 (3행 × 3열)
-    card_fill = PatternFill(start_color='F8F9FA', end_color='F8F9FA', fill_type='solid')
-    border = Border(
-        left=Side(style='thin', color=ColorPalette.MEDIUM_GRAY),
-        right=Side(style='thin', color=ColorPalette.MEDIUM_GRAY),
-        top=Side(style='thin', color=ColorPalette.MEDIUM_GRAY),
-        bottom=Side(style='thin', color=ColorPalette.MEDIUM_GRAY)
-    )
-    
-    for r in range(start_row, start_row + 4):
-        for c in range(start_col, start_col + 3):
-            cell = ws.cell(row=r, column=c)
-            cell.fill = card_fill
-            cell.border = border
+    # 카드 배경 (4행 × 3열, 공용 fill/border 객체 사용)
+    for row in ws.iter_rows(min_row=start_row, max_row=start_row + 3,
+                            min_col=start_col, max_col=start_col + 2):
+        for cell in row:
+            cell.fill = _CARD_FILL
+            cell.border = _CARD_BORDER
     
     # 제목
     ws.merge_cells(
@@ -517,8 +563,8 @@ def add_kpi_card(
     )
     title_cell = ws.cell(row=start_row, column=start_col)
     title_cell.value = title
-    title_cell.font = Font(name='맑은 고딕', size=10, color=ColorPalette.DARK_GRAY)
-    title_cell.alignment = Alignment(horizontal='center', vertical='center')
+    title_cell.font = _FONT_CARD_TITLE
+    title_cell.alignment = _ALIGN_CENTER
     
     # 값 (큰 숫자)
     ws.merge_cells(
@@ -527,8 +573,10 @@ def add_kpi_card(
     )
     value_cell = ws.cell(row=start_row + 1, column=start_col)
     value_cell.value = value
-    value_cell.font = Font(name='맑은 고딕', size=24, bold=True, color=ColorPalette.PRIMARY)
-    value_cell.alignment = Alignment(horizontal='center', vertical='center')
+    if number_format:
+        value_cell.number_format = number_format
+    value_cell.font = _FONT_CARD_VALUE
+    value_cell.alignment = _ALIGN_CENTER
     
     # 부제목 + 트렌드
     ws.merge_cells(
@@ -553,7 +601,7 @@ def add_kpi_card(
         trend_color = ColorPalette.DARK_GRAY
     
     sub_cell.font = Font(name='맑은 고딕', size=9, color=trend_color)
-    sub_cell.alignment = Alignment(horizontal='center', vertical='center')
+    sub_cell.alignment = _ALIGN_CENTER
     
     # 행 높이
     ws.row_dimensions[start_row].height = 25
@@ -603,43 +651,43 @@ def add_scorecard_table(
     ws.row_dimensions[header_row].height = 25
     
     # 데이터
+    thin_border = sm.get_thin_border()
+    center_align = sm.get_center_alignment()
     for row_idx, item in enumerate(data):
         row = header_row + 1 + row_idx
         
+        cells = [ws.cell(row=row, column=start_col + i) for i in range(5)]
+        
+        # 공통 스타일 (테두리, 가운데 정렬)
+        for cell in cells:
+            cell.border = thin_border
+            cell.alignment = center_align
+        
         # KPI 이름
-        ws.cell(row=row, column=start_col).value = item.get('name', '')
-        ws.cell(row=row, column=start_col).font = sm.get_data_font()
-        ws.cell(row=row, column=start_col).alignment = Alignment(horizontal='left', vertical='center')
+        cells[0].value = item.get('name', '')
+        cells[0].font = sm.get_data_font()
         
         # Actual
         actual = item.get('actual', 0)
-        ws.cell(row=row, column=start_col + 1).value = actual
-        ws.cell(row=row, column=start_col + 1).number_format = '#,##0.0'
+        cells[1].value = actual
+        cells[1].number_format = '#,##0.0'
         
         # Target
         target = item.get('target', 0)
-        ws.cell(row=row, column=start_col + 2).value = target
-        ws.cell(row=row, column=start_col + 2).number_format = '#,##0.0'
+        cells[2].value = target
+        cells[2].number_format = '#,##0.0'
         
         # Status
         status = item.get('status', 'Unknown')
-        status_cell = ws.cell(row=row, column=start_col + 3)
-        status_cell.value = status
-        status_cell.fill = sm.get_status_fill(status)
-        status_cell.font = Font(name='맑은 고딕', size=10, bold=True, color='FFFFFF')
+        cells[3].value = status
+        cells[3].fill = sm.get_status_fill(status)
+        cells[3].font = _FONT_STATUS
         
         # Gauge (텍스트)
         progress = actual / target if target > 0 else 0
-        filled = int(min(progress, 1) * 10)
-        gauge = '█' * filled + '░' * (10 - filled)
-        gauge_cell = ws.cell(row=row, column=start_col + 4)
-        gauge_cell.value = gauge
-        gauge_cell.font = Font(name='Consolas', size=10)
-        
-        # 스타일
-        for col in range(start_col, start_col + 5):
-            ws.cell(row=row, column=col).border = sm.get_thin_border()
-            ws.cell(row=row, column=col).alignment = sm.get_center_alignment()
+        filled = int(max(0, min(progress, 1)) * 10)
+        cells[4].value = _GAUGE_BARS[filled]
+        cells[4].font = _FONT_GAUGE
         
         ws.row_dimensions[row].height = 22
     
@@ -659,14 +707,29 @@ def write_styled_dataframe(
     title: str = None,
     number_format: str = '#,##0',
     add_heatmap: bool = False,
-    heatmap_cols: list = None
+    heatmap_cols: list = None,
+    column_labels: list = None
 ) -> int:
     """스타일이 적용된 DataFrame 출력
     
+    column_labels: 헤더에 표시할 이름 (없으면 df 컬럼명 사용)
+    
     Returns: 종료 행 번호
     """
     sm = StyleManager()
     current_row = start_row
+    labels = list(column_labels) if column_labels is not None else list(df.columns)
+    
+    # 셀마다 새로 만들지 않도록 스타일 객체를 한 번만 생성
+    header_font = sm.get_header_font()
+    header_fill = sm.get_header_fill()
+    header_alignment = sm.get_center_alignment(wrap=True)
+    thin_border = sm.get_thin_border()
+    data_font = sm.get_data_font()
+    even_fill = sm.get_data_fill(True)
+    odd_fill = sm.get_data_fill(False)
+    number_alignment = Alignment(horizontal='right', vertical='center')
+    text_alignment = Alignment(horizontal='center', vertical='center')
     
     # 제목
     if title:
@@ -682,53 +745,56 @@ def write_styled_dataframe(
     
     # 헤더
     header_row = current_row
-    for col_idx, col_name in enumerate(df.columns):
+    for col_idx, col_name in enumerate(labels):
         cell = ws.cell(row=header_row, column=start_col + col_idx)
         cell.value = col_name
-        cell.font = sm.get_header_font()
-        cell.fill = sm.get_header_fill()
-        cell.alignment = sm.get_center_alignment(wrap=True)
-        cell.border = sm.get_thin_border()
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = header_alignment
+        cell.border = thin_border
     ws.row_dimensions[header_row].height = 30
     
-    # 데이터
-    for row_idx, row_data in enumerate(df.values):
+    # 숫자형 dtype 열은 미리 분류 (object/문자열 열은 셀 단위로 판별)
+    numeric_cols = frozenset(
+        i for i, dt in enumerate(df.dtypes)
+        if isinstance(dt, np.dtype) and dt.kind in 'biuf'
+    )
+    
+    # 데이터 (df.values의 object 배열 복사 없이 행 튜플로 순회)
+    for row_idx, row_data in enumerate(df.itertuples(index=False, name=None)):
         row = header_row + 1 + row_idx
-        alt_fill = sm.get_data_fill(row_idx % 2 == 0)
+        alt_fill = even_fill if row_idx % 2 == 0 else odd_fill
         
         for col_idx, value in enumerate(row_data):
             cell = ws.cell(row=row, column=start_col + col_idx)
             cell.value = value
             cell.fill = alt_fill
-            cell.border = sm.get_thin_border()
+            cell.border = thin_border
             
             # 숫자 포맷
-            if isinstance(value, (int, float)):
+            if col_idx in numeric_cols or isinstance(value, (int, float)):
                 cell.number_format = number_format
-                cell.alignment = Alignment(horizontal='right', vertical='center')
+                cell.alignment = number_alignment
             else:
-                cell.alignment = Alignment(horizontal='center', vertical='center')
+                cell.alignment = text_alignment
             
-            cell.font = sm.get_data_font()
+            cell.font = data_font
         
         ws.row_dimensions[row].height = 22
     
-    # 열 너비 자동 조정
-    for col_idx, col_name in enumerate(df.columns):
-        max_length = len(str(col_name))
-        for row_idx in range(len(df)):
-            cell_value = df.iloc[row_idx, col_idx]
-            if cell_value is not None:
-                max_length = max(max_length, len(str(cell_value)))
-        
+    # 열 너비 자동 조정 (열별 문자열 길이 최댓값을 한 번에 계산, 결측값 제외)
+    value_lengths = df.astype(str).apply(lambda col: col.str.len()).max().fillna(0).to_numpy()
+    for col_idx, col_name in enumerate(labels):
+        max_length = max(len(str(col_name)), int(value_lengths[col_idx]))
         adjusted_width = min(max_length + 4, 30)
         ws.column_dimensions[get_column_letter(start_col + col_idx)].width = adjusted_width
     
-    # 히트맵
-    if add_heatmap and heatmap_cols:
+    # 히트맵 (데이터 행이 없으면 범위가 뒤집히므로 생략)
+    if add_heatmap and heatmap_cols and len(df) > 0:
+        col_index = {name: i for i, name in enumerate(df.columns)}
         for col_name in heatmap_cols:
-            if col_name in df.columns:
-                col_idx = list(df.columns).index(col_name)
+            col_idx = col_index.get(col_name)
+            if col_idx is not None:
                 add_heatmap_formatting(
                     ws,
                     header_row + 1,